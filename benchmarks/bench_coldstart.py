@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Measure the start-up time of a process that compiles many form classes
+(`_compile = True`), with an empty and with a warm `SOLUTION_CACHE_DIR`.
+
+    python benchmarks/bench_coldstart.py
+"""
+from __future__ import print_function
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+NUM_CLASSES = 300
+
+SCRIPT = '''
+import time
+start = time.time()
+import solution as f
+
+# Keep the classes alive: warmup() finds them through weak references
+classes = []
+for i in range(%(num)i):
+    attrs = {'_compile': True}
+    for j in range(20):
+        attrs['text%%i' %% j] = f.Text(validate=[f.Required, f.LongerThan(2)])
+    for j in range(10):
+        attrs['num%%i' %% j] = f.Number(type=int, validate=[f.InRange(0, 9)])
+    classes.append(type(f.Form)('Form%%i' %% i, (f.Form,), attrs))
+
+f.warmup()
+print(time.time() - start)
+''' % {'num': NUM_CLASSES}
+
+
+def run(cache_dir):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    if cache_dir:
+        env['SOLUTION_CACHE_DIR'] = cache_dir
+    output = subprocess.check_output([sys.executable, '-c', SCRIPT], env=env)
+    return float(output.strip())
+
+
+def main():
+    cache_dir = tempfile.mkdtemp()
+    try:
+        print('%i compiled form classes' % NUM_CLASSES)
+        print('%-12s %8.3f s' % ('no cache', run(None)))
+        print('%-12s %8.3f s' % ('cold cache', run(cache_dir)))
+        print('%-12s %8.3f s' % ('warm cache', run(cache_dir)))
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Compare the generic and the compiled (`_compile = True`) code paths when
+binding and validating a form.
+
+    python benchmarks/bench_compiled.py
+"""
+from __future__ import print_function
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import solution as f  # noqa
+
+
+class ContactForm(f.Form):
+    subject = f.Text(validate=[f.Required, f.ShorterThan(200)])
+    email = f.Text(validate=[f.Required, f.ValidEmail])
+    name = f.Text(validate=[f.LongerThan(2)])
+    phone = f.Text()
+    age = f.Number(type=int, validate=[f.InRange(0, 120)])
+    website = f.Text()
+    subscribe = f.Boolean()
+    message = f.Text(validate=[f.Required])
+    password = f.Text(validate=[f.Required])
+    password2 = f.Text(validate=[f.AreEqual('password', 'password2')])
+
+    def clean_name(self, py_value, **kwargs):
+        return py_value
+
+
+class CompiledContactForm(ContactForm):
+    _compile = True
+
+
+DATA = {
+    'subject': u'Hello', 'email': u'john@example.com', 'name': u'John',
+    'phone': u'555-1234', 'age': u'33', 'website': u'example.com',
+    'subscribe': u'1', 'message': u'Lorem ipsum dolor sit amet',
+    'password': u'secret', 'password2': u'secret',
+}
+
+
+def run(form_class):
+    form = form_class(DATA)
+    assert form.is_valid()
+
+
+def main(number=20000):
+    run(CompiledContactForm)  # generate the code outside the timing
+    for form_class in (ContactForm, CompiledContactForm):
+        best = min(timeit.repeat(
+            lambda: run(form_class), number=number, repeat=5))
+        print('%-20s %8.2f us/form' % (
+            form_class.__name__, best / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
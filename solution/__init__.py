@@ -10,11 +10,36 @@
     :license: MIT, see LICENSE for more details.
 
 """
-from .form import Form
-from .formset import FormSet
-from .fields import *
-from .validators import *
-from .utils import Markup, get_html_attrs, to_unicode
+from ._compat import lazy_exports
+from . import fields, validators
 
 
 __version__ = '2.9.5'
+
+#: The public names and the modules they are imported from, the first
+#: time they are used.
+_exports = dict(
+    [(name, '.fields') for name in fields.__all__] +
+    [(name, '.validators') for name in validators.__all__] +
+    [
+        ('Form', '.form'),
+        ('FormSet', '.formset'),
+        ('FormPool', '.pool'),
+        ('register_extractor', '.extractors'),
+        ('build_form', '.factory'),
+        ('register_adapter', '.adapters'),
+        ('LimitError', '.limits'),
+        ('Gate', '.gates'),
+        ('Honeypot', '.gates'),
+        ('RequireKeys', '.gates'),
+        ('MaxKeys', '.gates'),
+        ('Markup', '.utils'),
+        ('get_html_attrs', '.utils'),
+        ('to_unicode', '.utils'),
+        ('warmup', '.warmup'),
+    ]
+)
+
+__all__ = sorted(_exports)
+
+__getattr__, __dir__ = lazy_exports(__name__, _exports)
@@ -3,26 +3,25 @@
 Utilities for writing code that runs on Python 2 and 3.
 """
 import sys
+import types
 
 
 PY2 = sys.version_info[0] == 2
 
 
 if PY2:
-    from urlparse import urlsplit, urlunsplit
-
     text_type = unicode
     string_types = (basestring, )
+    class_types = (type, types.ClassType)
 
     def implements_to_string(cls):
         cls.__unicode__ = cls.__str__
         cls.__str__ = lambda x: x.__unicode__().encode('utf-8')
         return cls
 else:
-    from urllib.parse import urlsplit, urlunsplit
-
     text_type = str
     string_types = (str, )
+    class_types = (type, )
     implements_to_string = lambda x: x
 
 
@@ -49,3 +48,50 @@ def itervalues(d, **kw):
     if not PY2:
         return iter(d.values(**kw))
     return d.itervalues(**kw)
+
+
+def with_metaclass(meta, *bases):
+    """Create a base class with a metaclass. Works on Python 2 and 3."""
+    class metaclass(meta):
+        def __new__(cls, name, this_bases, d):
+            return meta(name, bases, d)
+    return type.__new__(metaclass, 'temporary_class', (), {})
+
+
+def lazy_exports(module_name, exports):
+    """Make the public names of a package importable on first use.
+
+    `exports` maps each name to the (relative) module it comes from. Returns
+    the `__getattr__` and `__dir__` functions for the package (PEP 562).
+    On Python < 3.7, where modules can't have a `__getattr__`, the names
+    are imported right away instead.
+    """
+    from importlib import import_module
+
+    module = sys.modules[module_name]
+
+    def __getattr__(name):
+        source = exports.get(name)
+        if source is None:
+            # A subpackage or module not imported yet
+            target = module_name + '.' + name
+            try:
+                value = import_module(target)
+            except ImportError as error:
+                # Any other missing module is a real error
+                if getattr(error, 'name', None) != target:
+                    raise
+                raise AttributeError('module %r has no attribute %r' % (
+                    module_name, name))
+        else:
+            value = getattr(import_module(source, module_name), name)
+        setattr(module, name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(module)) | set(exports))
+
+    if sys.version_info < (3, 7):
+        for name in exports:
+            __getattr__(name)
+    return __getattr__, __dir__
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Adapters give the submitted data of any type the `getlist(name)` method
+the forms use to read it, without copying it.
+
+The adapter is chosen once for each type of data: the types with a
+`getlist` method (Werkzeug and Django MultiDicts) are used as they are, the
+WebOb MultiDicts use their `getall` method, and plain dicts (or any other
+mapping) get a function that reads the single value of each key.
+"""
+from .utils import PrefixIndex
+
+
+#: Registered adapters, tried from the last to the first.
+_adapters = []
+
+#: The adapter resolved for each type of data.
+_by_type = {}
+
+
+def register_adapter(check, adapter, copy_on_write=False):
+    """Register an adapter for the types of data that pass `check`.
+
+    :param check:
+        A function that takes the type of the data and returns whether
+        the adapter can handle it.
+
+    :param adapter:
+        A function that takes the data and returns a `getlist(name)`
+        function that returns a list with the values of `name`.
+
+    :param copy_on_write:
+        If `True`, the data is copied (as a `dict`) before being changed
+        by the `prepare` method of a form, instead of changing the original.
+
+    The adapters registered later have priority.
+    """
+    _adapters.append((check, adapter, copy_on_write))
+    _by_type.clear()
+
+
+def get_adapter(data_type):
+    """Return the `(adapter, copy_on_write)` of `data_type`, resolving it
+    the first time.
+    """
+    found = _by_type.get(data_type)
+    if found is None:
+        for check, adapter, copy_on_write in reversed(_adapters):
+            if check(data_type):
+                found = (adapter, copy_on_write)
+                break
+        else:
+            raise TypeError('No adapter for %r' % (data_type,))
+        _by_type[data_type] = found
+    return found
+
+
+def adapt(data):
+    """Wrap the submitted `data` in a `PrefixIndex` with the `getlist`
+    function of its type. If the data is already wrapped, it's returned
+    as it is.
+    """
+    if isinstance(data, PrefixIndex):
+        return data
+    if data is None:
+        data = {}
+    adapter, copy_on_write = get_adapter(type(data))
+    return PrefixIndex(data, adapter, copy_on_write)
+
+
+def dict_getlist(data):
+    get = data.get
+
+    def getlist(name):
+        value = get(name)
+        if value is None:
+            return []
+        return [value]
+    return getlist
+
+
+def native_getlist(data):
+    return data.getlist
+
+
+def webob_getlist(data):
+    return data.getall
+
+
+register_adapter(lambda cls: True, dict_getlist, copy_on_write=True)
+register_adapter(lambda cls: hasattr(cls, 'getall'), webob_getlist)
+register_adapter(lambda cls: hasattr(cls, 'getlist'), native_getlist)
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Bind forms to the body of an ASGI request, consuming it as it arrives.
+
+The text values are decoded chunk by chunk and the uploaded files are
+written, also chunk by chunk, to a *sink*, so neither the whole body nor a
+whole file has to be in memory, and the size limits are checked as the
+bytes arrive instead of after reading everything.
+
+Requires Python 3.6+.
+"""
+from ._compat import to_unicode
+from .body import (BodyData, BodyFile, MultipartStream, UrlencodedStream,
+                   get_key_filter, rx_boundary)
+from .limits import LimitError, get_limits
+
+
+#: Default maximum size, in bytes, of each text value.
+MAX_FIELD_SIZE = 1024 * 1024
+
+
+class MemorySink(object):
+
+    """The default sink of the uploaded files: keeps them in memory, as
+    `BodyFile` objects.
+
+    A sink is a callable that takes the `name`, `filename` and
+    `content_type` of an uploaded file and returns a writer: an object with
+    a `write(chunk)` method, called with each chunk of the file, and a
+    `close()` method that returns the value to bind to the field. Both
+    methods can also be coroutines.
+    """
+
+    def __call__(self, name, filename, content_type):
+        return MemoryWriter(name, filename, content_type)
+
+
+class MemoryWriter(object):
+
+    def __init__(self, name, filename, content_type):
+        self.name = name
+        self.filename = filename
+        self.content_type = content_type
+        self.buffer = bytearray()
+
+    def write(self, chunk):
+        self.buffer += chunk
+
+    def close(self):
+        return BodyFile(self.name, self.filename, self.content_type,
+                        memoryview(self.buffer))
+
+
+async def from_asgi(form_class, receive, scope, sink=None, charset='utf-8',
+                    max_field_size=MAX_FIELD_SIZE, max_file_size=None,
+                    max_sizes=None, **kwargs):
+    """Read the body of an ASGI request and make a form of `form_class`
+    with it. See `Form.from_asgi`.
+    """
+    if max_file_size is None:
+        limits = get_limits(form_class, kwargs.get('limits'))
+        max_file_size = limits and limits.get('max_file_size')
+    data, files = await read_body(
+        receive, scope, form_class=form_class, sink=sink, charset=charset,
+        prefix=kwargs.get('prefix', u''), max_field_size=max_field_size,
+        max_file_size=max_file_size, max_sizes=max_sizes)
+    return form_class(data, files=files, **kwargs)
+
+
+async def read_body(receive, scope, form_class=None, sink=None,
+                    charset='utf-8', prefix=u'', max_field_size=MAX_FIELD_SIZE,
+                    max_file_size=None, max_sizes=None):
+    """Read the body of an ASGI request. Returns the `data` and `files` to
+    bind a form to.
+
+    :param receive:
+        The ASGI `receive` awaitable callable.
+
+    :param scope:
+        The ASGI connection scope, to read the Content-Type header from.
+
+    :param form_class:
+        If provided, only the keys read by this form class (with this
+        `prefix`) are decoded; the rest are skipped as they arrive.
+
+    :param sink:
+        Where the uploaded files are written. See `MemorySink`.
+
+    :param max_field_size:
+        Maximum size, in bytes, of each text value (`None` for no limit).
+
+    :param max_file_size:
+        Maximum size, in bytes, of each uploaded file (`None` for no limit).
+
+    :param max_sizes:
+        A dict with the maximum size of the values of some keys, that
+        overrides the two above.
+
+    Raises `LimitError` as soon as a value or file is too large.
+    """
+    content_type = get_header(scope, b'content-type')
+    wanted = get_key_filter(form_class, prefix) if form_class else None
+    mimetype = content_type.split(';', 1)[0].strip().lower()
+    if mimetype == 'application/x-www-form-urlencoded':
+        stream = UrlencodedStream(wanted, charset, max_size=max_size_of(
+            max_sizes, max_field_size))
+        reader = read_urlencoded
+    elif mimetype == 'multipart/form-data':
+        match = rx_boundary.search(content_type)
+        if not match:
+            raise ValueError('Missing the multipart boundary')
+        stream = MultipartStream(match.group(1).encode('latin-1'), wanted,
+                                 charset)
+        reader = read_multipart
+    else:
+        raise ValueError('Unsupported content type: %r' % (content_type,))
+
+    max_sizes = max_sizes or {}
+    return await reader(
+        receive, stream, sink or MemorySink(), charset,
+        lambda name, is_file: max_sizes.get(
+            name, max_file_size if is_file else max_field_size))
+
+
+async def read_urlencoded(receive, stream, sink, charset, get_limit):
+    data = BodyData()
+
+    def add(pairs):
+        for key, value in pairs:
+            limit = get_limit(key, False)
+            if limit is not None and len(value) > limit:
+                raise LimitError('max_value_length', key, limit, len(value))
+            data.setdefault(key, []).append(value)
+
+    async for chunk in iter_body(receive):
+        add(stream.feed(chunk))
+    add(stream.close())
+    return data, BodyData()
+
+
+async def read_multipart(receive, stream, sink, charset, get_limit):
+    data = BodyData()
+    files = BodyData()
+    name = writer = value = None
+    size = limit = 0
+    kind = None
+
+    async for chunk in iter_body(receive):
+        for event in stream.feed(chunk):
+            if event[0] == 'part':
+                _, name, filename, content_type = event
+                size = 0
+                limit = get_limit(name, filename is not None)
+                kind = 'max_value_length' if filename is None \
+                    else 'max_file_size'
+                if filename is not None:
+                    writer = sink(name, filename, content_type)
+                else:
+                    writer = None
+                    value = bytearray()
+            elif event[0] == 'data':
+                size += len(event[1])
+                if limit is not None and size > limit:
+                    raise LimitError(kind, name, limit, size)
+                if writer is None:
+                    value += event[1]
+                else:
+                    await maybe_await(writer.write(event[1]))
+            else:
+                if writer is None:
+                    data.setdefault(name, []).append(
+                        to_unicode(bytes(value), charset))
+                else:
+                    files.setdefault(name, []).append(
+                        await maybe_await(writer.close()))
+                writer = value = None
+    stream.close()
+    return data, files
+
+
+async def iter_body(receive):
+    """Yield the chunks of the body of the request."""
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            raise ValueError('The client disconnected')
+        chunk = message.get('body')
+        if chunk:
+            yield chunk
+        if not message.get('more_body'):
+            return
+
+
+async def maybe_await(value):
+    if hasattr(value, '__await__'):
+        return await value
+    return value
+
+
+def max_size_of(max_sizes, max_field_size):
+    """The maximum size of an urlencoded `key=value` pair, before decoding
+    it: escaping can make a value up to three times larger.
+    """
+    sizes = [max_field_size] + list((max_sizes or {}).values())
+    if None in sizes:
+        return None
+    return 3 * max(sizes) + 1024
+
+
+def get_header(scope, name):
+    for key, value in scope.get('headers') or ():
+        if key.lower() == name:
+            return value.decode('latin-1')
+    return u''
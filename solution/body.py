@@ -0,0 +1,435 @@
+# -*- coding: utf-8 -*-
+"""
+Parse `application/x-www-form-urlencoded` and `multipart/form-data` request
+bodies straight into the data of a form, without building the MultiDicts of
+a web framework first.
+
+Only the keys that the form (its fields, and those of its sub-forms and
+form sets) will read are decoded. The values of any other key are skipped
+without being copied, and the contents of the uploaded files are
+`memoryview` slices of the body.
+"""
+import re
+
+from ._compat import PY2, to_unicode
+from .limits import LimitError
+from .plan import get_plan, normalize_prefix
+from .utils import LazyRegex
+
+if PY2:
+    from urllib import unquote_plus as _unquote_plus
+
+    def unquote_plus(value, charset):
+        return _unquote_plus(value).decode(charset)
+else:
+    from urllib.parse import unquote_plus as _unquote_plus
+
+    def unquote_plus(value, charset):
+        return _unquote_plus(value.decode('latin-1'), encoding=charset)
+
+
+rx_boundary = LazyRegex(r'boundary="?([^";,]+)"?', re.IGNORECASE)
+rx_name = LazyRegex(r';\s*name="([^"]*)"', re.IGNORECASE)
+rx_filename = LazyRegex(r';\s*filename="([^"]*)"', re.IGNORECASE)
+
+
+class BodyData(dict):
+
+    """The values of the parsed body, as lists by key."""
+
+    def getlist(self, key):
+        return self.get(key) or []
+
+
+class BodyFile(object):
+
+    """A file uploaded in a multipart body.
+
+    :param name:
+        The name of the field.
+
+    :param filename:
+        The name of the file in the client.
+
+    :param content_type:
+        The content type of the file, as sent by the client.
+
+    :param data:
+        The contents of the file, as a `memoryview` of the body.
+
+    """
+
+    def __init__(self, name, filename, content_type, data):
+        self.name = name
+        self.filename = filename
+        self.content_type = content_type
+        self.data = data
+
+    @property
+    def size(self):
+        return len(self.data)
+
+    def read(self):
+        return self.data.tobytes()
+
+    def __len__(self):
+        return len(self.data)
+
+    def __repr__(self):
+        return '<BodyFile %s %r (%i bytes)>' % (
+            self.name, self.filename, self.size)
+
+
+def parse_body(body, content_type, form_class=None, prefix=u'',
+               charset='utf-8'):
+    """Parse the `body` of a request. Returns the `data` and `files` to
+    bind a form to.
+
+    :param body:
+        The body of the request, as bytes.
+
+    :param content_type:
+        The value of the Content-Type header, used to choose the parser and
+        to get the boundary of multipart bodies.
+
+    :param form_class:
+        If provided, only the keys read by this form class (with this
+        `prefix`) are decoded.
+
+    """
+    wanted = get_key_filter(form_class, prefix) if form_class else None
+    mimetype = content_type.split(';', 1)[0].strip().lower()
+    if mimetype == 'application/x-www-form-urlencoded':
+        raw_wanted = None
+        if form_class:
+            raw_wanted = get_key_filter(form_class, prefix, charset=charset)
+        data = parse_urlencoded(body, wanted, charset, raw_wanted=raw_wanted)
+        return data, BodyData()
+    if mimetype == 'multipart/form-data':
+        match = rx_boundary.search(content_type)
+        if not match:
+            raise ValueError('Missing the multipart boundary')
+        return parse_multipart(body, match.group(1).encode('latin-1'),
+                               wanted, charset)
+    raise ValueError('Unsupported content type: %r' % (content_type,))
+
+
+def parse_urlencoded(body, wanted=None, charset='utf-8', raw_wanted=None):
+    """Parse an urlencoded body.
+
+    :param wanted:
+        A function that tests if a (decoded) key must be included.
+
+    :param raw_wanted:
+        The `match` method of a bytes regex that tests the keys that aren't
+        escaped, in place in the body, as `raw_wanted(body, start, end)`.
+        The other keys are skipped without copying them.
+
+    """
+    data = BodyData()
+    size = len(body)
+    pos = 0
+    while pos < size:
+        end = body.find(b'&', pos)
+        if end == -1:
+            end = size
+        eq = body.find(b'=', pos, end)
+        key_end = end if eq == -1 else eq
+        if key_end > pos:
+            key = None
+            if raw_wanted is None:
+                key = unquote_plus(body[pos:key_end], charset)
+            elif raw_wanted(body, pos, key_end):
+                key = body[pos:key_end].decode(charset)
+            elif is_escaped(body, pos, key_end):
+                key = unquote_plus(body[pos:key_end], charset)
+            if key is not None and (wanted is None or wanted(key)):
+                value = u''
+                if eq != -1:
+                    value = unquote_plus(body[eq + 1:end], charset)
+                data.setdefault(key, []).append(value)
+        pos = end + 1
+    return data
+
+
+def is_escaped(body, start, end):
+    return body.find(b'%', start, end) != -1 or \
+        body.find(b'+', start, end) != -1
+
+
+def parse_multipart(body, boundary, wanted=None, charset='utf-8'):
+    data = BodyData()
+    files = BodyData()
+    view = memoryview(body)
+    delimiter = b'--' + boundary
+    pos = body.find(delimiter)
+    if pos == -1:
+        raise ValueError('Invalid multipart body')
+
+    while True:
+        pos += len(delimiter)
+        if body[pos:pos + 2] == b'--':
+            break
+        headers_start = body.find(b'\r\n', pos) + 2
+        headers_end = body.find(b'\r\n\r\n', headers_start)
+        if headers_start == 1 or headers_end == -1:
+            raise ValueError('Invalid multipart body')
+        content_end = body.find(b'\r\n' + delimiter, headers_end + 4)
+        if content_end == -1:
+            raise ValueError('Invalid multipart body')
+
+        headers = body[headers_start:headers_end].decode(charset)
+        name, filename, content_type = parse_part_headers(headers)
+        if name is not None and (wanted is None or wanted(name)):
+            content = view[headers_end + 4:content_end]
+            if filename is not None:
+                files.setdefault(name, []).append(
+                    BodyFile(name, filename, content_type, content))
+            else:
+                data.setdefault(name, []).append(
+                    to_unicode(content.tobytes(), charset))
+        pos = content_end + 2
+    return data, files
+
+
+def parse_part_headers(headers):
+    name = filename = content_type = None
+    for line in headers.split(u'\r\n'):
+        header, _, value = line.partition(u':')
+        header = header.strip().lower()
+        if header == u'content-disposition':
+            match = rx_name.search(value)
+            name = match.group(1) if match else None
+            match = rx_filename.search(value)
+            filename = match.group(1) if match else None
+        elif header == u'content-type':
+            content_type = value.strip()
+    return name, filename, content_type
+
+
+def get_key_filter(form_class, prefix=u'', charset=None):
+    """Return a function that tests if a key will be read by a form of
+    `form_class` with `prefix`, or any of its sub-forms or form sets.
+
+    If a `charset` is provided, the function is the `match` method of a
+    bytes regex instead, to test the keys encoded with that charset.
+    """
+    prefix = normalize_prefix(prefix)
+    filters = form_class.__dict__.get('_key_filters')
+    if filters is None:
+        filters = {}
+        form_class._key_filters = filters
+    wanted = filters.get((prefix, charset))
+    if wanted is None:
+        pattern = u'%s(?:%s)\\Z' % (re.escape(prefix),
+                                    get_key_pattern(form_class))
+        if charset:
+            pattern = pattern.encode(charset)
+        wanted = re.compile(pattern).match
+        filters[(prefix, charset)] = wanted
+    return wanted
+
+
+def get_key_pattern(form_class):
+    """Return a regular expression that matches the keys of the form
+    class, without its prefix.
+    """
+    plan = get_plan(form_class)
+    parts = [re.escape(entry[0]) for entry in plan.fields]
+    for _, subform_class, subform_prefix, _ in plan.forms:
+        parts.append(u'%s(?:%s)' % (
+            re.escape(subform_prefix), get_key_pattern(subform_class)))
+    for _, _, row_class, _, _ in plan.sets:
+        parts.append(u'%s[0-9]+-(?:%s)' % (
+            re.escape(row_class.__name__.lower() + u'.'),
+            get_key_pattern(row_class)))
+    return u'|'.join(parts)
+
+
+class UrlencodedStream(object):
+
+    """Incremental parser of an urlencoded body. Each call to `feed` with a
+    chunk of the body returns the list of `(key, value)` pairs completed.
+
+    :param wanted:
+        A function that tests if a (decoded) key must be included.
+        The values of the other keys are skipped as they arrive, without
+        being buffered.
+
+    :param max_size:
+        Maximum size, in bytes, of each `key=value` pair.
+
+    """
+
+    def __init__(self, wanted=None, charset='utf-8', max_size=None):
+        self.wanted = wanted
+        self.charset = charset
+        self.max_size = max_size
+        self.buffer = bytearray()
+        self.skipping = False
+
+    def feed(self, chunk):
+        pairs = []
+        buffer = self.buffer
+        buffer += chunk
+        while True:
+            end = buffer.find(b'&')
+            if self.skipping:
+                if end == -1:
+                    del buffer[:]
+                    return pairs
+                self.skipping = False
+                del buffer[:end + 1]
+                continue
+            if end == -1:
+                self._check_pending()
+                return pairs
+            self._parse_pair(bytes(buffer[:end]), pairs)
+            del buffer[:end + 1]
+
+    def close(self):
+        pairs = []
+        if self.buffer and not self.skipping:
+            self._parse_pair(bytes(self.buffer), pairs)
+        del self.buffer[:]
+        return pairs
+
+    def _check_pending(self):
+        """Start skipping the pending pair if its key is already complete
+        and unwanted, or fail if it's too large.
+        """
+        buffer = self.buffer
+        eq = buffer.find(b'=')
+        if eq != -1 and not self._is_wanted(bytes(buffer[:eq])):
+            self.skipping = True
+            del buffer[:]
+        elif self.max_size is not None and len(buffer) > self.max_size:
+            key = buffer[:eq] if eq != -1 else buffer[:64]
+            raise LimitError('max_value_length',
+                             unquote_plus(bytes(key), self.charset),
+                             self.max_size, len(buffer))
+
+    def _is_wanted(self, key):
+        return self.wanted is None or \
+            self.wanted(unquote_plus(key, self.charset))
+
+    def _parse_pair(self, pair, pairs):
+        if self.max_size is not None and len(pair) > self.max_size:
+            key = pair.split(b'=', 1)[0]
+            if self._is_wanted(key):
+                raise LimitError('max_value_length',
+                                 unquote_plus(key, self.charset),
+                                 self.max_size, len(pair))
+            return
+        key, eq, value = pair.partition(b'=')
+        if not key:
+            return
+        key = unquote_plus(key, self.charset)
+        if self.wanted is None or self.wanted(key):
+            pairs.append((key, unquote_plus(value, self.charset)))
+
+
+class MultipartStream(object):
+
+    """Incremental parser of a multipart body. Each call to `feed` with a
+    chunk of the body returns a list of events:
+
+    - ``('part', name, filename, content_type)`` when a part starts;
+    - ``('data', bytes)`` with a piece of the content of the part;
+    - ``('end',)`` when the part ends.
+
+    The parts whose name isn't `wanted` are skipped without any event.
+
+    :param boundary:
+        The boundary of the parts, as bytes.
+
+    :param max_header_size:
+        Maximum size, in bytes, of the headers of each part.
+
+    """
+    PREAMBLE, DELIMITER, HEADERS, CONTENT, END = range(5)
+
+    def __init__(self, boundary, wanted=None, charset='utf-8',
+                 max_header_size=8192):
+        self.delimiter = b'--' + boundary
+        self.wanted = wanted
+        self.charset = charset
+        self.max_header_size = max_header_size
+        self.buffer = bytearray()
+        self.state = self.PREAMBLE
+        self.skipping = False
+
+    def feed(self, chunk):
+        events = []
+        self.buffer += chunk
+        while self._step(events):
+            pass
+        return events
+
+    def close(self):
+        if self.state != self.END:
+            raise ValueError('Invalid multipart body')
+        return []
+
+    def _step(self, events):
+        buffer = self.buffer
+        delimiter = self.delimiter
+
+        if self.state == self.PREAMBLE:
+            start = buffer.find(delimiter)
+            if start == -1:
+                # Keep just enough to find a delimiter split in two chunks
+                del buffer[:max(0, len(buffer) - len(delimiter))]
+                return False
+            del buffer[:start + len(delimiter)]
+            self.state = self.DELIMITER
+            return True
+
+        if self.state == self.DELIMITER:
+            if len(buffer) < 2:
+                return False
+            if buffer[:2] == b'--':
+                self.state = self.END
+                del buffer[:]
+                return False
+            if buffer[:2] != b'\r\n':
+                raise ValueError('Invalid multipart body')
+            del buffer[:2]
+            self.state = self.HEADERS
+            return True
+
+        if self.state == self.HEADERS:
+            end = buffer.find(b'\r\n\r\n')
+            if end == -1:
+                if len(buffer) > self.max_header_size:
+                    raise ValueError('The headers of a part are too large')
+                return False
+            headers = bytes(buffer[:end]).decode(self.charset)
+            del buffer[:end + 4]
+            name, filename, content_type = parse_part_headers(headers)
+            self.skipping = name is None or (
+                self.wanted is not None and not self.wanted(name))
+            if not self.skipping:
+                events.append(('part', name, filename, content_type))
+            self.state = self.CONTENT
+            return True
+
+        if self.state == self.CONTENT:
+            end = buffer.find(b'\r\n' + delimiter)
+            if end == -1:
+                # The end of the buffer could be the start of a delimiter
+                keep = len(delimiter) + 1
+                if len(buffer) > keep:
+                    if not self.skipping:
+                        events.append(('data', bytes(buffer[:-keep])))
+                    del buffer[:-keep]
+                return False
+            if not self.skipping:
+                if end:
+                    events.append(('data', bytes(buffer[:end])))
+                events.append(('end',))
+            del buffer[:end + 2 + len(delimiter)]
+            self.state = self.DELIMITER
+            return True
+
+        return False
@@ -0,0 +1,484 @@
+# -*- coding: utf-8 -*-
+"""
+Generates, for each form class, specialized straight-line versions of the
+loops that load the data into the fields and validate them.
+
+The generated code has the validators already partitioned and unrolled, and
+calls the `prepare_<name>`/`clean_<name>` hooks directly. Fields whose class
+overwrites any of the methods involved are handled by calling those methods,
+like the generic code does.
+
+Enable it with `_compile = True` in a form class, or for every form by
+setting the `SOLUTION_COMPILE=1` environment variable.
+
+Generating and compiling the source are the slow parts, so the compiled
+structure of each form can be stored in a cache directory, like the `.pyc`
+files, and loaded from there the next time the process starts. Set the
+`SOLUTION_CACHE_DIR` environment variable, or call `set_cache_dir`.
+
+The files are keyed by a fingerprint of the form class (see `fingerprint`),
+that is much cheaper to compute than the code, and the version of Python.
+Each one stores the source, its code object and the names of the constants
+it uses. Those names encode the position of each field in the binding plan,
+the partitioning of its validators and its hooks, so on a hit the constants
+are taken from the plan by index without generating anything.
+"""
+import marshal
+import os
+import sys
+import types
+
+from .fields.field import Field, ValidationError, without_traceback
+from .plan import get_plan
+from .extractors import extract_values
+
+
+COMPILE_ALL = os.environ.get('SOLUTION_COMPILE') == '1'
+
+#: Directory to store the compiled code in, or `None` to not cache it.
+CACHE_DIR = os.environ.get('SOLUTION_CACHE_DIR') or None
+
+try:
+    from importlib.util import MAGIC_NUMBER
+except ImportError:  # Python 2
+    from imp import get_magic
+    MAGIC_NUMBER = get_magic()
+
+#: Methods that must not be overwritten by the field class to inline
+#: the loading of the data.
+LOAD_METHODS = ('load_data', '_clean_data')
+
+#: Methods that must not be overwritten by the field class to inline
+#: the validation.
+VALIDATE_METHODS = ('validate', 'validate_field', 'to_python',
+                    'validate_value', 'validate_form', 'clean_value')
+
+#: Methods that, if overwritten by the field class, can validate the field
+#: against the cleaned data of the form.
+RELATION_METHODS = ('validate', 'validate_form')
+
+#: The groups of methods checked by the generator for each field class.
+METHOD_GROUPS = (LOAD_METHODS, VALIDATE_METHODS, ('is_empty',),
+                 RELATION_METHODS)
+
+#: The results of `inherits_class`, by field class and methods.
+_inherited = {}
+
+#: The results of `get_overwritten`, by field class.
+_overwritten = {}
+
+#: Changed whenever the generated code or the format of the cache files
+#: changes, so old files are not used.
+CACHE_VERSION = b'solution-compiled-2'
+
+#: The constants that don't depend on the form class.
+BUILTINS = {
+    'ValidationError': ValidationError,
+    'without_traceback': without_traceback,
+    'extract_values': extract_values,
+}
+
+
+class CompiledForm(object):
+
+    """The generated functions of a form class.
+
+    :param form_class:
+        The form class.
+
+    :param source:
+        The generated Python source.
+
+    :param code:
+        The code object of the source.
+
+    :param namespace:
+        The constants referenced by the source.
+
+    """
+
+    def __init__(self, form_class, source, code, namespace):
+        self.form_class = form_class
+        self.source = source
+        exec(code, namespace)
+        self.load_fields = namespace['load_fields']
+        self.validate_fields = namespace['validate_fields']
+
+    def __repr__(self):
+        return '<CompiledForm %s>' % (self.form_class.__name__,)
+
+
+def get_compiled(form_class):
+    """Return the `CompiledForm` of `form_class`, generating it the first
+    time, or `None` if the compilation isn't enabled for the class.
+    """
+    if not (form_class._compile or COMPILE_ALL):
+        return None
+    compiled = form_class.__dict__.get('_compiled')
+    if compiled is None:
+        compiled = compile_form(form_class)
+        form_class._compiled = compiled
+    return compiled
+
+
+def compile_form(form_class):
+    """Generate the `CompiledForm` of `form_class`, or load it from the
+    cache directory.
+    """
+    filename = '<solution.compiled %s.%s>' % (
+        form_class.__module__, form_class.__name__)
+    key = fingerprint(form_class) if CACHE_DIR else None
+    if key is not None:
+        compiled = load_cached(form_class, key)
+        if compiled is not None:
+            return compiled
+
+    source, namespace = generate(form_class)
+    code = compile(source, filename, 'exec')
+    if key is not None:
+        names = tuple(sorted(name for name in namespace
+                             if name not in BUILTINS))
+        store_cached(key, (source, code, names))
+    return CompiledForm(form_class, source, code, namespace)
+
+
+def set_cache_dir(path):
+    """Set the directory to store the compiled code in. Use `None` to
+    disable the cache.
+    """
+    global CACHE_DIR
+    CACHE_DIR = path
+
+
+def fingerprint(form_class):
+    """Return the cache key of `form_class`: a hash of everything its
+    generated code depends on. Those are the names of the fields and, for
+    each one, the number of field and form validators, whether it's
+    optional, whether it has its own `prepare`, `clean` and `when`, the
+    kind of its hooks, and which methods its class overwrites.
+    """
+    # Imported here so it isn't imported at all without a cache
+    import hashlib
+
+    parts = [form_class.__module__, form_class.__name__]
+    for name, spec, prepare, clean in get_plan(form_class).fields:
+        parts.append((
+            name,
+            get_overwritten(spec.__class__),
+            len(spec.field_validators),
+            len(spec.form_validators),
+            bool(spec.optional),
+            spec.prepare is None,
+            spec.clean is None,
+            spec.when is None,
+            hook_kind(prepare),
+            hook_kind(clean),
+        ))
+    key = hashlib.sha1(MAGIC_NUMBER + CACHE_VERSION)
+    key.update(repr(parts).encode('utf8'))
+    return key.hexdigest()
+
+
+def get_overwritten(fclass):
+    """Return which groups of `METHOD_GROUPS` the field class overwrites.
+    """
+    result = _overwritten.get(fclass)
+    if result is None:
+        result = _overwritten[fclass] = tuple(
+            not inherits_class(fclass, methods) for methods in METHOD_GROUPS)
+    return result
+
+
+def hook_kind(hook):
+    if hook is None:
+        return 0
+    return 1 if isinstance(hook, types.FunctionType) else 2
+
+
+def get_cache_path(key):
+    tag = getattr(sys, 'implementation', None)
+    tag = tag.cache_tag if tag else 'py%i%i' % sys.version_info[:2]
+    return os.path.join(CACHE_DIR, '%s.%s.bin' % (key, tag))
+
+
+def load_cached(form_class, key):
+    """Return the `CompiledForm` of `form_class` stored with `key` in the
+    cache directory, or `None` if it isn't there (or the cache is disabled
+    or the file is not valid).
+    """
+    if not CACHE_DIR:
+        return None
+    try:
+        with open(get_cache_path(key), 'rb') as f:
+            source, code, names = marshal.load(f)
+        namespace = dict(BUILTINS)
+        fields = get_plan(form_class).fields
+        for name in names:
+            namespace[name] = resolve_constant(name, fields)
+        return CompiledForm(form_class, source, code, namespace)
+    except (IOError, OSError, EOFError, ValueError, TypeError, IndexError,
+            KeyError, NameError):
+        return None
+
+
+def resolve_constant(name, fields):
+    """Return the object of the constant `name` of the generated code:
+    `S<i>` is the spec of the field `i` of the plan, `P<i>` and `C<i>` its
+    hooks, and `V<i>_<j>` and `FV<i>_<j>` its field and form validator
+    `j`.
+    """
+    kind = name.rstrip('0123456789_')
+    numbers = [int(n) for n in name[len(kind):].split('_')]
+    entry = fields[numbers[0]]
+    if kind == 'S':
+        return entry[1]
+    if kind == 'P':
+        return entry[2]
+    if kind == 'C':
+        return entry[3]
+    if kind == 'V':
+        return entry[1].field_validators[numbers[1]]
+    if kind == 'FV':
+        return entry[1].form_validators[numbers[1]]
+    raise KeyError(name)
+
+
+def store_cached(key, entry):
+    """Store the `entry` (source, code and names of the constants) with
+    `key` in the cache directory. Any error is ignored: the cache is only
+    an optimization.
+    """
+    if not CACHE_DIR:
+        return
+    import tempfile  # Slow to import, and only needed with a cache
+
+    path = get_cache_path(key)
+    try:
+        if not os.path.isdir(CACHE_DIR):
+            os.makedirs(CACHE_DIR)
+        # Write to a temporary file first so other processes never
+        # read an incomplete file.
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR)
+    except (IOError, OSError):
+        return
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            marshal.dump(entry, f)
+        getattr(os, 'replace', os.rename)(tmp_path, path)
+    except (IOError, OSError):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def generate(form_class):
+    """Return the Python source of the specialized functions of the
+    `form_class` and the namespace of constants it needs.
+    """
+    namespace = dict(BUILTINS)
+    fields = get_plan(form_class).fields
+    load = [
+        'def load_fields(form, data, obj, files):',
+        '    fields = form._field_map',
+        '    locale = form._locale',
+        '    tz = form._tz',
+        '    getlist = data.getlist',
+        '    getfiles = files.getlist',
+        '    obj_values = extract_values(form.__class__, obj)',
+    ]
+    validate = [
+        'def validate_fields(form, cleaned_data, changed_fields, errors,',
+        '                    named_errors):',
+        '    fields = form._field_map',
+    ]
+    relations = []
+
+    for i, (name, spec, prepare, clean) in enumerate(fields):
+        namespace['S%i' % i] = spec
+        load.extend(gen_load(i, name, spec, prepare, namespace))
+        if spec.when is not None:
+            # Validated later by `Form._validate_conditional`
+            continue
+        validate.extend(gen_validate(i, name, spec, clean, namespace))
+        relations.extend(gen_relations(i, name, spec, namespace))
+
+    validate.extend(relations)
+    load.append('    return')
+    validate.append('    return')
+    return '\n'.join(load + [''] + validate) + '\n', namespace
+
+
+def gen_load(i, name, spec, prepare, namespace):
+    lines = [
+        '    # %s' % (name,),
+        '    field = fields[%r]' % (name,),
+    ]
+    if not inherits(spec, LOAD_METHODS):
+        return lines + [
+            '    pname = field.name',
+            '    field.load_data(getlist(pname), obj_values[%i],' % (i,),
+            '                    file_data=getfiles(pname),',
+            '                    locale=locale, tz=tz)',
+        ]
+
+    lines.extend([
+        '    pname = field.name',
+        '    str_value = getlist(pname)',
+        '    str_value = str_value[0] if str_value else None',
+        '    file_data = getfiles(pname)',
+        '    file_data = file_data[0] if file_data else None',
+        '    obj_value = obj_values[%i]' % (i,),
+    ])
+    if spec.prepare is not None:
+        lines.append('    obj_value = S%i.prepare(obj_value, locale=locale, '
+                     'tz=tz)' % (i,))
+    elif prepare is not None:
+        lines.append(call_hook('obj_value', 'P%i' % i, prepare, 'obj_value',
+                               namespace, kwargs='locale=locale, tz=tz'))
+    lines.extend([
+        '    field.str_value = str_value',
+        '    field.file_data = file_data',
+        '    field.obj_value = obj_value',
+        '    field.empty = not bool(str_value or file_data or obj_value)',
+    ])
+    return lines
+
+
+def gen_validate(i, name, spec, clean, namespace):
+    lines = [
+        '    # %s' % (name,),
+        '    field = fields[%r]' % (name,),
+        '    field.error = None',
+    ]
+    if not inherits(spec, VALIDATE_METHODS):
+        lines.append('    py_value = field.validate(form)')
+    else:
+        lines.extend([
+            '    try:',
+            '        py_value = field.str_to_py()',
+            '    except ValidationError as error:',
+            '        field.error = without_traceback(error)',
+            '        py_value = None',
+        ])
+        indent = '    '
+        if spec.optional:
+            if inherits(spec, ('is_empty',)):
+                lines.append('    if not py_value:')
+            else:
+                lines.append('    if field.is_empty(py_value):')
+            lines.extend([
+                '        py_value = field.default or py_value',
+                '    else:',
+            ])
+            indent = '        '
+        lines.extend(gen_validators(
+            indent, 'V%i_' % i, spec.field_validators, 'py_value',
+            namespace, on_error='%s    py_value = None' % indent))
+        if spec.optional and not spec.field_validators:
+            lines.append(indent + 'pass')
+
+        if spec.clean is not None:
+            lines.extend(gen_clean('S%i.clean(py_value)' % i))
+        elif clean is not None:
+            lines.extend(gen_clean(call_hook(
+                None, 'C%i' % i, clean, 'py_value', namespace)))
+        lines.append('    field.has_changed = (py_value != field.obj_value)')
+
+    lines.extend([
+        '    if field.error:',
+        '        errors[%r] = field.error' % (name,),
+        '        named_errors[field.name] = field.error',
+        '    else:',
+        '        cleaned_data[%r] = py_value' % (name,),
+        '        if field.has_changed:',
+        '            changed_fields.append(%r)' % (name,),
+    ])
+    return lines
+
+
+def gen_relations(i, name, spec, namespace):
+    if not spec.form_validators and inherits(spec, RELATION_METHODS):
+        return []
+    lines = [
+        '    # %s (form validators)' % (name,),
+        '    field = fields[%r]' % (name,),
+    ]
+    if not inherits(spec, VALIDATE_METHODS):
+        lines.append('    field.validate(form, cleaned_data)')
+    else:
+        lines.extend(gen_validators(
+            '    ', 'FV%i_' % i, spec.form_validators, 'cleaned_data',
+            namespace))
+    lines.extend([
+        '    if field.error:',
+        '        errors[%r] = field.error' % (name,),
+        '        named_errors[field.name] = field.error',
+    ])
+    return lines
+
+
+def gen_validators(indent, prefix, validators, value, namespace,
+                   on_error=None):
+    lines = []
+    for j, validator in enumerate(validators):
+        vname = '%s%i' % (prefix, j)
+        namespace[vname] = validator
+        keyword = 'if' if j == 0 else 'elif'
+        lines.extend([
+            '%s%s not %s(%s, form):' % (indent, keyword, vname, value),
+            '%s    field.error = ValidationError(%s.message)' % (
+                indent, vname),
+        ])
+        if on_error:
+            lines.append(on_error)
+    return lines
+
+
+def gen_clean(call):
+    return [
+        '    try:',
+        '        py_value = %s' % (call,),
+        '    except ValidationError as error:',
+        '        field.error = without_traceback(error)',
+        '        py_value = None',
+    ]
+
+
+def call_hook(target, hname, hook, arg, namespace, kwargs=''):
+    """Return the source that calls a `prepare_<name>` or `clean_<name>`
+    hook of the form. Plain functions are called directly instead of
+    creating a bound method first.
+    """
+    args = ', '.join(a for a in (arg, kwargs) if a)
+    namespace[hname] = hook
+    if isinstance(hook, types.FunctionType):
+        call = '%s(form, %s)' % (hname, args)
+    else:
+        call = '%s.__get__(form, form.__class__)(%s)' % (hname, args)
+    if target:
+        return '    %s = %s' % (target, call)
+    return call
+
+
+def inherits(spec, methods):
+    """Return whether the class of `spec` uses the methods of `Field`,
+    without overwriting them.
+    """
+    return inherits_class(spec.__class__, methods)
+
+
+def inherits_class(fclass, methods):
+    # Checked once for each field class
+    result = _inherited.get((fclass, methods))
+    if result is None:
+        result = _inherited[fclass, methods] = all(
+            get_function(fclass, name) is get_function(Field, name)
+            for name in methods)
+    return result
+
+
+def get_function(cls, name):
+    # On Python 2, each lookup makes a new unbound method
+    method = getattr(cls, name)
+    return getattr(method, '__func__', method)
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Extractors read the values of all the fields of a form from an object in
+one call, instead of calling `get_obj_value` for each field.
+
+An extractor is made once for each form class and type of object, by the
+last registered factory that can handle that type, and cached in the form
+class.
+"""
+from operator import attrgetter
+
+
+#: Registered extractor factories, tried from the last to the first.
+_factories = []
+
+
+def register_extractor(factory):
+    """Register an extractor factory.
+
+    The `factory` is called as ``factory(obj_type, names)`` and must return
+    a function that takes an object of that type and returns a tuple with
+    the values of the attributes in `names` (`None` for the missing ones),
+    or `None` if it can't handle the type.
+
+    The factories registered later have priority. If none of them can
+    handle the type, the values are read as attributes.
+    """
+    _factories.append(factory)
+    return factory
+
+
+def get_extractor(form_class, obj_type):
+    """Return the extractor of the fields of `form_class` for the objects of
+    `obj_type`, making it the first time.
+    """
+    extractors = form_class.__dict__.get('_extractors')
+    if extractors is None:
+        extractors = {}
+        form_class._extractors = extractors
+    extractor = extractors.get(obj_type)
+    if extractor is None:
+        names = tuple(form_class._declared_fields)
+        for factory in reversed(_factories):
+            extractor = factory(obj_type, names)
+            if extractor is not None:
+                break
+        else:
+            extractor = attr_extractor(obj_type, names)
+        extractors[obj_type] = extractor
+    return extractor
+
+
+def extract_values(form_class, obj):
+    """Return a tuple with the values in `obj` of the fields of
+    `form_class`, in the order they are declared.
+    """
+    return get_extractor(form_class, type(obj))(obj)
+
+
+def attr_extractor(obj_type, names):
+    """Read the values as attributes, with a single `operator.attrgetter`
+    call. If any of them is missing, read them one by one.
+    """
+    if not names:
+        return lambda obj: ()
+    getter = attrgetter(*names)
+    single = len(names) == 1
+
+    def extract(obj):
+        try:
+            values = getter(obj)
+        except AttributeError:
+            return tuple([getattr(obj, name, None) for name in names])
+        return (values,) if single else values
+    return extract
+
+
+@register_extractor
+def none_extractor(obj_type, names):
+    if obj_type is not type(None):
+        return None
+    values = (None,) * len(names)
+    return lambda obj: values
+
+
+@register_extractor
+def dict_extractor(obj_type, names):
+    if not issubclass(obj_type, dict):
+        return None
+
+    def extract(obj):
+        return tuple(map(obj.get, names))
+    return extract
+
+
+@register_extractor
+def mapped_extractor(obj_type, names):
+    """Read the values of the instances of SQLAlchemy mapped classes from
+    their instance dict, where the ORM keeps the loaded column values, so
+    the instrumented descriptors aren't called for them. The values that
+    aren't loaded (or aren't columns) are read with `getattr`, so they are
+    still loaded by the ORM as usual.
+    """
+    if getattr(obj_type, '_sa_class_manager', None) is None:
+        return None
+
+    def extract(obj):
+        state = obj.__dict__
+        return tuple([
+            state[name] if name in state else getattr(obj, name, None)
+            for name in names
+        ])
+    return extract
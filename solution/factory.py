@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Build form classes at runtime from a declarative schema, for example one
+read from a JSON configuration:
+
+    {
+        "name": "ContactForm",
+        "fields": [
+            {"name": "email", "field": "Text",
+             "validate": ["Required", "ValidEmail"]},
+            {"name": "age", "field": "Number", "type": "int",
+             "validate": [{"validator": "InRange", "args": [18, 99]}]},
+            {"name": "color", "field": "Select",
+             "items": [[1, "Red"], [2, "Green"]], "type": "int"},
+            {"name": "address", "form": {"fields": [...]}},
+            {"name": "lines", "formset": {"fields": [...]}}
+        ]
+    }
+
+The classes are cached by the content of the schema, so the forms of every
+request (and every tenant) with the same schema share the same class and
+everything computed for it.
+"""
+from collections import OrderedDict
+from decimal import Decimal
+import hashlib
+import json
+import threading
+
+from ._compat import string_types, text_type
+from . import fields as _fields
+from . import validators as _validators
+
+
+#: Maximum number of form classes cached by `build_form`.
+CACHE_SIZE = 256
+
+#: Values of the `type` option of the fields.
+TYPES = {
+    'int': int,
+    'float': float,
+    'str': text_type,
+    'bool': bool,
+    'decimal': Decimal,
+}
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def build_form(schema, base=None):
+    """Return a form class built from `schema`, a dict or a JSON string.
+    The classes are cached by the content of the schema, keeping the
+    `CACHE_SIZE` most recently used. A JSON string is parsed first, so the
+    same schema as a dict or as JSON with any formatting gets the same class.
+
+    :param schema:
+        The declarative schema of the form. See the module documentation.
+
+    :param base:
+        The base class of the form. `Form` by default.
+
+    """
+    if base is None:
+        from .form import Form as base
+
+    if isinstance(schema, (string_types, bytes)):
+        if isinstance(schema, bytes):
+            schema = schema.decode('utf8')
+        schema = json.loads(schema)
+    key = (get_schema_hash(schema), base)
+    with _lock:
+        form_class = _cache.pop(key, None)
+        if form_class is not None:
+            # Move it to the end as the most recently used
+            _cache[key] = form_class
+            return form_class
+
+    form_class = make_form_class(schema, base)
+
+    with _lock:
+        _cache[key] = form_class
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return form_class
+
+
+def clear_cache():
+    """Forget the form classes cached by `build_form`."""
+    with _lock:
+        _cache.clear()
+
+
+def get_schema_hash(schema):
+    """Hash the canonical JSON of the (parsed) `schema`."""
+    schema = json.dumps(schema, sort_keys=True, separators=(',', ':'))
+    if isinstance(schema, text_type):
+        schema = schema.encode('utf8')
+    return hashlib.sha1(schema).hexdigest()
+
+
+def make_form_class(schema, base):
+    from .formset import FormSet
+
+    attrs = {}
+    for spec in schema.get('fields', []):
+        spec = dict(spec)
+        name = spec.pop('name')
+        if 'form' in spec:
+            subform_class = make_form_class(spec.pop('form'), base)
+            attrs[name] = subform_class(**spec)
+        elif 'formset' in spec:
+            row_class = make_form_class(spec.pop('formset'), base)
+            attrs[name] = FormSet(row_class, **spec)
+        else:
+            attrs[name] = make_field(spec)
+    if schema.get('compile'):
+        attrs['_compile'] = True
+    name = str(schema.get('name') or 'DynamicForm')
+    return type(base)(name, (base,), attrs)
+
+
+def make_field(spec):
+    field_class = get_public(_fields, spec.pop('field', 'Text'), 'field')
+    if 'validate' in spec:
+        spec['validate'] = [make_validator(v) for v in spec['validate']]
+    if 'type' in spec:
+        if spec['type'] not in TYPES:
+            raise ValueError('Unknown type: %r' % (spec['type'],))
+        spec['type'] = TYPES[spec['type']]
+    if 'items' in spec:
+        spec['items'] = make_items(spec['items'])
+    return field_class(**spec)
+
+
+def make_validator(spec):
+    if isinstance(spec, string_types):
+        return get_public(_validators, spec, 'validator')
+    spec = dict(spec)
+    validator_class = get_public(_validators, spec.pop('validator'),
+                                 'validator')
+    args = spec.pop('args', ())
+    return validator_class(*args, **spec)
+
+
+def make_items(items):
+    """Convert the items of a select: the `[value, label]` lists become
+    tuples and the `{"label": ..., "items": [...]}` dicts become groups.
+    """
+    result = []
+    for item in items:
+        if isinstance(item, dict):
+            group = make_items(item['items'])
+            if item.get('label'):
+                group.insert(0, item['label'])
+            result.append(group)
+        else:
+            result.append(tuple(item))
+    return result
+
+
+def get_public(module, name, kind):
+    if name not in module.__all__:
+        raise ValueError('Unknown %s: %r' % (kind, name))
+    return getattr(module, name)
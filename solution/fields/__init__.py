@@ -1,10 +1,22 @@
-from .field import ValidationError, Field
-from .boolean import Boolean
-from .collection import Collection
-from .color import Color
-from .date import Date
-from .file import File
-from .number import Number
-from .select import Select, MultiSelect
-from .text import Text
-from .time import Time
+from .._compat import lazy_exports
+
+
+_exports = {
+    'ValidationError': '.field',
+    'Field': '.field',
+    'BoundField': '.bound',
+    'Boolean': '.boolean',
+    'Collection': '.collection',
+    'Color': '.color',
+    'Date': '.date',
+    'File': '.file',
+    'Number': '.number',
+    'Select': '.select',
+    'MultiSelect': '.select',
+    'Text': '.text',
+    'Time': '.time',
+}
+
+__all__ = sorted(_exports)
+
+__getattr__, __dir__ = lazy_exports(__name__, _exports)
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+import types
+import weakref
+
+from ..plan import bind_hook
+
+
+#: Per-request state of a field. These are the only attributes stored in the
+#: bound fields; everything else is read from the field spec.
+STATE = ('str_value', 'obj_value', 'file_data', 'error', 'has_changed',
+         'empty')
+
+#: Attributes of the field spec that are not copied to the bound class.
+_SKIP = set(STATE) | set((
+    'field', 'name', 'form', 'prepare', 'clean', 'when', '_bound_class',
+    '__init__', '__new__', '__dict__', '__weakref__', '__slots__',
+    '__module__', '__qualname__', '__class__', '__getattr__',
+))
+
+
+class BoundField(object):
+
+    """The state of a field in a form instance.
+
+    The `Field` declared in a form class is an immutable spec shared by all
+    the instances of that form. Binding it creates one of these lightweight
+    objects, that holds only the per-request state and takes everything else
+    (validators, options and methods) from the spec. The rendering and
+    validation API is the same of the field class, and `isinstance` works
+    with it, but `type()` of a bound field is its `Bound<Field>` class.
+
+    The classes made by `get_bound_class` have a `__dict__` as a fallback,
+    for the field subclasses that store attributes of their own (e.g. in
+    `load_data` or `validate`). It's allocated only by the first of them.
+
+    :param field:
+        The field spec.
+
+    :param name:
+        The name of the field, including the prefix of the form.
+
+    :param form:
+        The form instance. Only a weak reference to it is kept, so the form
+        and its fields don't make a reference cycle. Using the `prepare_` or
+        `clean_` hooks of the form (or anything else that needs it) after
+        the form is gone raises a `ReferenceError`.
+
+    :param prepare:
+        A `prepare_<name>` hook of the form class, used if the spec doesn't
+        have a `prepare` function. It's bound to the form when used.
+
+    :param clean:
+        A `clean_<name>` hook of the form class, used if the spec doesn't
+        have a `clean` function. It's bound to the form when used.
+
+    """
+    __slots__ = ('field', 'name', '_form_ref', '_prepare', '_clean') + STATE
+
+    def __init__(self, field, name, form=None, prepare=None, clean=None):
+        self.field = field
+        self.name = name
+        self.form = form
+        self._prepare = prepare
+        self._clean = clean
+        self.str_value = None
+        self.obj_value = None
+        self.file_data = None
+        self.error = None
+        self.has_changed = False
+        self.empty = True
+
+    @property
+    def __class__(self):
+        # Makes `isinstance(bound, Text)` and `super(Text, self)` work
+        return self.field.__class__
+
+    @property
+    def form(self):
+        ref = self._form_ref
+        if ref is None:
+            return None
+        form = ref()
+        if form is None:
+            raise ReferenceError(
+                u'The form of the field "%s" no longer exists. Keep a '
+                u'reference to the form while using its fields.' % self.name)
+        return form
+
+    @form.setter
+    def form(self, form):
+        self._form_ref = weakref.ref(form) if form is not None else None
+
+    @property
+    def prepare(self):
+        if self._prepare is None:
+            return self.field.prepare
+        return bind_hook(self._prepare, self.form)
+
+    @property
+    def clean(self):
+        if self._clean is None:
+            return self.field.clean
+        return bind_hook(self._clean, self.form)
+
+    def __getattr__(self, name):
+        return getattr(self.field, name)
+
+    def __repr__(self):
+        return '<Bound%s %s>' % (self.field.__class__.__name__, self.name)
+
+
+def get_bound_class(field):
+    """Return the `BoundField` subclass for the `field` spec, creating it
+    the first time.
+
+    The class is shared by all the specs of the same field class, and gets
+    the methods and other descriptors of that class, so looking them up is
+    as fast as with a regular instance. The plain values (those of the class
+    and everything stored in the spec itself) are read from the spec on each
+    access, so later changes to it are seen by the bound fields.
+    Only a spec that overwrites a method of its class by itself gets a
+    class of its own.
+    """
+    bound_class = field.__dict__.get('_bound_class')
+    if bound_class is not None:
+        return bound_class
+
+    fclass = field.__class__
+    bound_class = fclass.__dict__.get('_bound_class')
+    if bound_class is None:
+        bound_class = make_bound_class(fclass)
+        fclass._bound_class = bound_class
+    if any(key in bound_class.__dict__ for key in field.__dict__):
+        bound_class = make_bound_class(fclass, field)
+    field._bound_class = bound_class
+    return bound_class
+
+
+def make_bound_class(fclass, field=None):
+    """Make the `BoundField` subclass of the field class `fclass`, without
+    the attributes that the `field` spec, if any, overwrites.
+    """
+    exclude = field.__dict__ if field is not None else ()
+    attrs = {}
+    for klass in reversed(fclass.__mro__[:-1]):
+        for key, value in klass.__dict__.items():
+            if key in _SKIP or key in exclude:
+                continue
+            if isinstance(value, types.MethodType) and \
+                    value.__self__ is None:
+                # An unbound method of Python 2, e.g. the `__unicode__` set
+                # by `implements_to_string`
+                value = value.__func__
+            elif not hasattr(value, '__get__'):
+                attrs.pop(key, None)
+                continue
+            attrs[key] = value
+    # Allocated only if the field stores attributes not in `STATE`
+    attrs['__slots__'] = ('__dict__',)
+    attrs['__module__'] = fclass.__module__
+    return type('Bound' + fclass.__name__, (BoundField,), attrs)
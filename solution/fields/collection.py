@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
-import inspect
 import re
 
+from .._compat import class_types
 from .text import Text
 
 
@@ -54,7 +54,8 @@ class Collection(Text):
         self.sep = sep
         self.rxsep = r'\s*%s\s*' % re.escape(self.sep.replace(' ', ''))
         filters = filters or []
-        self.filters = [f() if inspect.isclass(f) else f for f in filters]
+        self.filters = [f() if isinstance(f, class_types) else f
+                        for f in filters]
         super(Collection, self).__init__(**kwargs)
 
     def _clean_data(self, str_value, file_data, obj_value):
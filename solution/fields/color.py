@@ -2,6 +2,7 @@
 import re
 
 from .. import validators as v
+from ..utils import LazyRegex
 from .text import Text
 
 
@@ -33,7 +34,7 @@ class Color(Text):
     _type = 'color'
     default_validator = v.IsColor
 
-    rx_colors = re.compile(
+    rx_colors = LazyRegex(
         r'#?(?P<hex>[0-9a-f]{3,8})|'
         r'rgba?\((?P<r>[0-9]+)\s*,\s*(?P<g>[0-9]+)\s*,\s*(?P<b>[0-9]+)'
         r'(?:\s*,\s*(?P<a>\.?[0-9]+))?\)',
@@ -1,9 +1,8 @@
 # -*- coding: utf-8 -*-
-import inspect
-
 from .. import validators as v
-from .._compat import to_unicode, implements_to_string
-from ..utils import Markup, get_html_attrs
+from .._compat import class_types, to_unicode, implements_to_string
+from ..utils import Markup, get_html_attrs, make_condition
+from .bound import get_bound_class
 
 
 class ValidationError(Exception):
@@ -38,10 +37,15 @@ class Field(object):
         Do not render the current value a a string. Useful with passwords
         fields.
 
+    :param when:
+        A condition for the field to be active. The inactive fields are not
+        validated nor saved. See `utils.make_condition`.
+
     """
     name = 'field'
     form = None
     default_validator = None
+    when = None
 
     str_value = None
     obj_value = None
@@ -50,8 +54,10 @@ class Field(object):
     empty = True
 
     def __init__(self, validate=None, default=None, prepare=None, clean=None,
-                 hide_value=False, **kwargs):
+                 hide_value=False, when=None, **kwargs):
         self._set_validators(validate)
+        if when is not None:
+            self.when = make_condition(when)
         self._default = default
         self.prepare = prepare
         self.clean = clean
@@ -65,9 +71,28 @@ class Field(object):
         defval = self.default_validator
         if defval and not validator_in(defval, validators):
             validators.append(defval)
-        self.validators = [val() if inspect.isclass(val) else val
+        self.validators = [val() if isinstance(val, class_types) else val
                            for val in validators]
         self.optional = not validator_in(v.Required, self.validators)
+        # Partitioned once instead of checking the type on every validation
+        self.field_validators = [
+            val for val in self.validators
+            if not isinstance(val, v.FormValidator)]
+        self.form_validators = [
+            val for val in self.validators
+            if isinstance(val, v.FormValidator)]
+
+    def bind(self, form, name, prepare=None, clean=None):
+        """Return a `BoundField` for this field, holding the state of the
+        field in the `form` instance. The field itself is not modified.
+
+        The `prepare` and `clean` hooks of the form class are used only if
+        the field doesn't have its own.
+        """
+        bound_class = get_bound_class(self)
+        return bound_class(self, name, form,
+                           prepare=None if self.prepare else prepare,
+                           clean=None if self.clean else clean)
 
     @property
     def default(self):
@@ -125,7 +150,7 @@ class Field(object):
         try:
             return self.str_to_py(**kwargs)
         except ValidationError as error:
-            self.error = error
+            self.error = without_traceback(error)
             return None
 
     def str_to_py(self, **kwargs):
@@ -155,25 +180,21 @@ class Field(object):
         try:
             return self.clean(py_value, **kwargs)
         except ValidationError as error:
-            self.error = error
+            self.error = without_traceback(error)
             return None
 
     def is_empty(self, py_value):
         return not py_value
 
     def validate_value(self, form, py_value):
-        for validator in self.validators:
-            if isinstance(validator, v.FormValidator):
-                continue
+        for validator in self.field_validators:
             if not validator(py_value, form):
                 self.error = ValidationError(validator.message)
                 return None
         return py_value
 
     def validate_form(self, form, cleaned_data):
-        for validator in self.validators:
-            if not isinstance(validator, v.FormValidator):
-                continue
+        for validator in self.form_validators:
             if not validator(cleaned_data, form):
                 self.error = ValidationError(validator.message)
                 break
@@ -215,6 +236,15 @@ class Field(object):
         return Markup(html)
 
 
+def without_traceback(error):
+    """Drop the traceback of a caught exception before storing it. The
+    frames of the traceback reference the field (and the form), so keeping
+    it would make a reference cycle.
+    """
+    error.__traceback__ = None
+    return error
+
+
 def validator_in(validator, validators_list):
     for v in validators_list:
         if (v == validator) or isinstance(v, validator):
@@ -8,6 +8,11 @@ class File(Field):
 
     **Does not actually upload the file. Use its ``clean`` method for that.**
 
+    With ``spool=True``, the uploaded file is copied in chunks to a
+    `solution.uploads.SpooledUpload` when the data is loaded, computing its
+    `size` and `digest` on the way, so the validators (and `clean`) can
+    check them without reading the whole file into memory.
+
     :param validate:
         An list of validators. This will evaluate the current `value` when
         the method `validate` is called.
@@ -24,16 +29,44 @@ class File(Field):
         python and return a 'cleaned' version of it. If the value can't be
         cleaned `None` must be returned instead.
 
+    :param spool:
+        Spool the uploaded file to temporary storage.
+
+    :param chunk_size:
+        Size of the chunks the file is spooled in.
+
+    :param max_memory:
+        Files larger than this are spooled to a temporary file on disk,
+        instead of memory.
+
+    :param algorithm:
+        The `hashlib` algorithm of the digest of the spooled files.
+
     """
     _type = 'file'
     hide_value = True
+    spool = False
 
-    def __init__(self, **kwargs):
+    def __init__(self, spool=False, chunk_size=None, max_memory=None,
+                 algorithm='sha256', **kwargs):
         # Backwards compatibility
         kwargs.setdefault('clean', kwargs.get('upload'))
+        self.spool = spool
+        self.chunk_size = chunk_size
+        self.max_memory = max_memory
+        self.algorithm = algorithm
 
         super(File, self).__init__(**kwargs)
 
+    def load_data(self, str_value=None, obj_value=None, file_data=None,
+                  **kwargs):
+        super(File, self).load_data(str_value, obj_value,
+                                    file_data=file_data, **kwargs)
+        if self.spool and self.file_data is not None:
+            self.file_data = spool_file(
+                self.file_data, self.chunk_size, self.max_memory,
+                self.algorithm)
+
     def str_to_py(self, **kwargs):
         return self.str_value or self.file_data or self.obj_value
 
@@ -50,3 +83,16 @@ class File(Field):
         html = u'<input %s>' % get_html_attrs(kwargs)
         return Markup(html)
 
+
+def spool_file(file_data, chunk_size=None, max_memory=None,
+               algorithm='sha256'):
+    """Return `file_data` as a `SpooledUpload`, spooling it if it isn't
+    one already.
+    """
+    from ..uploads import CHUNK_SIZE, MAX_MEMORY, SpooledUpload
+
+    if isinstance(file_data, SpooledUpload):
+        return file_data
+    return SpooledUpload.from_file(
+        file_data, chunk_size=chunk_size or CHUNK_SIZE,
+        max_memory=max_memory or MAX_MEMORY, algorithm=algorithm)
@@ -3,7 +3,7 @@ import datetime
 import re
 
 from .. import validators as v
-from ..utils import Markup, get_html_attrs
+from ..utils import LazyRegex, Markup, get_html_attrs
 from .field import ValidationError
 from .text import Text
 
@@ -35,7 +35,7 @@ class Time(Text):
     """
     _type = 'time'
     default_validator = v.IsTime
-    rx_time = re.compile(
+    rx_time = LazyRegex(
         '(?P<hour>[0-9]{1,2}):(?P<minute>[0-9]{1,2})(:(?P<second>[0-9]{1,2}))?\s?(?P<tt>am|pm)?',
         re.IGNORECASE
     )
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Identify the type and the dimensions of uploaded files from their headers
+alone: the magic bytes at the start of the file and the few bytes where
+each image format stores its width and height. Nothing is decoded, so the
+cost is the same for a file of any size.
+
+The files on disk are memory-mapped, so only the pages that are actually
+read are loaded. Other files are read up to `HEADER_SIZE` bytes.
+"""
+from contextlib import contextmanager
+import struct
+
+
+#: Maximum number of bytes read from the start of the files that can't be
+#: memory-mapped.
+HEADER_SIZE = 64 * 1024
+
+JPEG_SOF = frozenset(range(0xC0, 0xD0)) - frozenset([0xC4, 0xC8, 0xCC])
+JPEG_STANDALONE = frozenset([0x01, 0xD8]) | frozenset(range(0xD0, 0xD8))
+
+
+@contextmanager
+def open_header(file_data, size=HEADER_SIZE):
+    """Yield a bytes-like object with the start of an uploaded file: the
+    whole file memory-mapped, if it's on disk, or its first `size` bytes.
+    The position of the file is not changed.
+
+    Anything else (like a text value sent instead of a file) yields an
+    empty header, so it's not of any type.
+    """
+    data = getattr(file_data, 'data', file_data)
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        yield data
+        return
+
+    stream = getattr(file_data, 'file', None) or \
+        getattr(file_data, 'stream', None) or file_data
+    if not all(hasattr(stream, name) for name in ('read', 'seek', 'tell')):
+        yield b''
+        return
+    mapped = map_file(stream)
+    if mapped is not None:
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+        return
+
+    pos = stream.tell()
+    try:
+        stream.seek(0)
+        header = stream.read(size)
+    finally:
+        stream.seek(pos)
+    yield header
+
+
+def map_file(stream):
+    """Return a read-only memory map of `stream` or `None` if it's not a
+    file on disk.
+    """
+    # A `SpooledTemporaryFile` would be moved to disk by `fileno()`
+    if getattr(stream, '_rolled', True) is False:
+        return None
+    try:
+        fileno = stream.fileno()
+    except (AttributeError, IOError, OSError, ValueError):
+        return None
+    import mmap  # Only needed for the files on disk
+
+    try:
+        stream.flush()
+        return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    except (AttributeError, EnvironmentError, ValueError):
+        # Empty files and the streams that aren't regular files
+        return None
+
+
+def starts_with(header, *prefixes):
+    for prefix in prefixes:
+        if bytearray(header[:len(prefix)]) == prefix:
+            return True
+    return False
+
+
+def is_webp(header):
+    return (bytearray(header[:4]) == b'RIFF' and
+            bytearray(header[8:12]) == b'WEBP')
+
+
+#: The functions that test the headers of each file type.
+TYPES = {
+    'png': lambda header: starts_with(header, b'\x89PNG\r\n\x1a\n'),
+    'jpeg': lambda header: starts_with(header, b'\xff\xd8\xff'),
+    'gif': lambda header: starts_with(header, b'GIF87a', b'GIF89a'),
+    'webp': is_webp,
+    'bmp': lambda header: starts_with(header, b'BM'),
+    'pdf': lambda header: starts_with(header, b'%PDF-'),
+    'zip': lambda header: starts_with(header, b'PK\x03\x04'),
+}
+
+
+def guess_type(header):
+    """Return the type of the file (a key of `TYPES`) or `None`."""
+    for name, test in TYPES.items():
+        if test(header):
+            return name
+    return None
+
+
+def get_image_size(header):
+    """Return the `(width, height)` of a PNG, JPEG, GIF, WebP or BMP image,
+    or `None` if it's not one of those or the header is incomplete.
+    """
+    try:
+        kind = guess_type(header)
+        if kind == 'png':
+            return struct.unpack_from('>II', header, 16)
+        if kind == 'gif':
+            return struct.unpack_from('<HH', header, 6)
+        if kind == 'bmp':
+            width, height = struct.unpack_from('<ii', header, 18)
+            return width, abs(height)
+        if kind == 'webp':
+            return get_webp_size(header)
+        if kind == 'jpeg':
+            return get_jpeg_size(header)
+    except struct.error:
+        return None
+    return None
+
+
+def get_webp_size(header):
+    chunk = bytearray(header[12:16])
+    if chunk == b'VP8 ':
+        width, height = struct.unpack_from('<HH', header, 26)
+        return width & 0x3fff, height & 0x3fff
+    if chunk == b'VP8L':
+        bits, = struct.unpack_from('<I', header, 21)
+        return (bits & 0x3fff) + 1, ((bits >> 14) & 0x3fff) + 1
+    if chunk == b'VP8X':
+        sizes = bytearray(header[24:30])
+        if len(sizes) < 6:
+            return None
+        return (
+            (sizes[0] | sizes[1] << 8 | sizes[2] << 16) + 1,
+            (sizes[3] | sizes[4] << 8 | sizes[5] << 16) + 1,
+        )
+    return None
+
+
+def get_jpeg_size(header):
+    """Jump from marker to marker until the start of the frame, that has
+    the dimensions. The segments in between (e.g. EXIF data) are skipped
+    using their lengths, without reading them.
+    """
+    size = len(header)
+    pos = 2
+    while pos + 9 <= size:
+        if bytearray(header[pos:pos + 1])[0] != 0xFF:
+            return None
+        marker = bytearray(header[pos + 1:pos + 2])[0]
+        if marker == 0xFF:  # Fill byte
+            pos += 1
+            continue
+        if marker in JPEG_STANDALONE:
+            pos += 2
+            continue
+        if marker in JPEG_SOF:
+            height, width = struct.unpack_from('>HH', header, pos + 5)
+            return width, height
+        length, = struct.unpack_from('>H', header, pos + 2)
+        pos += 2 + length
+    return None
@@ -1,14 +1,181 @@
 # -*- coding: utf-8 -*-
-from copy import copy
-import inspect
+from collections import OrderedDict
 
-from ._compat import itervalues
+from ._compat import (
+    class_types, iteritems, itervalues, string_types, with_metaclass)
+from .adapters import adapt
+from .body import parse_body
 from .fields import Field
 from .formset import FormSet
-from .utils import FakeMultiDict, get_obj_value, set_obj_value
+from .compiler import get_compiled
+from .extractors import extract_values
+from .gates import GATE_ERROR, check_gates, gate_error
+from .limits import check_data, get_limits
+from .loading import LoadingPlan
+from .nested import NestedData
+from .plan import get_plan, normalize_prefix
+from .pool import get_pool
+from .utils import (
+    FakeMultiDict, get_obj_value, has_prefix, make_condition, set_obj_value)
+
+
+class DeclaredField(object):
+
+    """Class attribute that replaces a field declared in a form class.
+
+    Reading it from the class returns the field spec. Reading it from a form
+    instance returns the bound field of that form, so the bound fields don't
+    have to be stored in the `__dict__` of each form. The spec itself, shared
+    by all the forms, is never returned to a form.
+    """
+    __slots__ = ('name', 'declared')
+
+    def __init__(self, name, declared):
+        self.name = name
+        self.declared = declared
+
+    def __get__(self, form, cls=None):
+        if form is None:
+            return self.declared
+        fields = form._field_map
+        if fields is None:
+            # Rejected by a gate: the fields are bound, empty, when used
+            form._init_fields()
+            fields = form._field_map
+        field = fields.get(self.name)
+        if field is None:
+            # Declared after the form was created
+            field = self.declared.bind(form, form._prefix + self.name)
+            fields[self.name] = field
+        return field
+
+
+class DeclaredChild(object):
+
+    """Class attribute that replaces a sub-form or form set declared in a
+    form class.
+
+    Reading it from the class returns the declared object. Reading it from a
+    form instance returns the bound sub-form or form set, constructing it
+    first if the form is in lazy mode and it wasn't needed before.
+    """
+    __slots__ = ('name', 'declared')
+
+    def __init__(self, name, declared):
+        self.name = name
+        self.declared = declared
+
+    def __get__(self, form, cls=None):
+        if form is None:
+            return self.declared
+        return form._bind_child(self.name)
+
+
+def is_child(value):
+    return isinstance(type(value), FormMeta) or isinstance(value, FormSet)
+
+
+def wrap_declared(name, value):
+    if name.startswith('_'):
+        return value
+    if isinstance(value, Field):
+        return DeclaredField(name, value)
+    if is_child(value):
+        return DeclaredChild(name, value)
+    return value
+
+
+def lazy_dict(slot):
+    """A property that returns the dict stored in `slot`, allocating an
+    empty one the first time it's read. The form itself stores `None`
+    until something is added, and uses the slot directly. Assigning to it
+    stores the value in the slot.
+    """
+    def getter(self):
+        value = getattr(self, slot)
+        if value is None:
+            value = {}
+            setattr(self, slot, value)
+        return value
+
+    def setter(self, value):
+        setattr(self, slot, value)
+    return property(getter, setter)
+
+
+class FormMeta(type):
+
+    """Metaclass of `Form`. Collects the declared fields, sub-forms and form
+    sets of a form class once, when the class is created, walking the MRO so
+    inherited declarations are included (and can be overwritten).
+
+    The result is stored in the `_declared_fields`, `_declared_forms` and
+    `_declared_sets` ordered dicts of the class.
+    """
+
+    def __init__(cls, name, bases, attrs):
+        super(FormMeta, cls).__init__(name, bases, attrs)
+        for key, value in list(attrs.items()):
+            wrapped = wrap_declared(key, value)
+            if wrapped is not value:
+                type.__setattr__(cls, key, wrapped)
+        cls._declare()
+
+    def __setattr__(cls, name, value):
+        value = wrap_declared(name, value)
+        super(FormMeta, cls).__setattr__(name, value)
+        if not name.startswith('_'):
+            cls._redeclare()
+
+    def __delattr__(cls, name):
+        super(FormMeta, cls).__delattr__(name)
+        if not name.startswith('_'):
+            cls._redeclare()
+
+    def _declare(cls):
+        """Build the declaration tables of the class.
+
+        Any properties which begin with an underscore or are not `Field`,
+        `Form` or `FormSet` **instances** are ignored by this method.
+        """
+        fields = OrderedDict()
+        forms = OrderedDict()
+        sets = OrderedDict()
+
+        for klass in reversed(cls.__mro__):
+            for name, value in iteritems(klass.__dict__):
+                if name.startswith('_'):
+                    continue
+                fields.pop(name, None)
+                forms.pop(name, None)
+                sets.pop(name, None)
+                if isinstance(value, (DeclaredField, DeclaredChild)):
+                    value = value.declared
+                if isinstance(value, Field):
+                    fields[name] = value
+                elif isinstance(type(value), FormMeta):
+                    forms[name] = value
+                elif isinstance(value, FormSet):
+                    sets[name] = value
+
+        cls._declared_fields = fields
+        cls._declared_forms = forms
+        cls._declared_sets = sets
+        cls._binding_plan = None
+        cls._extractors = {}
+        cls._key_filters = {}
+        cls._compiled = None
+
+    def _redeclare(cls):
+        """Rebuild the declaration tables of the class and its subclasses
+        after a public attribute has been added or removed at runtime.
+        """
+        cls._declare()
+        for subclass in cls.__subclasses__():
+            subclass._redeclare()
 
 
-class Form(object):
+class Form(with_metaclass(FormMeta, object)):
 
     """Declarative Form base class. Provides core behaviour like field
     construction, validation, and data and error proxying.
@@ -38,90 +205,302 @@ class Form(object):
     :param backref:
         .
 
+    :param lazy:
+        If `True`, the sub-forms and form sets are not constructed until
+        they are first needed: when accessed as attributes or when the form
+        is validated, saved or reset. The results are the same as
+        constructing them at once. The default is the `_lazy` attribute
+        of the class.
+
+    :param partial:
+        If `True`, only the fields present in `data` (or `files`) are loaded
+        and validated, and only the sub-forms and form sets with submitted
+        data are bound. The rest of the attributes of `obj` are left as they
+        are, so `save` only updates what was sent. Useful for PATCH-like
+        requests with a few keys of a wide form.
+        The sub-forms and form sets without submitted data are bound only to
+        `obj` when accessed, and they aren't validated nor saved.
+
+    :param when:
+        A condition for a sub-form to be active. The fields, sub-forms and
+        form sets with a `when` condition are validated after the others,
+        and only if the condition, evaluated with the cleaned data of the
+        form, is true. The inactive ones are not validated nor saved. See
+        `utils.make_condition`.
+
+    :param limits:
+        A dict with limits to the submitted data, checked while binding it:
+        `max_keys`, `max_rows`, `max_value_length` and `max_file_size`.
+        They are combined with the `_max_*` attributes of the class, and
+        passed to the sub-forms and form sets. An exceeded limit raises a
+        `LimitError`. See `solution.limits`.
+
+    The `_gates` of the class are checked with the submitted data before
+    binding it. If any of them rejects it, the data isn't bound (the fields,
+    sub-forms and form sets are constructed empty only if they are used),
+    `rejected` is the gate that rejected it and `is_valid` returns `False`,
+    with the error `'__gate__'`.
+    See `solution.gates`.
+
     """
     _model = None
-    _fields = None
-    _forms = None
-    _sets = None
-    _errors = None
-    _named_errors = None
-
-    cleaned_data = None
-    changed_fields = None
+    _lazy = False
+    _partial = False
+    _when = None
+    _declared_fields = None
+    _declared_forms = None
+    _declared_sets = None
+    _binding_plan = None
+    _extractors = None
+    _key_filters = None
+    _compile = False
+    _compiled = None
+    _max_keys = None
+    _max_rows = None
+    _max_value_length = None
+    _max_file_size = None
+    _gates = ()
+    _gate_stats = None
+
+    # The containers are allocated only when something is stored in them
+    __slots__ = (
+        '_locale', '_tz', '_prefix', '_plan', '_backref', '_source', '_obj',
+        '_field_map', '_form_map', '_set_map', '_carried', '_error_map',
+        '_named_error_map',
+        '_cleaned_data', '_changed_fields', '_submitted', '_inactive',
+        '_limits', 'validated', 'rejected',
+        '__dict__', '__weakref__',
+    )
 
     def __init__(self, data=None, obj=None, files=None, locale='en', tz='utc',
-                 prefix=u'', backref=None, parent=None):
+                 prefix=u'', backref=None, parent=None, lazy=None,
+                 partial=None, when=None, limits=None):
 
         backref = backref or parent
         if self._model is not None:
-            assert inspect.isclass(self._model)
+            assert isinstance(self._model, class_types)
 
-        data = data or {}
-        if not hasattr(data, 'getlist'):
-            data = FakeMultiDict(data)
-
-        files = files or {}
-        if not hasattr(files, 'getlist'):
-            files = FakeMultiDict(files)
-
-        obj = obj or {}
-        if isinstance(obj, dict):
-            obj = FakeMultiDict(obj)
+        data, obj, files = self._wrap_input(data, obj, files)
 
         self._locale = locale
         self._tz = tz
-        prefix = prefix or u''
-        if prefix and not prefix.endswith(('_', '-', '.', '+', '|')):
-            prefix += u'-'
+        prefix = normalize_prefix(prefix)
         self._prefix = prefix
+        self._plan = get_plan(self.__class__)
         self._backref = backref
+        # Stored in the instance only if different from the class
+        if lazy is not None and lazy != self._lazy:
+            self._lazy = lazy
+        if partial is not None and partial != self._partial:
+            self._partial = partial
+        if when is not None:
+            self._when = make_condition(when)
+        self._limits = get_limits(self.__class__, limits)
+
+        self._source = None
+        self._submitted = None
+        self._form_map = None
+        self._set_map = None
+        self._carried = None
+        self._obj = obj
+        self._clear_results()
+
+        self.rejected = None
+        if self._gates and (data or files):
+            self.rejected = check_gates(self.__class__, data, files, prefix)
+            if self.rejected is not None:
+                self._field_map = None
+                return
+        self._init_fields()
+        self._init_data(data, obj, files)
 
-        self.cleaned_data = {}
-        self.changed_fields = []
+    def _wrap_input(self, data, obj, files):
+        data = adapt(data or {})
+        files = adapt(files or {})
+        if isinstance(obj, dict):
+            obj = FakeMultiDict(obj)
+        return data, obj or None, files
+
+    def _clear_results(self):
+        self._cleaned_data = None
+        self._changed_fields = None
+        self._error_map = None
+        self._named_error_map = None
+        self._inactive = None
         self.validated = False
-        self._obj = obj
-        self._errors = {}
-        self._named_errors = {}
 
-        self._init_fields()
+    @property
+    def cleaned_data(self):
+        if self._cleaned_data is None:
+            self._cleaned_data = {}
+        return self._cleaned_data
+
+    @cleaned_data.setter
+    def cleaned_data(self, value):
+        self._cleaned_data = value
+
+    @property
+    def changed_fields(self):
+        if self._changed_fields is None:
+            self._changed_fields = []
+        return self._changed_fields
+
+    @changed_fields.setter
+    def changed_fields(self, value):
+        self._changed_fields = value
+
+    # The bound fields, sub-forms and form sets, and the errors of the last
+    # validation, by name. Always dicts, even if nothing was stored.
+    _fields = lazy_dict('_field_map')
+    _forms = lazy_dict('_form_map')
+    _sets = lazy_dict('_set_map')
+    _errors = lazy_dict('_error_map')
+    _named_errors = lazy_dict('_named_error_map')
+
+    def rebind(self, data=None, obj=None, files=None):
+        """Load new data into the form, reusing the bound fields, sub-forms
+        and form sets instead of constructing the form again. The locale,
+        timezone and prefix of the form don't change.
+        """
+        data, obj, files = self._wrap_input(data, obj, files)
+        self._obj = obj
+        self._clear_results()
+        self.rejected = None
+        if self._gates and (data or files):
+            self.rejected = check_gates(self.__class__, data, files,
+                                        self._prefix)
+            if self.rejected is not None:
+                # Don't keep anything bound to the last request
+                self._field_map = None
+                self._form_map = None
+                self._set_map = None
+                self._carried = None
+                self._source = None
+                self._submitted = None
+                return self
+        if self._field_map is None:
+            self._init_fields()
+        for field in self:
+            field.error = None
+            field.has_changed = False
         self._init_data(data, obj, files)
+        return self
 
-    def _init_fields(self):
-        """Creates the `_fields`, `_forms` asn `_sets` dicts.
+    @classmethod
+    def acquire(cls, data=None, obj=None, files=None):
+        """Return a form from the thread-local pool of the class bound to the
+        new data, or a new form if the pool is empty.
+        Call `release` to return it to the pool when done.
+        """
+        return get_pool(cls).acquire(data, obj=obj, files=files)
 
-        Any properties which begin with an underscore or are not `Field`,
-        `Form` or `FormSet` **instances** are ignored by this method.
+    def release(self):
+        """Return a form taken with `acquire` to the pool of its class."""
+        get_pool(self.__class__).release(self)
+
+    @classmethod
+    def from_body(cls, body, content_type, charset='utf-8', **kwargs):
+        """Make a form from the raw body of a request, skipping the
+        MultiDicts of the web framework. Only the keys this form (and its
+        sub-forms and form sets) will read are decoded; the rest are
+        ignored.
+
+        :param body:
+            The body of the request, as bytes.
+
+        :param content_type:
+            The value of the Content-Type header of the request.
+            Both `application/x-www-form-urlencoded` and
+            `multipart/form-data` are supported.
+
+        :param charset:
+            The charset of the body.
+
+        The rest of the arguments (except `data` and `files`) are those of
+        the form constructor.
+        """
+        data, files = parse_body(body, content_type, form_class=cls,
+                                 prefix=kwargs.get('prefix', u''),
+                                 charset=charset)
+        return cls(data, files=files, **kwargs)
+
+    @classmethod
+    def from_json(cls, data, **kwargs):
+        """Make a form from nested data, like a JSON document, instead of
+        flat prefixed keys: the sub-forms take the dict with their name and
+        the form sets take the list with their name, one row for each
+        item. See `solution.nested`.
+
+        :param data:
+            The nested data, as a dict or as a JSON string.
+
+        The rest of the arguments are those of the form constructor.
         """
-        fields = {}
-        forms = {}
-        sets = {}
+        if isinstance(data, (string_types, bytes)):
+            import json  # Only needed for JSON strings
 
-        for name in dir(self):
-            if name.startswith('_'):
-                continue
-            field = getattr(self, name)
-            is_field = isinstance(field, Field)
-            is_form = isinstance(field, Form)
-            is_set = isinstance(field, FormSet)
-
-            if is_field:
-                field = copy(field)
-                field.name = self._prefix + name
-                field.form = self
-                if field.prepare is None:
-                    field.prepare = getattr(self, 'prepare_' + name, None)
-                if field.clean is None:
-                    field.clean = getattr(self, 'clean_' + name, None)
-                fields[name] = field
-                setattr(self, name, field)
-            elif is_form:
-                forms[name] = field
-            elif is_set:
-                sets[name] = field
-
-        self._fields = fields
-        self._forms = forms
-        self._sets = sets
+            if isinstance(data, bytes):
+                data = data.decode('utf8')
+            data = json.loads(data)
+        return cls(NestedData(data, kwargs.get('prefix', u'')), **kwargs)
+
+    @classmethod
+    def from_asgi(cls, receive, scope, sink=None, charset='utf-8',
+                  **kwargs):
+        """Make a form from the body of an ASGI request, consuming it as it
+        arrives. Returns a coroutine (Python 3.6+):
+
+            form = await MyForm.from_asgi(receive, scope)
+
+        The uploaded files are written chunk by chunk to the `sink`
+        (in memory by default, see `solution.asgi.MemorySink`).
+
+        :param receive:
+            The ASGI `receive` awaitable callable.
+
+        :param scope:
+            The ASGI connection scope, with the headers of the request.
+
+        :param max_field_size:
+            Maximum size, in bytes, of each text value. 1 MiB by default.
+
+        :param max_file_size:
+            Maximum size, in bytes, of each uploaded file. By default, the
+            `max_file_size` limit of the form, if any.
+
+        :param max_sizes:
+            A dict with the maximum size of the values of some keys.
+
+        A `LimitError` is raised as soon as any value or file is larger
+        than its limit. The rest of the arguments are those of the form
+        constructor.
+        """
+        from .asgi import from_asgi
+        return from_asgi(cls, receive, scope, sink=sink, charset=charset,
+                         **kwargs)
+
+    @classmethod
+    def loading_plan(cls):
+        """Return the `LoadingPlan` with the relationships of the object
+        read by the form, its sub-forms and form sets. Use it to eager-load
+        them with the query of the object:
+
+            query = MyForm.loading_plan().apply(db.query(Order))
+
+        """
+        return LoadingPlan(cls)
+
+    def _init_fields(self):
+        """Creates the bound fields from the binding plan of the form.
+        """
+        fields = None
+        prefix = self._prefix
+        for name, field, prepare, clean in self._plan.fields:
+            if fields is None:
+                fields = {}
+            fields[name] = field.bind(self, prefix + name, prepare=prepare,
+                                      clean=clean)
+        self._field_map = fields
 
     def prepare(self, data):
         """You can overwrite this method to store the logic of pre-processing
@@ -140,108 +519,358 @@ class Form(object):
     def _init_data(self, data, obj, files):
         """Load the data into the form.
         """
-        data = self.prepare(data)
-
-        # Initialize sub-forms
-        for name, subform in self._forms.items():
-            obj_value = get_obj_value(obj, name)
-            fclass = subform.__class__
-            subform_prefix = '{0}{1}.'.format(self._prefix, name.lower())
-
-            subform = fclass(
-                data,
-                obj_value,
-                files=files,
-                locale=self._locale,
-                tz=self._tz,
-                prefix=subform_prefix,
-                backref=subform._backref
-            )
-            self._forms[name] = subform
-            setattr(self, name, subform)
-
-        # Initialize sub-sets
-        for name, subset in self._sets.items():
-            obj_value = get_obj_value(obj, name)
-            sclass = subset.__class__
-            subset = sclass(
-                form_class=subset._form_class,
-                data=data,
-                objs=obj_value,
-                files=files,
-                locale=self._locale,
-                tz=self._tz,
-                prefix=self._prefix,
-                create_new=subset._create_new,
-                backref=subset._backref
-            )
-            self._sets[name] = subset
-            setattr(self, name, subset)
-
-        # Initialize fields
-        for name, field in self._fields.items():
-            subdata = data.getlist(self._prefix + name)
-            subfiles = files.getlist(self._prefix + name)
-            obj_value = get_obj_value(obj, name)
-            field.load_data(subdata, obj_value, file_data=subfiles,
+        data = adapt(self.prepare(data))
+        if self._limits:
+            check_data(self, data, files)
+        self._init_children(data, obj, files)
+        if self._partial:
+            self._load_submitted(data, obj, files)
+            return
+        compiled = get_compiled(self.__class__)
+        if compiled is not None:
+            compiled.load_fields(self, data, obj, files)
+        else:
+            self._load_fields(data, obj, files)
+
+    def _init_children(self, data, obj, files):
+        """Initialize (or rebind) the sub-forms and sub-sets."""
+        plan = self._plan
+        if self._lazy:
+            self._source = (data, obj, files)
+        self._carried = None
+        for entry in plan.forms:
+            subform = self._form_map and self._form_map.get(entry[0])
+            if self._partial and not self._is_submitted(
+                    entry[0], self._form_prefix(entry), data, files):
+                if subform is not None:
+                    del self._form_map[entry[0]]
+            elif subform is not None:
+                subform.rebind(data.child(entry[0], self._form_prefix(entry)),
+                               get_obj_value(obj, entry[0]), files)
+            elif not self._lazy:
+                self._init_form(entry, data, obj, files)
+        for entry in plan.sets:
+            subset = self._set_map.get(entry[0]) if self._set_map else None
+            if self._partial and not self._is_submitted(
+                    entry[0], self._set_prefix(entry), data, files):
+                if subset is not None:
+                    del self._set_map[entry[0]]
+            elif subset is not None:
+                subset.rebind(data.child(entry[0], self._set_prefix(entry)),
+                              get_obj_value(obj, entry[0]), files)
+            elif not self._lazy:
+                self._init_set(entry, data, obj, files)
+
+    def _load_fields(self, data, obj, files):
+        """Load the data into the bound fields."""
+        fields = self._field_map
+        obj_values = extract_values(self.__class__, obj)
+        for entry, obj_value in zip(self._plan.fields, obj_values):
+            field = fields[entry[0]]
+            pname = field.name
+            field.load_data(data.getlist(pname), obj_value,
+                            file_data=files.getlist(pname),
+                            locale=self._locale, tz=self._tz)
+
+    def _load_submitted(self, data, obj, files):
+        """Load the data only into the fields present in `data` or `files`,
+        for the partial mode. The names of those fields are kept in
+        `_submitted`.
+        """
+        fields = self._field_map
+        submitted = []
+        for entry in self._plan.fields:
+            name = entry[0]
+            field = fields[name]
+            pname = field.name
+            if pname not in data and pname not in files:
+                if not field.empty:
+                    field.reset()
+                continue
+            submitted.append(name)
+            field.load_data(data.getlist(pname), get_obj_value(obj, name),
+                            file_data=files.getlist(pname),
                             locale=self._locale, tz=self._tz)
+        self._submitted = submitted
+
+    def _is_submitted(self, name, prefix, data, files):
+        return has_prefix(data.child(name, prefix), prefix) or \
+            has_prefix(files, prefix)
+
+    def _form_prefix(self, entry):
+        return self._prefix + entry[2]
+
+    def _set_prefix(self, entry):
+        return u'{0}{1}.'.format(self._prefix, entry[2].__name__.lower())
+
+    def _init_form(self, entry, data, obj, files):
+        subform = self._make_form(entry, data, obj, files,
+                                  self._partial or None)
+        if self._form_map is None:
+            self._form_map = {}
+        self._form_map[entry[0]] = subform
+        return subform
+
+    def _make_form(self, entry, data, obj, files, partial):
+        name, fclass, _, backref = entry
+        subform_prefix = self._form_prefix(entry)
+        obj_value = get_obj_value(obj, name)
+        return fclass(
+            data.child(name, subform_prefix),
+            obj_value,
+            files=files,
+            locale=self._locale,
+            tz=self._tz,
+            prefix=subform_prefix,
+            backref=backref,
+            lazy=self._lazy or None,
+            partial=partial,
+            limits=self._limits
+        )
+
+    def _init_set(self, entry, data, obj, files):
+        subset = self._make_set(entry, data, obj, files, self._partial)
+        if self._set_map is None:
+            self._set_map = {}
+        self._set_map[entry[0]] = subset
+        return subset
+
+    def _make_set(self, entry, data, obj, files, partial):
+        name, sclass, form_class, create_new, backref = entry
+        obj_value = get_obj_value(obj, name)
+        return sclass(
+            form_class=form_class,
+            data=data.child(name, self._set_prefix(entry)),
+            objs=obj_value,
+            files=files,
+            locale=self._locale,
+            tz=self._tz,
+            prefix=self._prefix,
+            create_new=create_new,
+            backref=backref,
+            lazy=self._lazy or None,
+            partial=partial,
+            limits=self._limits,
+            max_rows=self._declared_sets[name]._max_rows
+        )
+
+    def _carry(self, entry, make):
+        """Bind a sub-form or form set without submitted data, in partial
+        mode, only to the object, so it shows its values. It's kept apart
+        from the bound ones, so it isn't validated nor saved.
+        """
+        child = make(entry, adapt({}), self._obj, adapt({}), False)
+        if self._carried is None:
+            self._carried = {}
+        self._carried[entry[0]] = child
+        return child
+
+    def _bind_child(self, name):
+        """Return the bound sub-form or form set `name`, constructing it
+        if the form is in lazy mode and it hasn't been needed until now.
+        """
+        if self._form_map and name in self._form_map:
+            return self._form_map[name]
+        if self._set_map and name in self._set_map:
+            return self._set_map[name]
+        if self._carried and name in self._carried:
+            return self._carried[name]
+        source = self._source
+        partial = self._partial and self.rejected is None
+        if self.rejected is not None:
+            # Bound without data, like the fields
+            source = (adapt({}), None, adapt({}))
+        elif source is None and not partial:
+            return getattr(self.__class__, name)
+
+        # In partial mode, those not bound yet weren't submitted unless
+        # they are still pending in lazy mode.
+        for entry in self._plan.forms:
+            if entry[0] == name:
+                if partial and (source is None or not self._is_submitted(
+                        name, self._form_prefix(entry), source[0],
+                        source[2])):
+                    return self._carry(entry, self._make_form)
+                return self._init_form(entry, *source)
+        for entry in self._plan.sets:
+            if entry[0] == name:
+                if partial and (source is None or not self._is_submitted(
+                        name, self._set_prefix(entry), source[0],
+                        source[2])):
+                    return self._carry(entry, self._make_set)
+                return self._init_set(entry, *source)
+        return getattr(self.__class__, name)
+
+    def _bind_children(self, names=None):
+        """Construct the sub-forms and form sets still pending in lazy mode:
+        all of them, or only those in `names`.
+        """
+        source = self._source
+        if source is None:
+            return
+        plan = self._plan
+        data, _, files = source
+        for entry in plan.forms:
+            if names is not None and entry[0] not in names:
+                continue
+            if self._form_map and entry[0] in self._form_map:
+                continue
+            if self._partial and not self._is_submitted(
+                    entry[0], self._form_prefix(entry), data, files):
+                continue
+            self._init_form(entry, *source)
+        for entry in plan.sets:
+            if names is not None and entry[0] not in names:
+                continue
+            if self._set_map and entry[0] in self._set_map:
+                continue
+            if self._partial and not self._is_submitted(
+                    entry[0], self._set_prefix(entry), data, files):
+                continue
+            self._init_set(entry, *source)
+        if names is None:
+            self._source = None
+
+    def _child_names(self, exclude):
+        """The names of the sub-forms and form sets not in `exclude`."""
+        plan = self._plan
+        return [
+            entry[0] for entry in plan.forms + plan.sets
+            if entry[0] not in exclude
+        ]
+
+    def _iter_forms(self):
+        return itervalues(self._form_map) if self._form_map else iter(())
+
+    def _iter_sets(self):
+        return itervalues(self._set_map) if self._set_map else iter(())
 
     def reset(self):
-        for subform in self._forms.values():
+        self._bind_children()
+        for subform in self._iter_forms():
             subform.reset()
-        for subset in self._sets.values():
+        for subset in self._iter_sets():
             subset.reset()
-        for field in self._fields.values():
+        for field in self:
             field.reset()
 
+    def _clear(self):
+        """Reset the form and drop any reference to the data and objects of
+        the last request. Used by the pools to keep idle forms.
+        The sub-forms and form sets still pending in lazy mode are not
+        constructed, only those that already exist are cleared.
+        """
+        self._source = None
+        self._obj = None
+        self._carried = None
+        self._submitted = None
+        self._clear_results()
+        for field in self:
+            field.reset()
+            field.error = None
+        for subform in self._iter_forms():
+            subform._clear()
+        for subset in self._iter_sets():
+            subset._clear()
+
     def __iter__(self):
         """Iterate form fields in arbitrary order.
         """
-        return itervalues(self._fields)
+        return itervalues(self._field_map) if self._field_map else iter(())
 
     def __getitem__(self, name):
-        return self._fields[name]
+        if not self._field_map:
+            raise KeyError(name)
+        return self._field_map[name]
 
     def __contains__(self, name):
-        return (name in self._fields)
+        return bool(self._field_map) and (name in self._field_map)
 
     @property
     def has_changed(self):
-        return len(self.changed_fields) > 0
+        return bool(self._changed_fields)
 
     def is_valid(self):
         """Return whether the current values of the form fields are all valid.
         """
-        self.cleaned_data = {}
-        self.changed_fields = []
-        self.validated = False
-        self._errors = {}
-        self._named_errors = {}
+        if self.rejected is not None:
+            self._clear_results()
+            error = gate_error(self.rejected)
+            self._error_map = {GATE_ERROR: error}
+            self._named_error_map = {self._prefix + GATE_ERROR: error}
+            return False
+        conditions = self._plan.conditions
+        if conditions:
+            self._bind_children(self._child_names(conditions))
+        else:
+            self._bind_children()
+        self._clear_results()
         cleaned_data = {}
         changed_fields = []
         errors = {}
         named_errors = {}
 
+        self._validate_children(changed_fields, errors, named_errors)
+        compiled = get_compiled(self.__class__)
+        if compiled is not None and self._submitted is None:
+            compiled.validate_fields(
+                self, cleaned_data, changed_fields, errors, named_errors)
+        else:
+            self._validate_fields(
+                cleaned_data, changed_fields, errors, named_errors)
+        if conditions:
+            self._validate_conditional(
+                cleaned_data, changed_fields, errors, named_errors)
+
+        if errors:
+            self._error_map = errors
+            self._named_error_map = named_errors
+            return False
+
+        self.cleaned_data = self.clean(cleaned_data)
+        self.changed_fields = changed_fields
+        self.validated = True
+        return True
+
+    def _validate_children(self, changed_fields, errors, named_errors):
+        conditions = self._plan.conditions
         # Validate sub forms
-        for name, subform in self._forms.items():
-            if not subform.is_valid():
-                errors[name] = subform._errors
-                named_errors.update(subform._named_errors)
-                continue
-            if subform.has_changed:
-                changed_fields.append(name)
+        for name, subform in iteritems(self._form_map or {}):
+            if name not in conditions:
+                self._validate_child(name, subform, changed_fields, errors,
+                                     named_errors)
 
         # Validate sub sets
-        for name, subset in self._sets.items():
-            if not subset.is_valid():
-                errors[name] = subset._errors
-                named_errors.update(subset._named_errors)
-                continue
-            if subset.has_changed:
-                changed_fields.append(name)
+        for name, subset in iteritems(self._set_map or {}):
+            if name not in conditions:
+                self._validate_child(name, subset, changed_fields, errors,
+                                     named_errors)
+
+    def _validate_child(self, name, child, changed_fields, errors,
+                        named_errors):
+        if not child.is_valid():
+            errors[name] = child._errors
+            named_errors.update(child._named_errors)
+            return
+        if child.has_changed:
+            changed_fields.append(name)
+
+    def _validate_fields(self, cleaned_data, changed_fields, errors,
+                         named_errors, names=None):
+        fields = self._field_map or {}
+        if names is None:
+            names = self._submitted
+            conditions = self._plan.conditions
+            if conditions:
+                names = [
+                    name for name in (names if names is not None else fields)
+                    if name not in conditions
+                ]
+        if names is not None:
+            fields = OrderedDict((name, fields[name]) for name in names)
 
         # Validate each field
-        for name, field in self._fields.items():
+        for name, field in iteritems(fields):
             field.error = None
             py_value = field.validate(self)
             if field.error:
@@ -253,22 +882,43 @@ class Form(object):
                 changed_fields.append(name)
 
         # Validate relation between fields
-        for name, field in self._fields.items():
+        relations = self._plan.relations
+        for name, field in iteritems(fields):
+            if name not in relations:
+                continue
             field.validate(self, cleaned_data)
             if field.error:
                 errors[name] = field.error
                 named_errors[field.name] = field.error
                 continue
 
-        if errors:
-            self._errors = errors
-            self._named_errors = named_errors
-            return False
-
-        self.cleaned_data = self.clean(cleaned_data)
-        self.changed_fields = changed_fields
-        self.validated = True
-        return True
+    def _validate_conditional(self, cleaned_data, changed_fields, errors,
+                              named_errors):
+        """Validate the fields, sub-forms and form sets with a `when`
+        condition, after all the others. The inactive ones are skipped and
+        their names stored in `_inactive`, so they aren't saved either.
+        """
+        fields = self._field_map or {}
+        submitted = self._submitted
+        inactive = []
+        for name, condition in iteritems(self._plan.conditions):
+            if not condition(cleaned_data):
+                inactive.append(name)
+                if name in fields:
+                    fields[name].error = None
+                continue
+            if name in fields:
+                if submitted is None or name in submitted:
+                    self._validate_fields(cleaned_data, changed_fields,
+                                          errors, named_errors, names=[name])
+                continue
+            self._bind_children([name])
+            child = (self._form_map or {}).get(name) or \
+                (self._set_map or {}).get(name)
+            if child is not None:
+                self._validate_child(name, child, changed_fields, errors,
+                                     named_errors)
+        self._inactive = inactive
 
     def save(self, backref_obj=None):
         """Save the cleaned data to the initial object or creating a new one
@@ -276,19 +926,28 @@ class Form(object):
         """
         if not self.validated:
             assert self.is_valid()
+        inactive = self._inactive
+        if inactive:
+            self._bind_children(self._child_names(inactive))
+        else:
+            self._bind_children()
 
         if self._model and not self._obj:
             obj = self._save_new_object(backref_obj)
         else:
-            obj = self.save_to(self._obj)
+            obj = self.save_to(self._obj if self._obj is not None else {})
 
-        for key, subform in self._forms.items():
+        for key, subform in iteritems(self._form_map or {}):
+            if inactive and key in inactive:
+                continue
             data = subform.save(obj)
             if not data:
                 continue
             set_obj_value(obj, key, data)
 
-        for key, subset in self._sets.items():
+        for key, subset in iteritems(self._set_map or {}):
+            if inactive and key in inactive:
+                continue
             data = subset.save(obj)
             if not data:
                 continue
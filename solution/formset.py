@@ -1,5 +1,9 @@
 # -*- coding: utf-8 -*-
-from .utils import FakeMultiDict, get_obj_value, set_obj_value
+from .plan import normalize_prefix
+from .adapters import adapt
+from .limits import LimitError, get_limits
+from .nested import NestedData
+from .utils import get_obj_value, has_prefix, make_condition, set_obj_value
 
 
 class FormSet(object):
@@ -14,6 +18,8 @@ class FormSet(object):
     :param data:
         Used to pass data coming from the enduser, usually `request.form`,
         `request.POST` or equivalent.
+        It can also be a list with the nested data of each form (e.g. from
+        a JSON document). See `solution.nested`.
 
     :param obj:
         If `data` is empty or not provided, this object is checked for
@@ -23,18 +29,51 @@ class FormSet(object):
         Used to pass files coming from the enduser, usually `request.files`,
         or equivalent.
 
+    :param lazy:
+        Construct the sub-forms and form sets of each form only when
+        needed. See `Form`.
+
+    :param partial:
+        Bind and validate only the forms with submitted data. The objects
+        of the other rows are kept as they are in `carried_objs`, instead of
+        being considered missing. See `Form`.
+
+    :param when:
+        A condition for the form set to be active, when used in another
+        form. See `Form`.
+
+    :param max_rows:
+        Maximum number of forms the submitted data can make. More rows
+        raise a `LimitError`.
+
+    :param limits:
+        Limits to the submitted data, for the set and its forms.
+        See `Form`.
+
     """
     _forms = None
     _errors = None
     _named_errors = None
     _prefix = u''
+    _when = None
+    _limits = None
+    _max_rows = None
     missing_objs = None
+    carried_objs = None
     has_changed = False
 
     def __init__(self, form_class, data=None, objs=None, files=None,
             locale='en', tz='utc', prefix=u'', create_new=True,
-            backref=None, parent=None):
+            backref=None, parent=None, lazy=None, partial=False,
+            when=None, max_rows=None, limits=None):
         self._form_class = form_class
+        if when is not None:
+            self._when = make_condition(when)
+        if max_rows is not None:
+            self._max_rows = max_rows
+        self._limits = get_limits(self, limits)
+        self._lazy = lazy
+        self._partial = bool(partial)
         self._locale = locale
         self._tz = tz
         self._prefix = prefix
@@ -46,16 +85,40 @@ class FormSet(object):
         self._errors = {}
         self._named_errors = {}
         self.missing_objs = []
+        self.carried_objs = []
         self.has_changed = False
 
         if (data or objs or files):
             self._init(data, objs, files)
 
+    def rebind(self, data=None, objs=None, files=None):
+        """Load new data into the set, reusing the forms already bound
+        with the same prefixes.
+        """
+        self._errors = {}
+        self._named_errors = {}
+        self.missing_objs = []
+        self.carried_objs = []
+        self.has_changed = False
+        if (data or objs or files):
+            self._init(data, objs, files)
+        else:
+            self._forms = []
+
     def reset(self):
         # Reset sub-forms
         for subform in self._forms:
             subform.reset()
 
+    def _clear(self):
+        self._errors = {}
+        self._named_errors = {}
+        self.missing_objs = []
+        self.carried_objs = []
+        self.has_changed = False
+        for subform in self._forms:
+            subform._clear()
+
     def __len__(self):
         return len(self._forms)
 
@@ -72,16 +135,15 @@ class FormSet(object):
         return self._form_class(prefix=self._get_prefix(1))
 
     def _init(self, data=None, objs=None, files=None):
+        reuse = dict((form._prefix, form) for form in self._forms)
         self._errors = {}
         self._named_errors = {}
         self.has_changed = False
 
-        data = data or {}
-        if not hasattr(data, 'getlist'):
-            data = FakeMultiDict(data)
-        files = files or {}
-        if not hasattr(files, 'getlist'):
-            files = FakeMultiDict(files)
+        if isinstance(data, (list, tuple)):
+            data = NestedData(data, self._prefix)
+        data = adapt(data or {})
+        files = adapt(files or {})
         objs = objs or []
         try:
             _ = iter(objs)
@@ -90,34 +152,40 @@ class FormSet(object):
 
         forms = []
         missing_objs = []
+        carried_objs = []
         num = 0
 
         for i, obj in enumerate(objs, 1):
             num = i
             form_prefix = self._get_prefix(num)
+            row_data = data.row(num, form_prefix)
+            if (
+                    self._partial
+                    and not has_data(row_data, form_prefix)
+                    and not has_data(files, form_prefix)
+                ):
+                carried_objs.append((i - 1, obj))
+                continue
             if (
                     (data or files)
                     and self._form_class._model
-                    and not has_data(data, form_prefix)
+                    and not has_data(row_data, form_prefix)
                     and not has_data(files, form_prefix)
                 ):
                 missing_objs.append(obj)
                 continue
 
-            f = self._form_class(
-                data, obj=obj, files=files,
-                locale=self._locale, tz=self._tz,
-                prefix=form_prefix, backref=self._backref
-            )
+            f = self._new_form(form_prefix, row_data, obj, files, reuse)
             forms.append(f)
         num += 1
 
         if data and self._create_new:
             forms = self._find_new_forms(forms, num, data, files,
-                locale=self._locale, tz=self._tz)
+                locale=self._locale, tz=self._tz, reuse=reuse)
 
         self._forms = forms
         self.missing_objs = missing_objs
+        self.carried_objs = carried_objs
         if self._backref:
             for mo in missing_objs:
                 if get_obj_value(mo, self._backref, None):
@@ -130,20 +198,54 @@ class FormSet(object):
             num
         )
 
-    def _find_new_forms(self, forms, num, data, files, locale, tz):
+    def _new_form(self, form_prefix, data, obj, files, reuse=None,
+                  locale=None, tz=None):
+        """Return a form bound to the data, reusing the one in `reuse` with
+        the same prefix if there is one.
+        """
+        f = reuse.pop(normalize_prefix(form_prefix), None) if reuse else None
+        if f is not None:
+            f.rebind(data, obj=obj, files=files)
+            return f
+        return self._form_class(
+            data, obj=obj, files=files,
+            locale=locale or self._locale, tz=tz or self._tz,
+            prefix=form_prefix, backref=self._backref, lazy=self._lazy,
+            partial=(self._partial and obj is not None) or None,
+            limits=self._limits
+        )
+
+    def _find_new_forms(self, forms, num, data, files, locale, tz,
+                        reuse=None):
         """Acknowledge new forms created client-side.
+        With nested data, these are the rest of the items of the list.
         """
+        max_rows = self._limits and self._limits.get('max_rows')
+        num_rows = data.num_rows()
         form_prefix = self._get_prefix(num)
-        while has_data(data, form_prefix) or has_data(files, form_prefix):
-            f = self._form_class(
-                data, files=files, locale=locale, tz=tz,
-                prefix=form_prefix, backref=self._backref
-            )
+        row_data = data.row(num, form_prefix)
+        while self._has_row(num, num_rows, row_data, files, form_prefix):
+            if max_rows is not None and len(forms) >= max_rows:
+                raise LimitError('max_rows', self._get_prefix(u''), max_rows)
+            f = self._new_form(form_prefix, row_data, None, files, reuse,
+                               locale=locale, tz=tz)
             forms.append(f)
             num += 1
             form_prefix = self._get_prefix(num)
+            row_data = data.row(num, form_prefix)
         return forms
 
+    def _has_row(self, num, num_rows, row_data, files, form_prefix):
+        """Test if there is a row `num`: by the number of rows of the data,
+        if known, or else by looking for its keys.
+        """
+        if num_rows is not None:
+            if num <= num_rows:
+                return True
+        elif has_data(row_data, form_prefix):
+            return True
+        return has_data(files, form_prefix)
+
     def is_valid(self):
         self._errors = {}
         self._named_errors = {}
@@ -165,16 +267,15 @@ class FormSet(object):
         return True
 
     def save(self, backref_obj):
-        return [form.save(backref_obj) for form in self._forms]
+        objs = [form.save(backref_obj) for form in self._forms]
+        # Put back the rows not submitted in partial mode
+        for pos, obj in self.carried_objs or ():
+            objs.insert(pos, obj)
+        return objs
 
 
 def has_data(d, prefix):
     """Test if any of the `keys` of the `d` dictionary starts with `prefix`.
     """
-    prefix = r'%s-' % (prefix, )
-    for k in d:
-        if not k.startswith(prefix):
-            continue
-        return True
-    return False
+    return has_prefix(d, r'%s-' % (prefix, ))
 
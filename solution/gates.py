@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+Gates are cheap checks of the raw submitted data that run before a form
+binds it. If any of them fails, the submission is rejected: the data isn't
+bound to the fields (they are constructed, empty, only if they are used),
+and `is_valid` returns `False` at once.
+
+Declare them in the `_gates` attribute of the form class:
+
+    class ContactForm(Form):
+        _gates = [Honeypot('website'), RequireKeys('token'), MaxKeys(50)]
+
+A gate is any callable that takes the `data`, the `files` and the `prefix`
+of the form and returns `False` to reject the submission.
+
+The forms without any submitted data (e.g. to render them empty) aren't
+checked.
+
+A rejected form reports the error `GATE_ERROR` (with the name of the gate
+as the message), so the forms and form sets that contain it are invalid too.
+
+The number of submissions checked and rejected by each gate is counted by
+form class. Each thread has counters of its own, so counting doesn't make
+the threads wait for each other. See `get_stats`.
+"""
+import threading
+
+from .fields.field import ValidationError
+
+
+_lock = threading.Lock()
+
+#: The key of the error of a rejected form.
+GATE_ERROR = '__gate__'
+
+
+class Gate(object):
+
+    """Base class of the gates."""
+
+    def __call__(self, data, files, prefix=u''):
+        return True
+
+    def __repr__(self):
+        return '<%s>' % (self.__class__.__name__,)
+
+
+class Honeypot(Gate):
+
+    """Reject the submissions with a value in the field `name`, a field
+    hidden from the users that only the bots fill.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __call__(self, data, files, prefix=u''):
+        return not any(data.getlist(prefix + self.name))
+
+
+class RequireKeys(Gate):
+
+    """Reject the submissions without a value for any of the `names`, for
+    example, a token.
+    """
+
+    def __init__(self, *names):
+        self.names = names
+
+    def __call__(self, data, files, prefix=u''):
+        for name in self.names:
+            if not any(data.getlist(prefix + name)):
+                return False
+        return True
+
+
+class MaxKeys(Gate):
+
+    """Reject the submissions with more than `max_keys` keys."""
+
+    def __init__(self, max_keys):
+        self.max_keys = max_keys
+
+    def __call__(self, data, files, prefix=u''):
+        return len(data) + len(files) <= self.max_keys
+
+
+class GateStats(object):
+
+    """The number of submissions `checked` by the gates of a form class,
+    and of those `rejected` by each gate, by its name.
+    """
+    __slots__ = ('checked', 'rejected')
+
+    def __init__(self):
+        self.checked = 0
+        self.rejected = {}
+
+    @property
+    def total_rejected(self):
+        return sum(self.rejected.values())
+
+    def as_dict(self):
+        return {'checked': self.checked, 'rejected': dict(self.rejected)}
+
+    def __repr__(self):
+        return '<GateStats checked=%i rejected=%r>' % (
+            self.checked, self.rejected)
+
+
+class GateCounters(object):
+
+    """The `GateStats` of each thread for a form class."""
+    __slots__ = ('local', 'threads')
+
+    def __init__(self):
+        self.local = threading.local()
+        self.threads = []
+
+    def get(self):
+        """Return the `GateStats` of the current thread."""
+        stats = getattr(self.local, 'stats', None)
+        if stats is None:
+            stats = self.local.stats = GateStats()
+            with _lock:
+                self.threads.append(stats)
+        return stats
+
+
+def get_counters(form_class):
+    counters = form_class.__dict__.get('_gate_stats')
+    if counters is None:
+        with _lock:
+            counters = form_class.__dict__.get('_gate_stats')
+            if counters is None:
+                counters = GateCounters()
+                form_class._gate_stats = counters
+    return counters
+
+
+def get_stats(form_class):
+    """Return the `GateStats` of `form_class`: the sum of those of all the
+    threads until now.
+    """
+    counters = get_counters(form_class)
+    with _lock:
+        threads = list(counters.threads)
+    total = GateStats()
+    for stats in threads:
+        total.checked += stats.checked
+        for name, count in list(stats.rejected.items()):
+            total.rejected[name] = total.rejected.get(name, 0) + count
+    return total
+
+
+def reset_stats(form_class):
+    """Start counting again the submissions of `form_class`."""
+    form_class._gate_stats = GateCounters()
+
+
+def get_name(gate):
+    return getattr(gate, '__name__', None) or gate.__class__.__name__
+
+
+def gate_error(gate):
+    """Return the `ValidationError` of a form rejected by `gate`."""
+    return ValidationError(get_name(gate))
+
+
+def check_gates(form_class, data, files, prefix=u''):
+    """Run the gates of `form_class` on the submitted data. Return the gate
+    that rejected it, or `None` if all of them passed.
+    """
+    stats = get_counters(form_class).get()
+    stats.checked += 1
+    for gate in form_class._gates:
+        if not gate(data, files, prefix):
+            name = get_name(gate)
+            stats.rejected[name] = stats.rejected.get(name, 0) + 1
+            return gate
+    return None
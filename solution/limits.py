@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Limits to the resources a submission can make a form use. They are checked
+while binding the data, before converting or validating anything, and an
+exceeded limit raises a `LimitError`.
+
+Set them as attributes of the form class:
+
+    class OrderForm(Form):
+        _max_keys = 500
+        _max_value_length = 10000
+        _max_file_size = 5 * 1024 * 1024
+        _max_rows = 100
+
+or for a single form with the `limits` argument, as a dict without the
+leading underscores. The limits apply to the sub-forms and form sets of the
+form too, and where both the form and a sub-form have a limit, the smaller
+one is used. A `FormSet` also takes its own `max_rows`.
+"""
+
+#: The names of the limits.
+LIMITS = ('max_keys', 'max_rows', 'max_value_length', 'max_file_size')
+
+
+class LimitError(ValueError):
+
+    """The submitted data exceeds one of the limits of the form.
+
+    :param kind:
+        The exceeded limit, one of `LIMITS`.
+
+    :param name:
+        The key of the value or file, or the prefix of the form or form set.
+
+    :param limit:
+        The maximum allowed.
+
+    :param size:
+        The size found, if known.
+
+    """
+
+    def __init__(self, kind, name, limit, size=None):
+        self.kind = kind
+        self.name = name
+        self.limit = limit
+        self.size = size
+        super(LimitError, self).__init__(
+            '%s of %r exceeded: %s > %s' % (kind, name, size, limit))
+
+    def to_dict(self):
+        return {'kind': self.kind, 'name': self.name, 'limit': self.limit,
+                'size': self.size}
+
+
+def get_limits(cls, limits=None):
+    """Return a dict with the limits set in the class (a form or a form
+    set) combined with `limits`, or `None` if there are none.
+    """
+    result = None
+    for kind in LIMITS:
+        value = getattr(cls, '_' + kind, None)
+        if limits:
+            value = smallest(value, limits.get(kind))
+        if value is not None:
+            if result is None:
+                result = {}
+            result[kind] = value
+    return result
+
+
+def smallest(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a, b)
+
+
+def check_data(form, data, files):
+    """Check the submitted data of the fields of `form` against its limits.
+    """
+    limits = form._limits
+    max_keys = limits.get('max_keys')
+    if max_keys is not None:
+        size = len(data) + len(files)
+        if size > max_keys:
+            raise LimitError('max_keys', form._prefix, max_keys, size)
+
+    max_length = limits.get('max_value_length')
+    max_file_size = limits.get('max_file_size')
+    if max_length is None and max_file_size is None:
+        return
+    prefix = form._prefix
+    for entry in form._plan.fields:
+        pname = prefix + entry[0]
+        if max_length is not None:
+            for value in data.getlist(pname):
+                if value is not None and len(value) > max_length:
+                    raise LimitError('max_value_length', pname, max_length,
+                                     len(value))
+        if max_file_size is not None:
+            for file_data in files.getlist(pname):
+                size = get_file_size(file_data)
+                if size is not None and size > max_file_size:
+                    raise LimitError('max_file_size', pname, max_file_size,
+                                     size)
+
+
+def get_file_size(file_data):
+    """Return the size of an uploaded file, without reading it, or `None`
+    if it can't be known.
+    """
+    size = getattr(file_data, 'size', None)
+    if size is None:
+        size = getattr(file_data, 'content_length', None) or None
+    if size is not None:
+        return size
+    stream = getattr(file_data, 'stream', file_data)
+    try:
+        pos = stream.tell()
+        stream.seek(0, 2)
+        size = stream.tell()
+        stream.seek(pos)
+    except (AttributeError, IOError, OSError, ValueError):
+        return None
+    return size
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+from ._compat import iteritems
+
+
+class LoadingPlan(object):
+
+    """The relationships a form reads from its object, and those of its
+    sub-forms and form sets, as paths of attribute names, e.g.:
+    ``[('customer',), ('lines',), ('lines', 'options')]``.
+
+    Use `options` or `apply` to eager-load all of them with the query of
+    the object, so binding the form doesn't lazy-load them one by one
+    (one query for each row and relationship).
+
+    :param form_class:
+        The form class.
+
+    """
+
+    def __init__(self, form_class):
+        self.form_class = form_class
+        self.paths = []
+        self._collect(form_class, (), set())
+
+    def _collect(self, form_class, path, seen):
+        if form_class in seen:
+            return
+        seen = seen | set([form_class])
+        children = [
+            (name, subform.__class__)
+            for name, subform in iteritems(form_class._declared_forms)
+        ] + [
+            (name, subset._form_class)
+            for name, subset in iteritems(form_class._declared_sets)
+        ]
+        for name, child_class in children:
+            child_path = path + (name,)
+            self.paths.append(child_path)
+            self._collect(child_class, child_path, seen)
+
+    def options(self, model=None):
+        """Return the SQLAlchemy loader options to eager-load the
+        relationships of the plan, starting from `model` (by default the
+        `_model` of the form class).
+
+        Collections are loaded with `selectinload` (one query for all the
+        rows) and many-to-one relationships with `joinedload`. The paths
+        that aren't relationships of the models, or that are "dynamic"
+        relationships, are skipped.
+        """
+        from sqlalchemy import inspect
+        from sqlalchemy.orm import joinedload, selectinload
+
+        model = model or self.form_class._model
+        assert model is not None, 'A model is required'
+        options = []
+        for path in self._leaves():
+            option = None
+            related = model
+            for name in path:
+                relation = inspect(related).relationships.get(name)
+                if relation is None or relation.lazy == 'dynamic':
+                    break
+                load = selectinload if relation.uselist else joinedload
+                attr = getattr(related, name)
+                option = load(attr) if option is None else \
+                    getattr(option, load.__name__)(attr)
+                related = relation.mapper.class_
+            if option is not None:
+                options.append(option)
+        return options
+
+    def apply(self, query, model=None):
+        """Return the `query` with the eager-loading options added."""
+        options = self.options(model)
+        return query.options(*options) if options else query
+
+    def _leaves(self):
+        """The paths that aren't the start of a longer one."""
+        return [
+            path for path in self.paths
+            if not any(
+                len(other) > len(path) and other[:len(path)] == path
+                for other in self.paths
+            )
+        ]
+
+    def __repr__(self):
+        return '<LoadingPlan %s %r>' % (self.form_class.__name__, self.paths)
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Bind forms to nested data, like a parsed JSON document, without flattening
+it first into prefixed keys:
+
+    {
+        "code": "A1",
+        "address": {"city": "Lima"},
+        "lines": [{"qty": 2}, {"qty": 3}]
+    }
+
+The sub-forms read the dict with their name and the form sets read the list
+with their name, one form for each item, so the number of rows is the
+length of the list (a `null` item is an empty row).
+"""
+from ._compat import iteritems, string_types, text_type
+from .plan import normalize_prefix
+from .utils import PrefixIndex
+
+
+class NestedData(PrefixIndex):
+
+    """The nested data of a form (a dict) or of a form set (a list).
+
+    It works like the flat data of the forms: the keys are the prefixed
+    names of the fields, but they are read directly from the dict of the
+    form, so the forms don't need to know which kind of data they have.
+    `child` and `row` return the nested data of the sub-forms, form sets
+    and rows.
+
+    :param values:
+        The dict of the form, the list of the form set, or `None` if
+        there is no data.
+
+    :param prefix:
+        The prefix of the form.
+
+    """
+    __slots__ = ('prefix',)
+
+    def __init__(self, values, prefix=u''):
+        self.data = values
+        self.prefix = normalize_prefix(prefix)
+        self._copy_on_write = True
+
+    def _key(self, key):
+        if key.startswith(self.prefix):
+            return key[len(self.prefix):]
+        return None
+
+    def _items(self):
+        return self.data if isinstance(self.data, dict) else {}
+
+    def getlist(self, key):
+        value = self._items().get(self._key(key))
+        if value is None:
+            return []
+        if not isinstance(value, (list, tuple)):
+            value = [value]
+        return [to_text(v) for v in value if v is not None]
+
+    def child(self, name, prefix):
+        return NestedData(self._items().get(name), prefix)
+
+    def _rows(self):
+        return self.data if isinstance(self.data, (list, tuple)) else ()
+
+    def row(self, num, prefix):
+        rows = self._rows()
+        return NestedData(rows[num - 1] if num <= len(rows) else None, prefix)
+
+    def num_rows(self):
+        """The length of the list, including any `null` item."""
+        return len(self._rows())
+
+    def has_prefix(self, prefix):
+        """The data of a form only has its own prefix (or the start of it)
+        if there is any. The prefixes of the children are in their data.
+        """
+        return self.data is not None and self.prefix.startswith(prefix)
+
+    def _before_write(self):
+        if self._copy_on_write:
+            self.data = dict(self._items())
+            self._copy_on_write = False
+
+    def get(self, key, default=None):
+        return self._items().get(self._key(key), default)
+
+    def __getitem__(self, key):
+        return self._items()[self._key(key)]
+
+    def __setitem__(self, key, value):
+        self._before_write()
+        self.data[self._key(key)] = value
+
+    def __delitem__(self, key):
+        self._before_write()
+        del self.data[self._key(key)]
+
+    def update(self, *args, **kwargs):
+        for key, value in iteritems(dict(*args, **kwargs)):
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, *default):
+        self._before_write()
+        return self.data.pop(self._key(key), *default)
+
+    def popitem(self):
+        self._before_write()
+        key, value = self.data.popitem()
+        return self.prefix + key, value
+
+    def clear(self):
+        self._before_write()
+        self.data.clear()
+
+    def __contains__(self, key):
+        return self._key(key) in self._items()
+
+    def __iter__(self):
+        return (self.prefix + key for key in self._items())
+
+    def __len__(self):
+        return len(self.data) if self.data else 0
+
+    def __nonzero__(self):
+        return bool(self.data)
+
+    __bool__ = __nonzero__
+
+    def __repr__(self):
+        return '<NestedData %r %r>' % (self.prefix, self.data)
+
+
+def to_text(value):
+    """Convert a JSON scalar into the string a field expects."""
+    if isinstance(value, string_types):
+        return value
+    if isinstance(value, bool):
+        return u'1' if value else u''
+    return text_type(value)
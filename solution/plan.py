@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+from collections import OrderedDict
+
+from ._compat import iteritems
+
+
+#: Characters that can end a form prefix
+PREFIX_SEPARATORS = ('_', '-', '.', '+', '|')
+
+
+def normalize_prefix(prefix):
+    prefix = prefix or u''
+    if prefix and not prefix.endswith(PREFIX_SEPARATORS):
+        prefix += u'-'
+    return prefix
+
+
+class BindingPlan(object):
+
+    """Everything a form needs to bind its fields, sub-forms and form sets
+    that depends only on the form class.
+
+    The plan doesn't depend on the prefix of the form, so it's compiled once
+    and shared by all the forms of the class: the top-level ones, the
+    sub-forms and every row of a `FormSet`, whatever their prefix. Each form
+    adds its prefix to the names when binding them.
+
+    :param form_class:
+        The form class.
+
+    """
+    __slots__ = ('form_class', 'fields', 'forms', 'sets', 'conditions',
+                 'relations')
+
+    def __init__(self, form_class):
+        self.form_class = form_class
+
+        #: (name, field spec, prepare hook, clean hook)
+        fields = []
+        for name, field in iteritems(form_class._declared_fields):
+            prepare = clean = None
+            if field.prepare is None:
+                prepare = lookup_hook(form_class, 'prepare_' + name)
+            if field.clean is None:
+                clean = lookup_hook(form_class, 'clean_' + name)
+            fields.append((name, field, prepare, clean))
+
+        #: (name, form class, prefix of the sub-form without the prefix of
+        #: the form, backref)
+        forms = []
+        for name, subform in iteritems(form_class._declared_forms):
+            forms.append((
+                name,
+                subform.__class__,
+                u'{0}.'.format(name.lower()),
+                subform._backref,
+            ))
+
+        #: (name, form set class, form class, create_new, backref)
+        sets = []
+        for name, subset in iteritems(form_class._declared_sets):
+            sets.append((
+                name,
+                subset.__class__,
+                subset._form_class,
+                subset._create_new,
+                subset._backref,
+            ))
+
+        #: The `when` conditions of the fields, sub-forms and form sets
+        #: that have one, by name, in the order they are validated: each
+        #: one after those it depends on.
+        conditions = OrderedDict()
+        for name, field in iteritems(form_class._declared_fields):
+            if field.when is not None:
+                conditions[name] = field.when
+        for name, child in iteritems(form_class._declared_forms):
+            if child._when is not None:
+                conditions[name] = child._when
+        for name, child in iteritems(form_class._declared_sets):
+            if child._when is not None:
+                conditions[name] = child._when
+
+        self.fields = tuple(fields)
+        self.forms = tuple(forms)
+        self.sets = tuple(sets)
+        self.conditions = sort_conditions(conditions)
+        self.relations = get_relations(fields)
+
+    def __repr__(self):
+        return '<BindingPlan %s>' % (self.form_class.__name__,)
+
+
+def sort_conditions(conditions):
+    """Sort the `conditions` so each one comes after the conditional fields
+    it depends on (see `utils.make_condition`), keeping the order of
+    declaration otherwise. Raises a `ValueError` if they depend on each
+    other in a cycle.
+    """
+    pending = OrderedDict(
+        (name, [
+            dep for dep in getattr(condition, 'depends_on', ())
+            if dep in conditions and dep != name
+        ])
+        for name, condition in iteritems(conditions)
+    )
+    result = OrderedDict()
+    while pending:
+        for name, deps in iteritems(pending):
+            if all(dep in result for dep in deps):
+                break
+        else:
+            raise ValueError(
+                'The conditions of %s depend on each other' %
+                ', '.join(pending))
+        result[name] = conditions[name]
+        del pending[name]
+    return result
+
+
+def get_relations(fields):
+    """Return the names of the `fields` that must be validated again with
+    the cleaned data of the form: those with form validators, or whose
+    class overwrites the methods that do it.
+    """
+    # Imported here because the compiler needs this module
+    from .compiler import RELATION_METHODS, inherits
+
+    return frozenset(
+        name for name, field, _, _ in fields
+        if field.form_validators or not inherits(field, RELATION_METHODS)
+    )
+
+
+def get_plan(form_class):
+    """Return the (cached) `BindingPlan` of `form_class`."""
+    plan = form_class.__dict__.get('_binding_plan')
+    if plan is None:
+        plan = BindingPlan(form_class)
+        form_class._binding_plan = plan
+    return plan
+
+
+def lookup_hook(form_class, name):
+    """Find a `prepare_<name>` or `clean_<name>` hook in the class without
+    binding it, so it can be bound later to each form instance.
+    """
+    for klass in form_class.__mro__:
+        if name in klass.__dict__:
+            return klass.__dict__[name]
+    return None
+
+
+def bind_hook(hook, form):
+    if hook is None:
+        return None
+    if hasattr(hook, '__get__'):
+        return hook.__get__(form, form.__class__)
+    return hook
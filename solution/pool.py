@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+from contextlib import contextmanager
+import threading
+
+
+#: Default maximum number of idle forms kept by thread in each pool.
+POOL_SIZE = 16
+
+
+class FormPool(object):
+
+    """Thread-local pool of instances of a form class.
+
+    Instead of constructing the form again for every request, an idle form
+    is taken from the pool and bound to the new data with `Form.rebind`,
+    reusing its bound fields, sub-forms and form sets.
+
+    :param form_class:
+        The form class.
+
+    :param size:
+        Maximum number of idle forms kept by each thread.
+
+    """
+
+    def __init__(self, form_class, size=POOL_SIZE):
+        self.form_class = form_class
+        self.size = size
+        self._local = threading.local()
+
+    @property
+    def idle(self):
+        forms = getattr(self._local, 'forms', None)
+        if forms is None:
+            forms = self._local.forms = []
+        return forms
+
+    def acquire(self, data=None, obj=None, files=None):
+        idle = self.idle
+        if idle:
+            return idle.pop().rebind(data, obj=obj, files=files)
+        return self.form_class(data, obj=obj, files=files)
+
+    def release(self, form):
+        """Reset the form and keep it for reuse, unless the pool of this
+        thread is full.
+        """
+        assert form.__class__ is self.form_class
+        form._clear()
+        idle = self.idle
+        if len(idle) < self.size:
+            idle.append(form)
+
+    @contextmanager
+    def form(self, data=None, obj=None, files=None):
+        """Context manager that acquires a form and releases it at the end.
+        """
+        form = self.acquire(data, obj=obj, files=files)
+        try:
+            yield form
+        finally:
+            self.release(form)
+
+
+def get_pool(form_class):
+    """Return the `FormPool` of `form_class`, creating it the first time.
+    """
+    pool = form_class.__dict__.get('_pool')
+    if pool is None:
+        pool = FormPool(form_class)
+        form_class._pool = pool
+    return pool
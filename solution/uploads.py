@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Uploaded files spooled to temporary storage, with their size and digest
+computed while they are written, so the validators can check them without
+reading the files again or keeping them in memory.
+
+Use ``File(spool=True)`` to spool the files that the web framework
+provides, or `SpoolSink` as the sink of `Form.from_asgi` to spool them
+while they arrive.
+"""
+
+#: Size of the chunks the files are copied in.
+CHUNK_SIZE = 64 * 1024
+
+#: Files larger than this are moved from memory to a temporary file.
+MAX_MEMORY = 1024 * 1024
+
+
+class SpooledUpload(object):
+
+    """An uploaded file stored in a `tempfile.SpooledTemporaryFile`: in
+    memory while it's small, and in a temporary file on disk after that.
+
+    :param filename:
+        The name of the file in the client.
+
+    :param content_type:
+        The content type of the file, as sent by the client.
+
+    :param name:
+        The name of the field.
+
+    :param max_memory:
+        Maximum size to keep in memory.
+
+    :param algorithm:
+        The `hashlib` algorithm of the `digest`.
+
+    """
+
+    def __init__(self, filename=None, content_type=None, name=None,
+                 max_memory=MAX_MEMORY, algorithm='sha256'):
+        # Imported here so they aren't imported at all without uploads
+        import hashlib
+        from tempfile import SpooledTemporaryFile
+
+        self.filename = filename
+        self.content_type = content_type
+        self.name = name
+        self.algorithm = algorithm
+        self.file = SpooledTemporaryFile(max_size=max_memory)
+        self.size = 0
+        self._hash = hashlib.new(algorithm)
+
+    @classmethod
+    def from_file(cls, file_data, chunk_size=CHUNK_SIZE, **kwargs):
+        """Spool the contents of any uploaded file object: one with a
+        `stream` (Werkzeug), a file-like object with a `read` method, a
+        `BodyFile` or bytes. They are copied in chunks of `chunk_size`.
+        """
+        kwargs.setdefault('filename', getattr(file_data, 'filename', None))
+        kwargs.setdefault('content_type', getattr(
+            file_data, 'content_type', None))
+        kwargs.setdefault('name', getattr(file_data, 'name', None))
+        upload = cls(**kwargs)
+        for chunk in iter_chunks(file_data, chunk_size):
+            upload.write(chunk)
+        upload.finish()
+        return upload
+
+    def write(self, chunk):
+        """Add a chunk to the end of the file."""
+        self.file.write(chunk)
+        self._hash.update(chunk)
+        self.size += len(chunk)
+
+    def finish(self):
+        """Finish writing the file and go back to its start."""
+        self.file.flush()
+        self.file.seek(0)
+        return self
+
+    @property
+    def digest(self):
+        """The hexadecimal digest of the contents."""
+        return self._hash.hexdigest()
+
+    @property
+    def in_memory(self):
+        return not getattr(self.file, '_rolled', False)
+
+    def read(self, size=-1):
+        return self.file.read(size)
+
+    def seek(self, offset, whence=0):
+        return self.file.seek(offset, whence)
+
+    def tell(self):
+        return self.file.tell()
+
+    def close(self):
+        """Release the storage of the file."""
+        self.file.close()
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return '<SpooledUpload %r (%i bytes)>' % (self.filename, self.size)
+
+
+class SpoolSink(object):
+
+    """A sink for `Form.from_asgi` that spools the uploaded files while
+    they arrive. The files are bound as `SpooledUpload` objects.
+    """
+
+    def __init__(self, max_memory=MAX_MEMORY, algorithm='sha256'):
+        self.max_memory = max_memory
+        self.algorithm = algorithm
+
+    def __call__(self, name, filename, content_type):
+        return SpoolWriter(SpooledUpload(
+            filename, content_type, name, max_memory=self.max_memory,
+            algorithm=self.algorithm))
+
+
+class SpoolWriter(object):
+
+    def __init__(self, upload):
+        self.write = upload.write
+        self.upload = upload
+
+    def close(self):
+        return self.upload.finish()
+
+
+def iter_chunks(file_data, chunk_size=CHUNK_SIZE):
+    """Yield the contents of an uploaded file in chunks."""
+    data = getattr(file_data, 'data', None)
+    if isinstance(file_data, (bytes, bytearray, memoryview)):
+        data = file_data
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        view = memoryview(data)
+        for start in range(0, len(view), chunk_size):
+            yield view[start:start + chunk_size].tobytes()
+        return
+    stream = getattr(file_data, 'stream', file_data)
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
@@ -1,9 +1,9 @@
 # -*- coding: utf-8 -*-
 import re
-from xml.sax.saxutils import quoteattr
 
 from markupsafe import Markup, escape_silent
-from ._compat import to_unicode, iteritems
+from ._compat import to_unicode, iteritems, string_types
+from .plan import PREFIX_SEPARATORS
 
 
 class FakeMultiDict(dict):
@@ -26,6 +26,69 @@ class FakeMultiDict(dict):
         return [value]
 
 
+class LazyRegex(object):
+
+    """A regular expression that is compiled the first time it's used,
+    instead of when the module that defines it is imported.
+
+    The attributes of the compiled pattern (`match`, `split`, etc.) are
+    copied to this object on first use, so after that it's as fast as the
+    pattern itself.
+    """
+
+    def __init__(self, pattern, flags=0):
+        self._pattern = pattern
+        self._flags = flags
+
+    def compile(self):
+        """Compile the pattern, if it isn't already, and return it."""
+        regex = self.__dict__.get('_regex')
+        if regex is None:
+            regex = self._regex = re.compile(self._pattern, self._flags)
+        return regex
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        value = getattr(self.compile(), name)
+        setattr(self, name, value)
+        return value
+
+    def __repr__(self):
+        return 'LazyRegex(%r)' % (self._pattern,)
+
+
+def make_condition(when):
+    """Return the `when` condition of a field, sub-form or form set as a
+    function of the cleaned data of the form. It can be:
+
+    - a function, that takes the cleaned data and returns a boolean;
+    - the name of a field, active if its cleaned value is truthy;
+    - a dict of names and values, active if all of the cleaned values
+      are equal to those.
+
+    The names a condition reads are stored in its `depends_on` attribute,
+    so the conditions that depend on other conditional fields are evaluated
+    after them. A function can have a `depends_on` list of its own.
+
+    """
+    if when is None or callable(when):
+        return when
+    if isinstance(when, string_types):
+        def condition(data):
+            return bool(data.get(when))
+        condition.depends_on = (when,)
+        return condition
+    if isinstance(when, dict):
+        expected = list(iteritems(when))
+
+        def condition(data):
+            return all(data.get(key) == value for key, value in expected)
+        condition.depends_on = tuple(key for key, _ in expected)
+        return condition
+    raise TypeError('Invalid condition: %r' % (when,))
+
+
 def escape(value):
     return escape_silent(to_unicode(value))
 
@@ -45,6 +108,9 @@ def get_html_attrs(kwargs=None):
     u'class="myclass" data-id="1" id="text1" checked'
 
     """
+    # Imported here because it's slow to import
+    from xml.sax.saxutils import quoteattr
+
     kwargs = kwargs or {}
     attrs = []
     props = []
@@ -90,3 +156,161 @@ def set_obj_value(obj, name, value):
         obj[name] = value
     else:
         setattr(obj, name, value)
+
+
+#: Matches the characters that can end a prefix in a submitted key
+rx_separators = LazyRegex(
+    u'[%s]' % u''.join(re.escape(sep) for sep in PREFIX_SEPARATORS))
+
+
+class PrefixIndex(object):
+
+    """Wraps the submitted data (a MultiDict) with an index of the prefixes
+    of its keys, so testing if a sub-form or a row of a form set has any
+    data doesn't need to scan all the keys each time.
+
+    The index is built in a single pass the first time is needed, by adding
+    every part of the keys that ends in a prefix separator, e.g.:
+    ``order.lineform.2-qty`` adds ``order.``, ``order.lineform.`` and
+    ``order.lineform.2-``. The same index is shared by the form and all its
+    sub-forms and form sets.
+
+    Any other method or attribute is taken from the wrapped data.
+
+    :param data:
+        The wrapped data.
+
+    :param adapter:
+        A function that takes the data and returns its `getlist` function.
+        By default, `data.getlist` is used. See `solution.adapters`.
+
+    :param copy_on_write:
+        Copy the data (as a `dict`) before the first change, instead of
+        changing the wrapped object.
+
+    """
+    __slots__ = ('data', 'getlist', '_adapter', '_copy_on_write',
+                 '_prefixes')
+
+    def __init__(self, data, adapter=None, copy_on_write=False):
+        self.data = data
+        self.getlist = adapter(data) if adapter else data.getlist
+        self._adapter = adapter
+        self._copy_on_write = copy_on_write
+        self._prefixes = None
+
+    def _before_write(self):
+        if self._copy_on_write:
+            self.data = dict(self.data)
+            self.getlist = self._adapter(self.data)
+            self._copy_on_write = False
+
+    @property
+    def prefixes(self):
+        if self._prefixes is None:
+            prefixes = set()
+            for key in self.data:
+                add_prefixes(prefixes, key)
+            self._prefixes = prefixes
+        return self._prefixes
+
+    def has_prefix(self, prefix):
+        if prefix.endswith(PREFIX_SEPARATORS):
+            return prefix in self.prefixes
+        for k in self.data:
+            if k.startswith(prefix):
+                return True
+        return False
+
+    def child(self, name, prefix):
+        """The data of the sub-form or form set `name`. With flat data, it's
+        the same data. See `solution.nested.NestedData`.
+        """
+        return self
+
+    def row(self, num, prefix):
+        """The data of the row `num` of a form set."""
+        return self
+
+    def num_rows(self):
+        """The number of rows of a form set, or `None` if it can only be
+        known by looking for the keys of each row, as with flat data.
+        """
+        return None
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __setitem__(self, key, value):
+        self._before_write()
+        self.data[key] = value
+        if self._prefixes is not None:
+            add_prefixes(self._prefixes, key)
+
+    def __delitem__(self, key):
+        self._before_write()
+        del self.data[key]
+        self._prefixes = None
+
+    def _write(self, method, *args, **kwargs):
+        """Call a method of the data that changes it, after copying it
+        if needed, and rebuild the index the next time it's used.
+        """
+        self._before_write()
+        result = getattr(self.data, method)(*args, **kwargs)
+        self._prefixes = None
+        return result
+
+    def update(self, *args, **kwargs):
+        return self._write('update', *args, **kwargs)
+
+    def setdefault(self, key, default=None):
+        return self._write('setdefault', key, default)
+
+    def pop(self, key, *default):
+        return self._write('pop', key, *default)
+
+    def popitem(self):
+        return self._write('popitem')
+
+    def clear(self):
+        return self._write('clear')
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __nonzero__(self):
+        return bool(self.data)
+
+    __bool__ = __nonzero__
+
+    def __getattr__(self, name):
+        return getattr(self.data, name)
+
+    def __repr__(self):
+        return '<PrefixIndex %r>' % (self.data,)
+
+
+def add_prefixes(prefixes, key):
+    for match in rx_separators.finditer(key):
+        prefixes.add(key[:match.end()])
+
+
+def has_prefix(d, prefix):
+    """Test if any of the keys of the `d` dictionary starts with `prefix`.
+    """
+    if isinstance(d, PrefixIndex):
+        return d.has_prefix(prefix)
+    for k in d:
+        if k.startswith(prefix):
+            return True
+    return False
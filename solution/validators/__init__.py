@@ -1,7 +1,35 @@
-from .validator import Validator
-from .simple import Required, IsNumber
-from .dates import IsDate, IsTime, Before, After, BeforeNow, AfterNow
-from .values import LongerThan, ShorterThan, LessThan, MoreThan, InRange
-from .patterns import Match, ValidEmail, ValidURL, ValidColor, IsColor
+from .._compat import lazy_exports
 
-from .form_wide import FormValidator, AreEqual, AtLeastOne, ValidSplitDate
+
+_exports = {
+    'Validator': '.validator',
+    'Required': '.simple',
+    'IsNumber': '.simple',
+    'IsDate': '.dates',
+    'IsTime': '.dates',
+    'Before': '.dates',
+    'After': '.dates',
+    'BeforeNow': '.dates',
+    'AfterNow': '.dates',
+    'LongerThan': '.values',
+    'ShorterThan': '.values',
+    'LessThan': '.values',
+    'MoreThan': '.values',
+    'InRange': '.values',
+    'MaxFileSize': '.files',
+    'FileType': '.files',
+    'ImageSize': '.files',
+    'Match': '.patterns',
+    'ValidEmail': '.patterns',
+    'ValidURL': '.patterns',
+    'ValidColor': '.patterns',
+    'IsColor': '.patterns',
+    'FormValidator': '.form_wide',
+    'AreEqual': '.form_wide',
+    'AtLeastOne': '.form_wide',
+    'ValidSplitDate': '.form_wide',
+}
+
+__all__ = sorted(_exports)
+
+__getattr__, __dir__ = lazy_exports(__name__, _exports)
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+from ..filetypes import TYPES, get_image_size, guess_type, open_header
+from ..limits import get_file_size
+from .validator import Validator
+
+
+class MaxFileSize(Validator):
+    """Validates the size of an uploaded file is smaller or equal than
+    maximum. The size is read from the file object (its `size` or
+    `content_length`, or seeking to its end), without reading it.
+
+    :param size:
+        The maximum allowed size in bytes.
+
+    :param message:
+        Error message to raise in case of a validation error
+
+    """
+    message = u'The file cannot be larger than %s bytes.'
+
+    def __init__(self, size, message=None):
+        assert isinstance(size, int)
+        self.size = size
+        if message is None:
+            message = self.message % (size,)
+        self.message = message
+
+    def __call__(self, py_value=None, form=None):
+        if py_value is None:
+            return True
+        size = get_file_size(py_value)
+        return size is not None and size <= self.size
+
+
+class FileType(Validator):
+    """Validates an uploaded file is of one of the `types`, by its magic
+    bytes, whatever its name or content type says. Only the start of the
+    file is read (or memory-mapped).
+
+    :param types:
+        The allowed types: ``'png'``, ``'jpeg'``, ``'gif'``, ``'webp'``,
+        ``'bmp'``, ``'pdf'`` or ``'zip'``.
+
+    :param message:
+        Error message to raise in case of a validation error
+
+    """
+    message = u'The file must be of type %s.'
+
+    def __init__(self, *types, **kwargs):
+        for type_ in types:
+            assert type_ in TYPES, 'Unknown file type: %r' % (type_,)
+        self.types = types
+        message = kwargs.get('message')
+        if message is None:
+            message = self.message % (u', '.join(types),)
+        self.message = message
+
+    def __call__(self, py_value=None, form=None):
+        if py_value is None:
+            return True
+        with open_header(py_value) as header:
+            return guess_type(header) in self.types
+
+
+class ImageSize(Validator):
+    """Validates the width and height of an uploaded PNG, JPEG, GIF, WebP or
+    BMP image are within limits. The dimensions are read from the header of
+    the image, without decoding it. Any other file is not valid.
+
+    :param min_width:
+        The minimum width in pixels.
+
+    :param min_height:
+        The minimum height in pixels.
+
+    :param max_width:
+        The maximum width in pixels.
+
+    :param max_height:
+        The maximum height in pixels.
+
+    :param message:
+        Error message to raise in case of a validation error
+
+    """
+    message = u'Invalid image size.'
+
+    def __init__(self, min_width=None, min_height=None, max_width=None,
+                 max_height=None, message=None):
+        self.min_width = min_width
+        self.min_height = min_height
+        self.max_width = max_width
+        self.max_height = max_height
+        if message is not None:
+            self.message = message
+
+    def __call__(self, py_value=None, form=None):
+        if py_value is None:
+            return True
+        with open_header(py_value) as header:
+            size = get_image_size(header)
+        if size is None:
+            return False
+        width, height = size
+        return (
+            (self.min_width is None or width >= self.min_width) and
+            (self.min_height is None or height >= self.min_height) and
+            (self.max_width is None or width <= self.max_width) and
+            (self.max_height is None or height <= self.max_height)
+        )
@@ -1,11 +1,15 @@
 # -*- coding: utf-8 -*-
-from email.utils import parseaddr
 import re
 
-from .._compat import string_types, urlsplit, urlunsplit, to_unicode
-
+from .._compat import PY2, string_types, to_unicode
+from ..utils import LazyRegex
 from .validator import Validator
 
+if PY2:
+    from urlparse import urlsplit, urlunsplit
+else:
+    from urllib.parse import urlsplit, urlunsplit
+
 
 class Match(Validator):
     """Validates the field against a regular expression.
@@ -26,7 +30,7 @@ class Match(Validator):
 
     def __init__(self, regex, message=None, flags=re.IGNORECASE):
         if isinstance(regex, string_types):
-            regex = re.compile(regex, flags)
+            regex = LazyRegex(regex, flags)
         self.regex = regex
         if message is not None:
             self.message = message
@@ -44,7 +48,7 @@ class ValidColor(Match):
     """
     message = u'Enter a valid color.'
 
-    regex = re.compile(r'#[0-9a-f]{6,8}', re.IGNORECASE)
+    regex = LazyRegex(r'#[0-9a-f]{6,8}', re.IGNORECASE)
 
     def __init__(self, message=None):
         if message is not None:
@@ -66,7 +70,7 @@ class ValidEmail(Validator):
     """
     message = u'Enter a valid e-mail address.'
 
-    email_rx = re.compile(
+    email_rx = LazyRegex(
         r'^[A-Z0-9][A-Z0-9._%+-]*@[A-Z0-9][A-Z0-9\-\.]{0,61}\.[A-Z0-9]+$',
         re.IGNORECASE)
 
@@ -77,6 +81,8 @@ class ValidEmail(Validator):
     def __call__(self, py_value=None, form=None):
         if not py_value or '@' not in py_value:
             return False
+        # Imported here because it's slow to import and rarely needed
+        from email.utils import parseaddr
         py_value = parseaddr(py_value)[-1]
         if '.@' in py_value:
             return False
@@ -113,7 +119,7 @@ class ValidURL(Validator):
 
     def __init__(self, message=None, require_tld=True):
         tld_part = r'\.[a-z]{2,10}' if require_tld else u''
-        self.regex = re.compile(self.url_rx % tld_part, re.IGNORECASE)
+        self.regex = LazyRegex(self.url_rx % tld_part, re.IGNORECASE)
         if message is not None:
             self.message = message
 
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+import gc
+import inspect
+
+from .compiler import get_compiled
+from .fields.bound import get_bound_class
+from .form import Form
+from .plan import get_plan
+from .utils import LazyRegex, rx_separators
+
+
+def warmup(targets=None, freeze=False):
+    """Precompute everything the forms lazily build on first use, so a
+    pre-forking server can do it once in the master process instead of once
+    in each worker.
+
+    For each form class this builds the binding plan (of the form, and
+    recursively of the forms of its sub-forms and form sets; a single plan
+    serves every row of a set), the bound classes of the fields and, if
+    enabled, the compiled code. It also
+    compiles the regular expressions of the fields and their validators,
+    that are otherwise compiled on first use.
+
+    :param targets:
+        A list of modules and/or form classes. For a module, all the form
+        classes defined in it are used. If not provided, every subclass of
+        `Form` imported until now is used.
+
+    :param freeze:
+        If `True`, run a full garbage collection and then move all the
+        objects to a permanent generation (`gc.freeze()`, Python 3.7+), so
+        the forked workers don't touch (and copy) those memory pages.
+
+    Returns the list of form classes.
+    """
+    classes = list(iter_form_classes(targets))
+    done = set()
+    for form_class in classes:
+        warmup_form(form_class, done=done)
+    rx_separators.compile()
+
+    if freeze:
+        gc.collect()
+        if hasattr(gc, 'freeze'):
+            gc.freeze()
+    return classes
+
+
+def iter_form_classes(targets=None):
+    if targets is None:
+        targets = [Form]
+
+    seen = set()
+    for target in targets:
+        if target is Form:
+            found = iter_subclasses(Form)
+        elif inspect.ismodule(target):
+            found = [
+                value for value in vars(target).values()
+                if inspect.isclass(value) and issubclass(value, Form) and
+                value.__module__ == target.__name__
+            ]
+        else:
+            found = [target]
+        for form_class in found:
+            if form_class not in seen:
+                seen.add(form_class)
+                yield form_class
+
+
+def iter_subclasses(cls):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        for subsubclass in iter_subclasses(subclass):
+            yield subsubclass
+
+
+def warmup_form(form_class, done=None):
+    """Build the binding plan of `form_class`, and those of the forms of
+    its sub-forms and form sets, and the bound classes of their fields.
+    """
+    done = set() if done is None else done
+    if form_class in done:
+        return
+    done.add(form_class)
+
+    plan = get_plan(form_class)
+    get_compiled(form_class)
+    for entry in plan.fields:
+        get_bound_class(entry[1])
+        compile_regexes(entry[1], done=done)
+    for _, subform_class, _, _ in plan.forms:
+        warmup_form(subform_class, done=done)
+    for _, _, row_class, _, _ in plan.sets:
+        warmup_form(row_class, done=done)
+
+
+def compile_regexes(field, done=None):
+    """Compile the `LazyRegex` attributes of the `field` (and its class)
+    and of its validators. The classes in `done` are skipped, and those
+    scanned are added to it.
+    """
+    done = set() if done is None else done
+    for obj in [field] + list(field.validators):
+        namespaces = [getattr(obj, '__dict__', {})]
+        for klass in type(obj).__mro__:
+            if klass not in done:
+                done.add(klass)
+                namespaces.append(vars(klass))
+        for namespace in namespaces:
+            for value in list(namespace.values()):
+                if isinstance(value, LazyRegex):
+                    value.compile()
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+import sys
+
+
+collect_ignore = []
+
+# Uses `async def`, that older versions can't even parse
+if sys.version_info < (3, 6):
+    collect_ignore.append('test_asgi.py')
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+import solution as f
+from solution import adapters
+from solution.adapters import adapt, get_adapter
+
+
+class ListForm(f.Form):
+    name = f.Text()
+    tags = f.MultiSelect(items=[(u'a', u'A'), (u'b', u'B')])
+
+
+class GetAllMultiDict(object):
+    """Like WebOb's MultiDict."""
+
+    def __init__(self, items):
+        self.items = items
+
+    def getall(self, key):
+        return [value for k, value in self.items if k == key]
+
+    def __iter__(self):
+        return iter([k for k, _ in self.items])
+
+    def __contains__(self, key):
+        return key in list(self)
+
+    def __len__(self):
+        return len(self.items)
+
+
+class GetListMultiDict(dict):
+    """Like Werkzeug's or Django's MultiDicts."""
+
+    def getlist(self, key):
+        value = self.get(key)
+        return value if isinstance(value, list) else []
+
+
+def test_adapt_dict_without_copy():
+    data = {'name': u'John'}
+    adapted = adapt(data)
+    assert adapted.data is data
+    assert adapted.getlist('name') == [u'John']
+    assert adapted.getlist('nope') == []
+    assert adapt(adapted) is adapted
+
+    # Copy on write
+    adapted['name'] = u'Jane'
+    assert data == {'name': u'John'}
+    assert adapted.getlist('name') == [u'Jane']
+
+
+def test_adapt_multidicts():
+    data = GetAllMultiDict([('name', u'John'), ('tags', u'a'),
+                            ('tags', u'b')])
+    form = ListForm(data)
+    assert form.is_valid()
+    assert form.cleaned_data == {'name': u'John', 'tags': [u'a', u'b']}
+
+    data = GetListMultiDict(name=[u'John'], tags=[u'a', u'b'])
+    adapted = adapt(data)
+    assert adapted.getlist == data.getlist
+    form = ListForm(data)
+    assert form.is_valid()
+    assert form.cleaned_data['tags'] == [u'a', u'b']
+
+
+def test_prepare_with_dict():
+
+    class MyForm(f.Form):
+        name = f.Text()
+
+        def prepare(self, data):
+            data = dict(data)
+            data['name'] = data.get('name', u'').upper()
+            return data
+
+    data = {'name': u'john'}
+    form = MyForm(data)
+    assert form.name.value == u'JOHN'
+    assert data == {'name': u'john'}
+
+
+def test_prepare_changes_a_copy_of_the_dict():
+
+    class MyForm(f.Form):
+        name = f.Text()
+        sub = f.Text()
+
+        def prepare(self, data):
+            data.update({'name': u'changed'})
+            data.setdefault('sub', u'added')
+            data.pop('extra')
+            return data
+
+    data = {'name': u'orig', 'extra': u'x'}
+    form = MyForm(data)
+    assert form.name.value == u'changed'
+    assert form.sub.value == u'added'
+    assert data == {'name': u'orig', 'extra': u'x'}
+
+    data = {'name': u'orig', 'extra': u'x'}
+    form = MyForm.from_json(data)
+    assert form.name.value == u'changed'
+    assert form.sub.value == u'added'
+    assert data == {'name': u'orig', 'extra': u'x'}
+
+
+def test_register_adapter():
+
+    class Pairs(tuple):
+        pass
+
+    f.register_adapter(
+        lambda cls: issubclass(cls, Pairs),
+        lambda data: lambda key: [v for k, v in data if k == key])
+    try:
+        assert get_adapter(Pairs)[1] is False
+        form = ListForm(Pairs([('name', u'John')]))
+        assert form.name.value == u'John'
+    finally:
+        adapters._adapters.pop()
+        adapters._by_type.clear()
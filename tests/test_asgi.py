@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+# Requires Python 3.6+, see conftest.py
+import pytest
+
+import solution as f
+
+
+class LineForm(f.Form):
+    qty = f.Number(type=int)
+
+
+class UploadForm(f.Form):
+    code = f.Text(validate=[f.Required])
+    lines = f.FormSet(LineForm)
+    doc = f.File()
+
+
+BOUNDARY = b'----xYzZY'
+PARTS = [
+    (b'Content-Disposition: form-data; name="code"', b'A1'),
+    (b'Content-Disposition: form-data; name="unknown"', b'x' * 1000),
+    (b'Content-Disposition: form-data; name="lineform.1-qty"', b'4'),
+    (b'Content-Disposition: form-data; name="doc"; filename="a.txt"\r\n'
+     b'Content-Type: text/plain', b'hello\r\n--world' * 100),
+]
+MULTIPART = b''.join(
+    b'--' + BOUNDARY + b'\r\n' + headers + b'\r\n\r\n' + content + b'\r\n'
+    for headers, content in PARTS
+) + b'--' + BOUNDARY + b'--\r\n'
+MULTIPART_TYPE = b'multipart/form-data; boundary=----xYzZY'
+
+
+def run(coroutine):
+    import asyncio
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def make_receive(body, size):
+    import asyncio
+    chunks = [body[i:i + size] for i in range(0, len(body), size)] or [b'']
+    messages = [
+        {'type': 'http.request', 'body': chunk,
+         'more_body': i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+
+    def receive():
+        future = asyncio.get_event_loop().create_future()
+        future.set_result(messages.pop(0))
+        return future
+    return receive
+
+
+def make_scope(content_type):
+    return {'type': 'http', 'headers': [(b'Content-Type', content_type)]}
+
+
+def test_from_asgi_urlencoded():
+    body = (b'code=A%2B1&csrf=' + b'x' * 5000 +
+            b'&lineform.1-qty=2&lineform.2-qty=3')
+    scope = make_scope(b'application/x-www-form-urlencoded')
+    for size in (1, 7, len(body)):
+        form = run(UploadForm.from_asgi(make_receive(body, size), scope,
+                                        max_field_size=100))
+        assert form.is_valid()
+        assert form.cleaned_data['code'] == u'A+1'
+        assert [line.qty.value for line in form.lines] == [u'2', u'3']
+
+
+def test_from_asgi_multipart():
+    for size in (1, 5, 64, len(MULTIPART)):
+        form = run(UploadForm.from_asgi(
+            make_receive(MULTIPART, size), make_scope(MULTIPART_TYPE)))
+        assert form.is_valid()
+        assert form.cleaned_data['code'] == u'A1'
+        assert list(form.lines)[0].qty.value == u'4'
+        doc = form.cleaned_data['doc']
+        assert doc.filename == u'a.txt'
+        assert doc.content_type == u'text/plain'
+        assert doc.read() == b'hello\r\n--world' * 100
+
+
+def test_from_asgi_sink():
+    written = []
+
+    class Writer(object):
+        def __init__(self, filename):
+            self.filename = filename
+
+        async def write(self, chunk):
+            written.append(chunk)
+
+        def close(self):
+            return self.filename
+
+    def sink(name, filename, content_type):
+        return Writer(filename)
+
+    form = run(UploadForm.from_asgi(
+        make_receive(MULTIPART, 256), make_scope(MULTIPART_TYPE), sink=sink))
+    assert form.is_valid()
+    assert form.cleaned_data['doc'] == u'a.txt'
+    assert len(written) > 1
+    assert b''.join(written) == b'hello\r\n--world' * 100
+
+
+def test_from_asgi_limits():
+    scope = make_scope(MULTIPART_TYPE)
+    with pytest.raises(f.LimitError) as error:
+        run(UploadForm.from_asgi(make_receive(MULTIPART, 64), scope,
+                                 max_file_size=1000))
+    assert error.value.name == 'doc' and error.value.limit == 1000
+
+    with pytest.raises(f.LimitError) as error:
+        run(UploadForm.from_asgi(make_receive(MULTIPART, 64), scope,
+                                 max_sizes={'code': 1}))
+    assert error.value.name == 'code'
+
+    # The unknown keys are skipped, whatever their size
+    form = run(UploadForm.from_asgi(make_receive(MULTIPART, 64), scope,
+                                    max_field_size=10))
+    assert form.is_valid()
+
+    body = b'code=' + b'x' * 100
+    scope = make_scope(b'application/x-www-form-urlencoded')
+    with pytest.raises(f.LimitError):
+        run(UploadForm.from_asgi(make_receive(body, 10), scope,
+                                 max_field_size=10))
+
+
+def test_from_asgi_errors():
+    with pytest.raises(ValueError):
+        run(UploadForm.from_asgi(make_receive(b'{}', 10),
+                                 make_scope(b'application/json')))
+    with pytest.raises(ValueError):
+        run(UploadForm.from_asgi(make_receive(MULTIPART[:-20], 10),
+                                 make_scope(MULTIPART_TYPE)))
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+import solution as f
+from solution.body import get_key_filter, parse_body
+
+
+class LineForm(f.Form):
+    qty = f.Number(type=int)
+
+
+class AddressForm(f.Form):
+    city = f.Text()
+
+
+class OrderForm(f.Form):
+    code = f.Text(validate=[f.Required])
+    tags = f.MultiSelect(items=[(u'a', u'A'), (u'b', u'B')])
+    address = AddressForm()
+    lines = f.FormSet(LineForm)
+    doc = f.File()
+
+
+def test_key_filter():
+    wanted = get_key_filter(OrderForm)
+    for key in ('code', 'tags', 'address.city', 'lineform.1-qty',
+                'lineform.25-qty', 'doc'):
+        assert wanted(key)
+    for key in ('nope', 'codex', 'address.nope', 'lineform.x-qty',
+                'lineform.1-nope', 'address.'):
+        assert not wanted(key)
+    wanted = get_key_filter(OrderForm, u'order')
+    assert wanted('order-code') and not wanted('code')
+
+
+def test_from_body_urlencoded():
+    body = (b'code=A%2B1&tags=a&tags=b&address.city=S%C3%A3o+Paulo'
+            b'&lineform.1-qty=2&lineform.2-qty=3&csrf=xyz&empty=&flag')
+    form = OrderForm.from_body(
+        body, 'application/x-www-form-urlencoded; charset=utf-8')
+    assert form.is_valid()
+    assert form.cleaned_data['code'] == u'A+1'
+    assert form.cleaned_data['tags'] == [u'a', u'b']
+    assert form.address.city.value == u'São Paulo'
+    assert [line.qty.value for line in form.lines] == [u'2', u'3']
+
+    data, _ = parse_body(body, 'application/x-www-form-urlencoded',
+                         form_class=OrderForm)
+    assert 'csrf' not in data
+    data, _ = parse_body(body, 'application/x-www-form-urlencoded')
+    assert data['csrf'] == [u'xyz']
+    assert data['empty'] == [u''] and data['flag'] == [u'']
+
+
+def test_from_body_multipart():
+    boundary = b'----xYzZY'
+    parts = [
+        (b'Content-Disposition: form-data; name="code"', b'A1'),
+        (b'Content-Disposition: form-data; name="unknown"', b'x' * 1000),
+        (b'Content-Disposition: form-data; name="lineform.1-qty"', b'4'),
+        (b'Content-Disposition: form-data; name="doc"; filename="a.txt"\r\n'
+         b'Content-Type: text/plain', b'hello\r\nworld'),
+    ]
+    body = b''.join(
+        b'--' + boundary + b'\r\n' + headers + b'\r\n\r\n' + content + b'\r\n'
+        for headers, content in parts
+    ) + b'--' + boundary + b'--\r\n'
+    content_type = 'multipart/form-data; boundary="----xYzZY"'
+
+    form = OrderForm.from_body(body, content_type)
+    assert form.is_valid()
+    assert form.cleaned_data['code'] == u'A1'
+    assert list(form.lines)[0].qty.value == u'4'
+    doc = form.cleaned_data['doc']
+    assert doc.filename == u'a.txt'
+    assert doc.content_type == u'text/plain'
+    assert isinstance(doc.data, memoryview)
+    assert doc.read() == b'hello\r\nworld'
+
+    data, files = parse_body(body, content_type, form_class=OrderForm)
+    assert sorted(data) == ['code', 'lineform.1-qty']
+    assert list(files) == ['doc']
+
+
+def test_from_body_errors():
+    with pytest.raises(ValueError):
+        parse_body(b'{}', 'application/json')
+    with pytest.raises(ValueError):
+        parse_body(b'--x\r\n', 'multipart/form-data')
+    with pytest.raises(ValueError):
+        parse_body(b'--x\r\nContent-Disposition: form-data; name="a"\r\n',
+                   'multipart/form-data; boundary=x')
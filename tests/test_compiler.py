@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+import solution as f
+from solution.compiler import COMPILE_ALL, compile_form
+from solution.plan import get_plan
+
+
+def make_forms():
+
+    class Form(f.Form):
+        name = f.Text(validate=[f.Required, f.LongerThan(3)])
+        email = f.Text(validate=[f.ValidEmail])
+        age = f.Number(type=int, validate=[f.InRange(18, 99)])
+        code = f.Text(prepare=lambda v, **kw: (v or u'').upper())
+        color = f.MultiSelect(items=[(1, u'R'), (2, u'G')], type=int)
+        agree = f.Boolean()
+        password = f.Text(validate=[f.Required])
+        password2 = f.Text(validate=[
+            f.AreEqual('password', 'password2')])
+
+        def prepare_email(self, obj_value, **kwargs):
+            return obj_value or u'default@example.com'
+
+        def clean_name(self, py_value, **kwargs):
+            if py_value == u'forbidden':
+                raise f.ValidationError(u'Nope')
+            return py_value and py_value.title()
+
+    class CompiledForm(Form):
+        _compile = True
+
+    return Form, CompiledForm
+
+
+DATA = [
+    {},
+    {
+        'name': u'john doe', 'email': u'john@example.com', 'age': u'30',
+        'color': u'1', 'agree': u'1',
+        'password': u'x', 'password2': u'x',
+    },
+    {
+        'name': u'forbidden', 'email': u'nope', 'age': u'12',
+        'password': u'x', 'password2': u'y',
+    },
+    {'name': u'ab', 'age': u'abc', 'password': u' '},
+]
+
+
+def summary(form):
+    valid = form.is_valid()
+    values = dict((field.name, field.to_string()) for field in form)
+    errors = dict(
+        (k, e.message) for k, e in (form._named_errors or {}).items())
+    return (valid, values, errors, form.cleaned_data,
+            sorted(form.changed_fields))
+
+
+def test_compiled_forms_behave_the_same():
+    Form, CompiledForm = make_forms()
+    obj = {'code': u'abc', 'age': 40}
+    for data in DATA:
+        assert summary(Form(data, obj=obj)) == \
+            summary(CompiledForm(data, obj=obj))
+    assert CompiledForm._compiled is not None
+    assert COMPILE_ALL or Form._compiled is None
+
+
+def test_generated_source():
+    Form, _ = make_forms()
+    compiled = compile_form(Form)
+    # The order of the fields depends on the class dict (Python 2)
+    index = dict(
+        (entry[0], i) for i, entry in enumerate(get_plan(Form).fields))
+    assert 'def load_fields(form, data, obj, files):' in compiled.source
+    assert 'def validate_fields(' in compiled.source
+    # Validators are unrolled, and the form validators kept apart
+    assert 'if not V%i_0(py_value, form):' % index['name'] in compiled.source
+    assert 'if not FV%i_0(cleaned_data, form):' % index['password2'] in \
+        compiled.source
+    # The hooks are called directly
+    assert 'P%i(form, obj_value, locale=locale, tz=tz)' % index['email'] in \
+        compiled.source
+    assert 'C%i(form, py_value)' % index['name'] in compiled.source
+    # Fields with their own loading methods are not inlined
+    assert 'field.load_data(getlist(pname)' in compiled.source
+
+
+def test_cache_dir(tmpdir):
+    from solution import compiler
+
+    Form, CompiledForm = make_forms()
+    compiler.set_cache_dir(str(tmpdir))
+    try:
+        compiled = compile_form(CompiledForm)
+        files = tmpdir.listdir()
+        assert len(files) == 1
+
+        key = compiler.fingerprint(CompiledForm)
+        cached = compiler.load_cached(CompiledForm, key)
+        assert cached is not None
+        assert cached.source == compiled.source
+        # Nothing is generated on a hit
+        generate = compiler.generate
+        compiler.generate = None
+        try:
+            assert compile_form(CompiledForm).source == compiled.source
+        finally:
+            compiler.generate = generate
+        # A new class with the same structure reuses the same file
+        Form2, CompiledForm2 = make_forms()
+        assert compiler.get_compiled(CompiledForm2) is not None
+        assert len(tmpdir.listdir()) == 1
+        form = CompiledForm2({'name': u'john doe', 'password': u'x',
+                              'password2': u'x'})
+        assert form.is_valid()
+        assert form.cleaned_data['name'] == u'John Doe'
+
+        # A change in the structure makes a new file
+        CompiledForm2.phone = f.Text(validate=[f.Required])
+        compile_form(CompiledForm2)
+        assert len(tmpdir.listdir()) == 2
+
+        # A corrupted file is ignored
+        files[0].write('garbage')
+        assert compile_form(CompiledForm).source == compiled.source
+    finally:
+        compiler.set_cache_dir(None)
+
+
+def test_fields_validating_relations():
+
+    class Confirm(f.Text):
+        def validate(self, form=None, cleaned_data=None, **kwargs):
+            if cleaned_data is None:
+                return super(Confirm, self).validate(form, **kwargs)
+            if cleaned_data.get('confirm') != cleaned_data.get('password'):
+                self.error = f.ValidationError(u'Not the same')
+
+    class Form(f.Form):
+        password = f.Text()
+        confirm = Confirm()
+
+    class CompiledForm(Form):
+        _compile = True
+
+    for form_class in (Form, CompiledForm):
+        form = form_class({'password': u'a', 'confirm': u'b'})
+        assert not form.is_valid()
+        assert form._errors['confirm'].message == u'Not the same'
+        assert form_class({'password': u'a', 'confirm': u'a'}).is_valid()
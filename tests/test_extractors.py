@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+from sqlalchemy_wrapper import SQLAlchemy
+import solution as f
+from solution.extractors import extract_values, get_extractor
+
+
+class MyForm(f.Form):
+    a = f.Text()
+    b = f.Text()
+    c = f.Number(type=int)
+
+
+class Obj(object):
+
+    def __init__(self, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+
+def test_extract_values():
+    assert extract_values(MyForm, None) == (None, None, None)
+    assert extract_values(MyForm, {'a': u'A', 'c': 3}) == (u'A', None, 3)
+    obj = Obj(a=u'A', b=u'B', c=3)
+    assert extract_values(MyForm, obj) == (u'A', u'B', 3)
+    obj = Obj(b=u'B')
+    assert extract_values(MyForm, obj) == (None, u'B', None)
+    assert get_extractor(MyForm, Obj) is get_extractor(MyForm, Obj)
+
+
+def test_extract_single_field():
+
+    class OneForm(f.Form):
+        a = f.Text()
+
+    assert extract_values(OneForm, Obj(a=u'A')) == (u'A',)
+    form = OneForm(obj=Obj(a=u'A'))
+    assert form.a.value == u'A'
+
+
+def test_extract_mapped():
+    db = SQLAlchemy()
+
+    class Thing(db.Model):
+        __tablename__ = 'things'
+        id = db.Column(db.Integer, primary_key=True)
+        a = db.Column(db.String)
+        b = db.Column(db.String)
+
+        @property
+        def c(self):
+            return 3
+
+    db.create_all()
+    db.add(Thing(a=u'A', b=u'B'))
+    db.commit()
+    thing = db.query(Thing).first()
+    db.session.expire(thing, ['b'])
+    assert 'b' not in thing.__dict__
+    assert extract_values(MyForm, thing) == (u'A', u'B', 3)
+
+    form = MyForm(obj=thing)
+    assert (form.a.value, form.b.value, form.c.value) == (u'A', u'B', u'3')
+
+
+def test_register_extractor():
+
+    class Row(tuple):
+        pass
+
+    @f.register_extractor
+    def row_extractor(obj_type, names):
+        if not issubclass(obj_type, Row):
+            return None
+        return lambda row: tuple(row[:len(names)])
+
+    try:
+        form = MyForm(obj=Row((u'A', u'B', 3)))
+        assert form.b.value == u'B'
+    finally:
+        from solution import extractors
+        extractors._factories.remove(row_extractor)
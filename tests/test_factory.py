@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+
+import solution as f
+from solution import factory
+
+
+SCHEMA = {
+    'name': 'TenantForm',
+    'fields': [
+        {'name': 'email', 'field': 'Text',
+         'validate': ['Required', 'ValidEmail']},
+        {'name': 'age', 'field': 'Number', 'type': 'int',
+         'validate': [{'validator': 'InRange', 'args': [18, 99],
+                       'message': u'Too young'}]},
+        {'name': 'color', 'field': 'Select', 'type': 'int',
+         'items': [[1, u'Red'],
+                   {'label': u'Others', 'items': [[2, u'Blue']]}]},
+        {'name': 'address', 'form': {'fields': [{'name': 'city'}]}},
+        {'name': 'lines', 'formset': {
+            'name': 'LineForm',
+            'fields': [{'name': 'qty', 'field': 'Number', 'type': 'int'}],
+        }},
+    ],
+}
+
+
+def test_build_form():
+    factory.clear_cache()
+    TenantForm = f.build_form(SCHEMA)
+    assert TenantForm.__name__ == 'TenantForm'
+    assert issubclass(TenantForm, f.Form)
+
+    form = TenantForm({
+        'email': u'a@example.com',
+        'age': u'30',
+        'color': u'2',
+        'address.city': u'Lima',
+        'lineform.1-qty': u'3',
+    })
+    assert form.is_valid()
+    assert form.cleaned_data == {'email': u'a@example.com', 'age': 30,
+                                 'color': 2}
+    assert form.address.city.value == u'Lima'
+    assert list(form.lines)[0].cleaned_data == {'qty': 3}
+    assert u'<optgroup label="Others">' in form.color.as_select()
+
+    form = TenantForm({'email': u'a@example.com', 'age': u'3'})
+    assert not form.is_valid()
+    assert form.age.error.message == u'Too young'
+
+
+def test_build_form_cache():
+    factory.clear_cache()
+    form_class = f.build_form(SCHEMA)
+    source = json.dumps(SCHEMA)
+    from_json = f.build_form(source)
+    assert from_json is form_class
+    assert f.build_form(json.dumps(SCHEMA, indent=4)) is form_class
+    assert f.build_form(source.encode('utf8')) is form_class
+    assert f.build_form(dict(SCHEMA)) is form_class
+    assert f.build_form(SCHEMA, base=f.Form) is form_class
+
+    other = dict(SCHEMA, name='OtherForm')
+    assert f.build_form(other) is not form_class
+
+
+def test_build_form_lru(monkeypatch):
+    factory.clear_cache()
+    monkeypatch.setattr(factory, 'CACHE_SIZE', 2)
+    schemas = [{'name': 'F%i' % i, 'fields': [{'name': 'a'}]}
+               for i in range(3)]
+    first = f.build_form(schemas[0])
+    f.build_form(schemas[1])
+    assert f.build_form(schemas[0]) is first
+    f.build_form(schemas[2])
+    assert len(factory._cache) == 2
+    # The least recently used was the second one
+    assert f.build_form(schemas[0]) is first
+
+
+def test_build_form_unknown():
+    with pytest.raises(ValueError):
+        f.build_form({'fields': [{'name': 'a', 'field': 'Nope'}]})
+    with pytest.raises(ValueError):
+        f.build_form({'fields': [{'name': 'a', 'validate': ['Nope']}]})
+    with pytest.raises(ValueError):
+        f.build_form({'fields': [{'name': 'a', 'type': 'nope'}]})
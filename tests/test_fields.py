@@ -326,3 +326,92 @@ def test_validate_file():
     assert field.validate() == u'file data'
     assert not field.error
 
+
+def test_bound_field_own_attributes():
+
+    class Tracking(f.Text):
+        def load_data(self, *args, **kwargs):
+            self.loaded = True
+            return super(Tracking, self).load_data(*args, **kwargs)
+
+        def validate(self, *args, **kwargs):
+            self.validated = True
+            return super(Tracking, self).validate(*args, **kwargs)
+
+    class MyForm(f.Form):
+        a = Tracking()
+
+    form1 = MyForm({'a': u'foo'})
+    form2 = MyForm()
+    assert form1.is_valid()
+    assert form1.a.loaded and form1.a.validated
+    assert form1.a.value == u'foo'
+    # Stored in the bound field, not in the spec
+    assert not hasattr(form2.a, 'validated')
+    assert 'loaded' not in MyForm.a.__dict__
+
+
+def test_bound_classes_are_shared():
+
+    class MyForm(f.Form):
+        a = f.Text()
+        b = f.Text()
+        c = f.Text()
+
+    MyForm.c.to_string = lambda **kwargs: u'hidden'
+    form = MyForm({'a': u'foo', 'c': u'bar'})
+    # One class for each field class, not for each field
+    assert type(form.a) is type(form.b)
+    # except for the fields that overwrite its methods
+    assert type(form.c) is not type(form.a)
+    assert form.c.to_string() == u'hidden'
+    assert form.a.to_string() == u'foo'
+
+
+def test_bound_field_sees_spec_changes():
+
+    class MyForm(f.Form):
+        a = f.Text()
+
+    form = MyForm({'a': u'foo'})
+    assert form.a.to_string() == u'foo'
+    MyForm.a.hide_value = True
+    try:
+        assert MyForm({'a': u'foo'}).a.to_string() == u''
+        assert form.a.to_string() == u''
+    finally:
+        MyForm.a.hide_value = False
+
+
+def test_bound_field():
+
+    class MyText(f.Text):
+        def as_input(self, **kwargs):
+            kwargs.setdefault('classes', u'my')
+            return super(MyText, self).as_input(**kwargs)
+
+    class MyForm(f.Form):
+        a = MyText(validate=[f.Required])
+        b = f.Boolean()
+
+    form1 = MyForm({'a': u'foo'})
+    form2 = MyForm({'b': u'1'})
+
+    assert isinstance(form1.a, f.BoundField)
+    assert isinstance(form1.a, MyText)
+    assert isinstance(form1.b, f.Boolean)
+    assert form1.a.field is MyForm.a
+    assert type(form1.a).__name__ == 'BoundMyText'
+    assert form1.a.__dict__ == {}
+    assert MyForm.a.str_value is None
+
+    assert form1.a.value == u'foo'
+    assert form2.a.value == u''
+    assert form1.a() == (u'<input class="my" name="a" type="text" '
+                         u'value="foo" required>')
+    assert form2.b() == u'<input name="b" type="checkbox" checked>'
+
+    assert form1.a.validate() == u'foo'
+    assert form2.a.validate() is None
+    assert form2.a.error.message == f.Required.message
+    assert form1.a.error is None
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import io
+import mmap
+import struct
+import tempfile
+
+import solution as f
+from solution.body import BodyFile
+from solution.filetypes import get_image_size, guess_type, open_header
+from solution.uploads import SpooledUpload
+
+
+PNG = (b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + b'IHDR' +
+       struct.pack('>II', 640, 480) + b'\x08\x02\x00\x00\x00')
+GIF = b'GIF89a' + struct.pack('<HH', 32, 16) + b'\x00' * 8
+BMP = b'BM' + b'\x00' * 16 + struct.pack('<ii', 100, -50) + b'\x00' * 8
+# An EXIF segment bigger than the bounded header before the frame
+JPEG = (b'\xff\xd8' + b'\xff\xe1' + struct.pack('>H', 60002) +
+        b'\x00' * 60000 + b'\xff\xc0' + struct.pack('>HBHH', 17, 8, 600, 800)
+        + b'\x00' * 16)
+WEBP_LOSSY = (b'RIFF\x00\x00\x00\x00WEBPVP8 ' + b'\x00' * 10 +
+              struct.pack('<HH', 300, 200))
+WEBP_LOSSLESS = (b'RIFF\x00\x00\x00\x00WEBPVP8L\x00\x00\x00\x00\x2f' +
+                 struct.pack('<I', (300 - 1) | (200 - 1) << 14))
+WEBP_EXTENDED = (b'RIFF\x00\x00\x00\x00WEBPVP8X' + b'\x00' * 8 +
+                 b'\x2b\x01\x00\xc7\x00\x00')
+
+
+def test_guess_type():
+    assert guess_type(PNG) == 'png'
+    assert guess_type(JPEG) == 'jpeg'
+    assert guess_type(GIF) == 'gif'
+    assert guess_type(BMP) == 'bmp'
+    assert guess_type(WEBP_LOSSY) == 'webp'
+    assert guess_type(b'%PDF-1.7\n') == 'pdf'
+    assert guess_type(b'PK\x03\x04') == 'zip'
+    assert guess_type(b'<html>') is None
+    assert guess_type(b'') is None
+
+
+def test_get_image_size():
+    assert get_image_size(PNG) == (640, 480)
+    assert get_image_size(GIF) == (32, 16)
+    assert get_image_size(BMP) == (100, 50)
+    assert get_image_size(JPEG) == (800, 600)
+    assert get_image_size(memoryview(JPEG)) == (800, 600)
+    assert get_image_size(WEBP_LOSSY) == (300, 200)
+    assert get_image_size(WEBP_LOSSLESS) == (300, 200)
+    assert get_image_size(WEBP_EXTENDED) == (300, 200)
+    assert get_image_size(PNG[:20]) is None
+    assert get_image_size(JPEG[:1000]) is None
+    assert get_image_size(b'%PDF-1.7') is None
+
+
+def test_open_header():
+    stream = io.BytesIO(PNG + b'\x00' * 100000)
+    stream.seek(10)
+    with open_header(stream) as header:
+        assert len(header) == 64 * 1024
+    assert stream.tell() == 10
+
+    # A big file on disk is memory-mapped, not read
+    with tempfile.TemporaryFile() as disk_file:
+        disk_file.write(JPEG)
+        disk_file.seek(20 * 1024 * 1024)
+        disk_file.write(b'\xff\xd9')
+        with open_header(disk_file) as header:
+            assert isinstance(header, mmap.mmap)
+            assert get_image_size(header) == (800, 600)
+
+    # The spooled files in memory are not moved to disk
+    upload = SpooledUpload.from_file(PNG)
+    with open_header(upload) as header:
+        assert bytes(header) == PNG
+    assert upload.in_memory
+
+    upload = SpooledUpload.from_file(JPEG, max_memory=1024)
+    with open_header(upload) as header:
+        assert isinstance(header, mmap.mmap)
+
+    with open_header(BodyFile('a', 'a.png', None, memoryview(PNG))) as header:
+        assert isinstance(header, memoryview)
+
+    with open_header(tempfile.TemporaryFile()) as header:
+        assert header == b''
+
+
+def test_file_validators():
+    class ImageForm(f.Form):
+        image = f.File(validate=[f.FileType('png', 'jpeg'),
+                                 f.ImageSize(max_width=1000, min_height=100)])
+
+    def bind(content):
+        return ImageForm(files={
+            'image': BodyFile('image', 'a', None, memoryview(content))})
+
+    assert bind(PNG).is_valid()
+    assert bind(JPEG).is_valid()
+    form = bind(GIF)
+    assert not form.is_valid()
+    assert form.image.error.message == u'The file must be of type png, jpeg.'
+    assert not bind(PNG[:20]).is_valid()
+    assert not bind(PNG.replace(struct.pack('>II', 640, 480),
+                                struct.pack('>II', 2000, 480))).is_valid()
+    assert ImageForm().is_valid()
+    # A text value instead of a file
+    form = ImageForm({'image': u'abc'})
+    assert not form.is_valid()
+    assert form.image.error.message == u'The file must be of type png, jpeg.'
+    assert not f.ImageSize()(u'abc')
+
+    assert f.FileType('pdf')(io.BytesIO(b'%PDF-1.4'))
+    assert f.FileType('pdf')(None)
+    assert not f.ImageSize()(io.BytesIO(b'%PDF-1.4'))
@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 from __future__ import print_function
+import gc
+import weakref
 
+import pytest
 from sqlalchemy_wrapper import SQLAlchemy
 import solution as f
+from solution.plan import get_plan
 
 
 class ContactForm(f.Form):
@@ -75,6 +79,26 @@ def test_is_valid():
     print(form._errors)
     assert form.is_valid()
     assert not form._errors
+    assert form._errors.get('subject') is None
+    assert 'subject' not in form._named_errors
+
+
+def test_assign_containers():
+    form = ContactForm()
+    error = f.ValidationError(u'Nope')
+    form._errors = {'subject': error}
+    form._named_errors = {'subject': error}
+    assert form._errors['subject'] is error
+    assert form._named_errors['subject'] is error
+
+    fields = dict(form._fields)
+    form._fields = {}
+    assert list(form) == []
+    form._fields = fields
+    assert form.subject is fields['subject']
+    form._forms = {}
+    form._sets = {}
+    assert form._forms == form._sets == {}
 
 
 def test_empty_data():
@@ -645,3 +669,559 @@ def test_form_data_prepare_and_clean():
 
     cleaned_data = form.save()
     assert cleaned_data == {'message': u'Hello World. Welcome'}
+
+
+def test_declarations_are_collected_once():
+
+    class BaseForm(f.Form):
+        a = f.Text()
+        b = f.Text()
+
+    class MyForm(BaseForm):
+        b = None
+        c = f.Text()
+        sub = ContactForm()
+        lines = f.FormSet(ContactForm)
+
+        @property
+        def boom(self):
+            raise AssertionError('properties must not be evaluated')
+
+    assert list(MyForm._declared_fields) == ['a', 'c']
+    assert list(MyForm._declared_forms) == ['sub']
+    assert list(MyForm._declared_sets) == ['lines']
+
+    form = MyForm({
+        'a': u'A', 'c': u'C',
+        'sub.subject': u'Hi', 'sub.message': u'Hello',
+    })
+    assert sorted(form._fields) == ['a', 'c']
+    assert form.sub.subject.value == u'Hi'
+    assert form.is_valid()
+    assert form.cleaned_data == {'a': u'A', 'c': u'C'}
+
+
+def test_declarations_updated_at_runtime():
+
+    class BaseForm(f.Form):
+        a = f.Text()
+
+    class MyForm(BaseForm):
+        pass
+
+    BaseForm.b = f.Text()
+    assert list(MyForm._declared_fields) == ['a', 'b']
+    del BaseForm.b
+    assert list(MyForm._declared_fields) == ['a']
+
+
+def test_binding_plan_is_cached():
+
+    class MyForm(f.Form):
+        a = f.Text()
+        b = f.Text(prepare=lambda v, **kw: u'own')
+
+        def prepare_a(self, obj_value, **kwargs):
+            return u'hook'
+
+        def prepare_b(self, obj_value, **kwargs):
+            return u'ignored'
+
+    class WrapForm(f.Form):
+        sub = MyForm()
+        rows = f.FormSet(MyForm)
+
+    data = {
+        'sub.a': u'A',
+        'myform.1-a': u'1',
+        'myform.2-a': u'2',
+    }
+    form1 = WrapForm(data)
+    form2 = WrapForm({'x-sub.a': u'X'}, prefix='x')
+    assert form1._plan is form2._plan
+    assert form1.sub._plan is MyForm._binding_plan
+    assert form2.sub.a.value == u'X'
+
+    # One plan for all the rows, whatever their number
+    rows = list(form1.rows)
+    assert len(rows) == 2
+    assert rows[0]._plan is rows[1]._plan is form1.sub._plan
+    assert [row.a.name for row in rows] == [u'myform.1-a', u'myform.2-a']
+    assert [row.a.value for row in rows] == [u'1', u'2']
+
+    assert form1.sub.a.prepare(None) == u'hook'
+    assert form1.sub.b.prepare(None) == u'own'
+    assert form1.sub.a.value == u'A'
+
+
+def test_lazy_children():
+
+    class AddressForm(f.Form):
+        email = f.Text(validate=[f.ValidEmail])
+
+    class CustomerForm(f.Form):
+        name = f.Text(validate=[f.Required])
+        addresses = f.FormSet(AddressForm)
+
+    class OrderForm(f.Form):
+        code = f.Text()
+        customer = CustomerForm()
+
+    data = {
+        'code': u'X1',
+        'customer.name': u'John',
+        'customer.addressform.1-email': u'one@example.com',
+        'customer.addressform.2-email': u'not an email',
+    }
+
+    lazy = OrderForm(data, lazy=True)
+    assert not lazy._forms
+    assert lazy.code.value == u'X1'
+    customer = lazy.customer
+    assert isinstance(customer, CustomerForm)
+    assert lazy.customer is customer
+    assert not customer._sets
+    assert len(customer.addresses) == 2
+    assert OrderForm.customer is not customer
+
+    eager = OrderForm(data)
+    assert eager._forms
+    lazy = OrderForm(data, lazy=True)
+    assert lazy.is_valid() is eager.is_valid() is False
+    assert list(lazy._errors) == list(eager._errors) == ['customer']
+    lazy_errors = [(k, e.message) for k, e in lazy._named_errors.items()]
+    eager_errors = [(k, e.message) for k, e in eager._named_errors.items()]
+    assert lazy_errors == eager_errors
+    assert lazy_errors[0][0] == 'customer.addressform.2-email'
+
+
+def test_lazy_class_attribute():
+
+    class SubForm(f.Form):
+        a = f.Text()
+
+    class MyForm(f.Form):
+        _lazy = True
+        sub = SubForm()
+
+    form = MyForm({'sub.a': u'A'})
+    assert not form._forms
+    assert form.save() == {'sub': {'a': u'A'}}
+
+
+def test_rebind():
+
+    class LineForm(f.Form):
+        qty = f.Number(type=int)
+
+    class OrderForm(f.Form):
+        code = f.Text(validate=[f.Required])
+        sub = ContactForm()
+        lines = f.FormSet(LineForm)
+
+    form = OrderForm({
+        'code': u'A',
+        'lineform.1-qty': u'1',
+        'lineform.2-qty': u'2',
+    })
+    assert not form.is_valid()
+    code, sub, lines = form.code, form.sub, form.lines
+    line1 = list(lines)[0]
+
+    form.rebind({
+        'code': u'B',
+        'sub.subject': u'Hi',
+        'sub.message': u'Hello',
+        'lineform.1-qty': u'10',
+    })
+    assert form.code is code and form.sub is sub and form.lines is lines
+    assert list(form.lines) == [line1]
+    assert not form._errors
+    assert form.is_valid()
+    assert form.cleaned_data == {'code': u'B'}
+    assert line1.cleaned_data == {'qty': 10}
+
+    form.rebind(obj={'code': u'C'})
+    assert form.code.value == u'C'
+    assert form.sub.subject.value == u''
+    assert len(form.lines) == 0
+
+
+def test_form_pool():
+
+    class MyForm(f.Form):
+        a = f.Text(validate=[f.Required])
+
+    form = MyForm.acquire({'a': u'1'})
+    assert form.is_valid()
+    form.release()
+    assert form._obj is None
+    assert form.a.str_value is None
+
+    form2 = MyForm.acquire({'a': u'2'})
+    assert form2 is form
+    assert form2.is_valid()
+    assert form2.cleaned_data == {'a': u'2'}
+    assert MyForm.acquire() is not form
+    form2.release()
+
+    class LazyForm(f.Form):
+        _lazy = True
+        a = f.Text()
+        sub = MyForm()
+        rows = f.FormSet(MyForm)
+
+    form = LazyForm.acquire({'a': u'1', 'sub.a': u'2'})
+    assert form.sub.a.value == u'2'
+    form.release()
+    # Only the sub-form used is cleared; the form set isn't constructed
+    assert form._source is None
+    assert list(form._forms) == ['sub']
+    assert not form._sets
+    assert form.sub.a.str_value is None
+    form = LazyForm.acquire({'myform.1-a': u'3'})
+    assert [row.a.value for row in form.rows] == [u'3']
+    form.release()
+
+    pool = f.FormPool(MyForm, size=1)
+    with pool.form({'a': u'3'}) as form3:
+        assert form3.a.value == u'3'
+    with pool.form() as form4:
+        assert form4 is form3
+        assert not form4.is_valid()
+
+
+def test_no_reference_cycles():
+
+    class LineForm(f.Form):
+        qty = f.Number(type=int, validate=[f.Required])
+
+    class OrderForm(f.Form):
+        code = f.Text(validate=[f.Required])
+        contact = ContactForm()
+        lines = f.FormSet(LineForm)
+
+        def clean_code(self, py_value, **kwargs):
+            if py_value == u'bad':
+                raise f.ValidationError(u'Bad code')
+            return py_value
+
+    def request(data):
+        form = OrderForm(data)
+        form.is_valid()
+        for field in form:
+            field()
+        if form.validated:
+            form.save()
+        return weakref.ref(form)
+
+    gc.collect()
+    gc.disable()
+    gc.set_debug(gc.DEBUG_SAVEALL)
+    try:
+        valid = request({
+            'code': u'A1',
+            'contact.subject': u'Hi',
+            'contact.message': u'Hello',
+            'lineform.1-qty': u'1',
+            'lineform.2-qty': u'2',
+        })
+        invalid = request({
+            'code': u'bad',
+            'lineform.1-qty': u'x',
+        })
+        # Freed by refcounting, without waiting for the cyclic GC
+        assert valid() is None
+        assert invalid() is None
+        gc.collect()
+        garbage = [obj for obj in gc.garbage if isinstance(obj, f.Form)]
+        assert garbage == []
+    finally:
+        gc.set_debug(0)
+        del gc.garbage[:]
+        gc.enable()
+
+
+def test_partial():
+
+    class LineForm(f.Form):
+        qty = f.Number(type=int, validate=[f.Required])
+
+    class ItemForm(f.Form):
+        name = f.Text(validate=[f.Required])
+        email = f.Text(validate=[f.ValidEmail])
+        phone = f.Text(validate=[f.Required])
+        contact = ContactForm()
+        lines = f.FormSet(LineForm)
+
+    obj = {
+        'name': u'Old',
+        'email': u'old@example.com',
+        'phone': u'',
+        'contact': {'subject': u'Hi', 'message': u'Hello'},
+        'lines': [{'qty': 1}, {'qty': 2}],
+    }
+    form = ItemForm({'name': u'New', 'lineform.2-qty': u'5'}, obj=obj,
+                    partial=True)
+    assert form._submitted == ['name']
+    assert 'contact' not in (form._forms or {})
+    # `phone` is required but wasn't submitted
+    assert form.is_valid()
+    assert form.cleaned_data == {'name': u'New'}
+
+    data = form.save()
+    assert data['name'] == u'New'
+    assert data['email'] == u'old@example.com'
+    assert data['contact'] == obj['contact']
+    assert data['lines'] == [{'qty': 1}, {'qty': 5}]
+
+    form = ItemForm({'email': u'invalid'}, obj=obj, partial=True)
+    assert not form.is_valid()
+    assert list(form._errors) == ['email']
+
+    form = ItemForm({'name': u'New', 'lineform.2-qty': u'5'}, obj=obj,
+                    partial=True)
+    # Not submitted: bound only to the object, per instance
+    assert form.contact is not ItemForm.contact
+    assert form.contact is form.contact
+    assert form.contact.subject.value == u'Hi'
+    assert 'contact' not in (form._forms or {})
+    assert form.is_valid()
+    assert 'contact' not in form.changed_fields
+    assert form.save()['contact'] == obj['contact']
+    # The rows that aren't partial don't store it
+    form = ItemForm({'name': u'New'}, obj=obj)
+    assert [row.__dict__ for row in form.lines] == [{}, {}]
+
+    form = ItemForm({'name': u'New'}, obj=obj, partial=True, lazy=True)
+    assert form.contact.message.value == u'Hello'
+    assert [row.qty.value for row in form.lines] == [u'1', u'2']
+    assert form.is_valid()
+    assert form.save()['lines'] == obj['lines']
+
+    form = ItemForm({'name': u'New'}, obj=obj)
+    assert not form.is_valid()
+
+
+def test_nested_prefixes():
+
+    class OptionForm(f.Form):
+        name = f.Text()
+
+    class LineForm(f.Form):
+        qty = f.Number(type=int)
+        options = f.FormSet(OptionForm)
+
+    class OrderForm(f.Form):
+        code = f.Text()
+        lines = f.FormSet(LineForm)
+
+    data = {'code': u'A'}
+    for i in range(1, 4):
+        data['lineform.%i-qty' % i] = str(i)
+        for j in range(1, i + 1):
+            data['lineform.%i-optionform.%i-name' % (i, j)] = u'o%i' % j
+
+    form = OrderForm(data)
+    lines = list(form.lines)
+    assert len(lines) == 3
+    assert [len(line.options) for line in lines] == [1, 2, 3]
+    assert form.is_valid()
+    assert lines[2].cleaned_data['qty'] == 3
+    assert list(lines[2].options)[2].name.value == u'o3'
+
+
+def test_conditional_fields():
+
+    class CompanyForm(f.Form):
+        tax_id = f.Text(validate=[f.Required])
+
+    class LineForm(f.Form):
+        qty = f.Number(type=int, validate=[f.Required])
+
+    class SignupForm(f.Form):
+        name = f.Text(validate=[f.Required])
+        is_company = f.Boolean()
+        company_name = f.Text(validate=[f.Required], when='is_company')
+        company = CompanyForm(when='is_company')
+        kind = f.Text()
+        lines = f.FormSet(LineForm, when={'kind': u'bulk'})
+        note = f.Text(when=lambda data: data.get('name') == u'Jane')
+
+    form = SignupForm({'name': u'John', 'lineform.1-qty': u'x'})
+    assert form.is_valid()
+    assert form.cleaned_data == {'name': u'John', 'is_company': False,
+                                 'kind': None}
+    assert sorted(form._inactive) == ['company', 'company_name', 'lines',
+                                      'note']
+    data = form.save()
+    assert 'company' not in data and 'lines' not in data
+
+    form = SignupForm({'name': u'Jane', 'is_company': u'1', 'note': u'Hi'})
+    assert not form.is_valid()
+    assert sorted(form._errors) == ['company', 'company_name']
+
+    form = SignupForm({
+        'name': u'Jane',
+        'is_company': u'1',
+        'company_name': u'ACME',
+        'company.tax_id': u'123',
+        'kind': u'bulk',
+        'lineform.1-qty': u'2',
+    }, lazy=True)
+    assert form.is_valid()
+    assert form.cleaned_data['company_name'] == u'ACME'
+    data = form.save()
+    assert data['company'] == {'tax_id': u'123'}
+    assert data['lines'] == [{'qty': 2}]
+
+
+def test_conditional_lazy_children_not_bound():
+
+    class SubForm(f.Form):
+        a = f.Text(validate=[f.Required])
+
+    class MyForm(f.Form):
+        _lazy = True
+        flag = f.Boolean()
+        sub = SubForm(when='flag')
+
+    form = MyForm({})
+    assert form.is_valid()
+    assert not form._forms
+    form.save()
+    assert not form._forms
+
+
+def test_conditions_depending_on_conditional_fields():
+
+    class MyForm(f.Form):
+        b = f.Text(when='a')
+        a = f.Text(when='c')
+        c = f.Text()
+
+    assert list(get_plan(MyForm).conditions) == ['a', 'b']
+    form = MyForm({'c': u'1', 'a': u'y', 'b': u'z'})
+    assert form.is_valid()
+    assert form.cleaned_data == {'a': u'y', 'b': u'z', 'c': u'1'}
+
+    form = MyForm({'a': u'y', 'b': u'z'})
+    assert form.is_valid()
+    assert form.cleaned_data == {'c': None}
+
+    class CycleForm(f.Form):
+        a = f.Text(when='b')
+        b = f.Text(when={'a': u'x'})
+
+    with pytest.raises(ValueError):
+        CycleForm()
+
+
+def test_partial_with_conditions():
+
+    class MyForm(f.Form):
+        name = f.Text(validate=[f.Required])
+        flag = f.Boolean()
+        extra = f.Text(when='flag')
+
+    form = MyForm({'other': u'x'}, obj={'name': u'Old'}, partial=True)
+    assert form.is_valid()
+    assert form.cleaned_data == {}
+
+    form = MyForm({'flag': u'1', 'extra': u'e'}, obj={'name': u'Old'},
+                  partial=True)
+    assert form.is_valid()
+    assert form.cleaned_data == {'flag': True, 'extra': u'e'}
+
+
+def test_from_json():
+    class LineForm(f.Form):
+        qty = f.Number(type=int, validate=[f.Required])
+        gift = f.Boolean()
+
+    class AddressForm(f.Form):
+        city = f.Text()
+
+    class OrderForm(f.Form):
+        code = f.Text(validate=[f.Required])
+        tags = f.MultiSelect(items=[(u'a', u'A'), (u'b', u'B')])
+        address = AddressForm()
+        lines = f.FormSet(LineForm)
+
+    data = {
+        'code': u'A1',
+        'tags': [u'a', u'b'],
+        'address': {'city': u'Lima'},
+        'lines': [{'qty': 2, 'gift': True}, {'qty': 3}, {'qty': 4}],
+        'unknown': {'code': u'X'},
+    }
+    form = OrderForm.from_json(data)
+    assert form.is_valid()
+    assert form.cleaned_data['code'] == u'A1'
+    assert form.cleaned_data['tags'] == [u'a', u'b']
+    assert form.address.cleaned_data['city'] == u'Lima'
+    assert [line.cleaned_data['qty'] for line in form.lines] == [2, 3, 4]
+    assert [line.cleaned_data['gift'] for line in form.lines] == \
+        [True, False, False]
+    # The rendered names are still the flat ones
+    assert list(form.lines)[1].qty.name == u'lineform.2-qty'
+
+    form = OrderForm.from_json(
+        b'{"code": "B", "lines": [{"qty": 1}, {"qty": null}]}',
+        prefix=u'order')
+    assert not form.is_valid()
+    assert list(form._errors['lines']) == [2]
+    assert not form.address.city.value
+
+    form = OrderForm.from_json({'code': u'C', 'lines': []})
+    assert form.is_valid()
+    assert len(form.lines) == 0
+
+    # A `null` item is an empty row, not the end of the list
+    form = OrderForm.from_json(
+        {'code': u'D', 'lines': [{'qty': 1}, None, {'qty': 3}]})
+    assert len(form.lines) == 3
+    assert [line.qty.value for line in form.lines] == [u'1', u'', u'3']
+    assert not form.is_valid()
+    assert list(form._errors['lines']) == [2]
+
+
+def test_from_json_with_objects():
+    class LineForm(f.Form):
+        qty = f.Number(type=int)
+
+    class OrderForm(f.Form):
+        code = f.Text()
+        lines = f.FormSet(LineForm)
+
+    obj = {'code': u'A', 'lines': [{'qty': 1}, {'qty': 2}]}
+    form = OrderForm.from_json({'lines': [{'qty': 5}, {}, {'qty': 7}]},
+                               obj=obj, partial=True)
+    assert form.is_valid()
+    assert 'code' not in form.cleaned_data
+    assert [line.cleaned_data.get('qty') for line in form.lines] == \
+        [5, None, 7]
+
+    lines = f.FormSet(LineForm, data=[{'qty': 8}, {'qty': 9}])
+    assert lines.is_valid()
+    assert [line.cleaned_data['qty'] for line in lines] == [8, 9]
+
+
+def test_fields_outliving_their_form():
+
+    class MyForm(f.Form):
+        email = f.Text()
+        name = f.Text()
+
+        def clean_email(self, py_value, **kwargs):
+            return py_value.upper()
+
+    form = MyForm({'email': u'a', 'name': u'b'})
+    assert form.email.validate() == u'A'
+
+    email = MyForm({'email': u'a'}).email
+    with pytest.raises(ReferenceError):
+        email.validate()
+    # The fields without form hooks don't need it
+    name = MyForm({'name': u'b'}).name
+    assert name.validate() == u'b'
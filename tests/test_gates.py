@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+import threading
+
+import solution as f
+from solution.gates import get_stats, reset_stats
+
+
+class ContactForm(f.Form):
+    _gates = [f.Honeypot('website'), f.RequireKeys('token'), f.MaxKeys(4)]
+
+    email = f.Text(validate=[f.Required])
+    message = f.Text()
+
+
+def test_gates():
+    reset_stats(ContactForm)
+    form = ContactForm({'email': u'a@example.com', 'token': u'x'})
+    assert form.rejected is None
+    assert form.is_valid()
+
+    form = ContactForm({'email': u'a@example.com', 'token': u'x',
+                        'website': u'http://spam.example.com'})
+    assert isinstance(form.rejected, f.Honeypot)
+    assert not form.is_valid()
+    # The fields are not constructed until used, and then they are empty
+    assert not form._fields
+    assert list(form) == []
+    assert form.email is not ContactForm.email
+    assert form.email.name == u'email'
+    assert form.email.value == u''
+    form.email.error = f.ValidationError(u'x')
+    assert ContactForm.email.error is None
+
+    form = ContactForm({'email': u'a@example.com'})
+    assert isinstance(form.rejected, f.RequireKeys)
+    form = ContactForm({'email': u'a', 'token': u'x', 'a': u'', 'b': u''},
+                       files={'c': object()})
+    assert isinstance(form.rejected, f.MaxKeys)
+
+    # An empty form is not checked
+    form = ContactForm()
+    assert form.rejected is None
+    assert form.email.name == u'email'
+
+    stats = get_stats(ContactForm)
+    assert stats.checked == 4
+    assert stats.total_rejected == 3
+    assert stats.as_dict() == {
+        'checked': 4,
+        'rejected': {'Honeypot': 1, 'RequireKeys': 1, 'MaxKeys': 1},
+    }
+
+
+def test_gates_prefix_and_rebind():
+    reset_stats(ContactForm)
+    form = ContactForm({'c-website': u'spam', 'c-token': u'x'}, prefix=u'c')
+    assert form.rejected is not None
+
+    form.rebind({'c-email': u'a@example.com', 'c-token': u'x'})
+    assert form.rejected is None
+    assert form.is_valid()
+    assert form.cleaned_data['email'] == u'a@example.com'
+
+    form.rebind({'c-email': u'a@example.com'})
+    assert form.rejected is not None
+    assert not form.is_valid()
+    assert get_stats(ContactForm).checked == 3
+
+
+def test_gate_functions():
+    def no_links(data, files, prefix=u''):
+        return u'http' not in u''.join(data.getlist(prefix + 'message'))
+
+    class CommentForm(f.Form):
+        _gates = [no_links]
+        message = f.Text()
+
+    assert CommentForm({'message': u'hi'}).rejected is None
+    assert CommentForm({'message': u'http://x'}).rejected is no_links
+    assert get_stats(CommentForm).rejected == {'no_links': 1}
+    # Counted by class
+    assert get_stats(ContactForm).rejected != get_stats(CommentForm).rejected
+
+    # and by thread, but all of them are added up
+    thread = threading.Thread(
+        target=lambda: CommentForm({'message': u'http://y'}))
+    thread.start()
+    thread.join()
+    assert get_stats(CommentForm).as_dict() == {
+        'checked': 3, 'rejected': {'no_links': 2}}
+
+
+def test_rejected_subform():
+    class SignupForm(f.Form):
+        name = f.Text()
+        contact = ContactForm()
+
+    form = SignupForm({'name': u'a', 'contact.email': u'a@example.com',
+                       'contact.token': u'x', 'contact.website': u'spam'})
+    assert form.contact.rejected is not None
+    assert not form.is_valid()
+    assert list(form._errors) == ['contact']
+    assert list(form._errors['contact']) == [u'__gate__']
+    assert list(form._named_errors) == [u'contact.__gate__']
+
+
+def test_rejected_formset_row():
+    class RowForm(f.Form):
+        _gates = [f.Honeypot('website')]
+        email = f.Text()
+
+    class ListForm(f.Form):
+        name = f.Text()
+        rows = f.FormSet(RowForm)
+
+    form = ListForm({
+        'name': u'a',
+        'rowform.1-email': u'a@example.com',
+        'rowform.2-email': u'b@example.com',
+        'rowform.2-website': u'spam',
+    })
+    assert not form.is_valid()
+    assert list(form._errors['rows']) == [2]
+    assert list(form._named_errors) == [u'rowform.2-__gate__']
+
+
+def test_rejected_rebind_drops_old_data():
+    form = ContactForm({'email': u'secret@example.com', 'token': u'x'})
+    assert form.email.value == u'secret@example.com'
+
+    form.rebind({'email': u'b@example.com', 'website': u'spam'})
+    assert form.rejected is not None
+    assert list(form) == []
+    assert form.email is not ContactForm.email
+    assert form.email.value == u''
+
+
+def test_rejected_form_children():
+    class AddressForm(f.Form):
+        city = f.Text()
+
+    class OrderForm(f.Form):
+        _gates = [f.Honeypot('website')]
+        address = AddressForm()
+        lines = f.FormSet(AddressForm)
+
+    form = OrderForm({'address.city': u'Lima', 'website': u'spam'})
+    assert form.rejected is not None
+    assert form.address is not OrderForm.address
+    assert form.address.city.value == u''
+    assert len(form.lines) == 0
+    assert not form.is_valid()
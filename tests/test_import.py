@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+#: Maximum time, in microseconds, to `import solution`. Without the lazy
+#: imports it takes more than 70000 us.
+IMPORT_BUDGET = 20000
+
+
+def importtime(code):
+    """Run `code` in a new interpreter with `-X importtime` and return the
+    names of the modules imported at the end and a dict of the cumulative
+    import time of the modules imported with an `import` statement.
+    """
+    code += '; import sys; print(" ".join(sys.modules))'
+    # Keep the rest of the path, where the dependencies may be
+    path = os.environ.get('PYTHONPATH')
+    env = dict(os.environ,
+               PYTHONPATH=os.pathsep.join([ROOT, path]) if path else ROOT)
+    proc = subprocess.Popen(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
+    modules, output = proc.communicate()
+    assert proc.returncode == 0, output
+    times = {}
+    for line in output.decode('utf8').splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        times[name.strip()] = int(cumulative)
+    return set(modules.decode('utf8').split()), times
+
+
+needs_py37 = pytest.mark.skipif(
+    sys.version_info < (3, 7),
+    reason='Needs module __getattr__ and -X importtime (Python 3.7+)')
+
+
+@needs_py37
+def test_import_is_lazy():
+    modules, times = importtime('import solution')
+    for name in ('solution.form', 'solution.fields.field',
+                 'solution.validators.patterns', 'xml.sax.saxutils',
+                 'email.utils', 'inspect'):
+        assert name not in modules
+    assert times['solution'] < IMPORT_BUDGET
+
+
+@needs_py37
+def test_import_only_what_is_used():
+    modules, _ = importtime('import solution; solution.Text')
+    assert 'solution.fields.text' in modules
+    assert 'solution.fields.time' not in modules
+    assert 'solution.validators.patterns' not in modules
+
+
+def test_public_names():
+    import solution
+
+    for name in solution.__all__:
+        assert getattr(solution, name) is not None
+    assert 'Form' in dir(solution)
+    assert solution.fields.Text is solution.Text
+    with pytest.raises(AttributeError):
+        solution.Nope
+
+
+@needs_py37
+def test_import_errors_are_not_hidden(tmpdir, monkeypatch):
+    package = tmpdir.mkdir('lazypkg')
+    package.join('__init__.py').write(
+        'from solution._compat import lazy_exports\n'
+        '__getattr__, __dir__ = lazy_exports(__name__, '
+        '{"Thing": ".broken"})\n')
+    package.join('broken.py').write('import not_installed_dependency\n')
+    monkeypatch.syspath_prepend(str(tmpdir))
+    import lazypkg
+
+    try:
+        with pytest.raises(ImportError) as error:
+            lazypkg.__getattr__('Thing')
+        assert error.value.name == 'not_installed_dependency'
+        with pytest.raises(AttributeError):
+            lazypkg.__getattr__('nope')
+    finally:
+        sys.modules.pop('lazypkg', None)
+        sys.modules.pop('lazypkg.broken', None)
+
+
+def test_lazy_regex():
+    from solution.utils import LazyRegex
+    from solution.warmup import compile_regexes
+    import solution as f
+
+    rx = LazyRegex(r'a+', 0)
+    assert '_regex' not in rx.__dict__
+    assert rx.match('aaa').group() == 'aaa'
+    assert rx.compile() is rx.compile()
+
+    field = f.Text(validate=[f.ValidEmail, f.ValidURL()])
+    compile_regexes(field)
+    assert '_regex' in field.validators[1].regex.__dict__
+    assert '_regex' in f.ValidEmail.email_rx.__dict__
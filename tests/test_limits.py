@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import io
+
+import pytest
+
+import solution as f
+from solution.limits import get_file_size
+
+
+class LineForm(f.Form):
+    qty = f.Number(type=int)
+
+
+class AddressForm(f.Form):
+    city = f.Text()
+
+
+class OrderForm(f.Form):
+    code = f.Text()
+    doc = f.File()
+    address = AddressForm()
+    lines = f.FormSet(LineForm, max_rows=3)
+
+
+def test_max_rows():
+    data = {'lineform.%i-qty' % i: str(i) for i in range(1, 4)}
+    form = OrderForm(data)
+    assert len(form.lines) == 3
+
+    data['lineform.4-qty'] = u'4'
+    with pytest.raises(f.LimitError) as error:
+        OrderForm(data)
+    assert error.value.kind == 'max_rows'
+    assert error.value.name == u'lineform.'
+    assert error.value.limit == 3
+
+    # The smaller limit is used
+    with pytest.raises(f.LimitError):
+        OrderForm({'lineform.1-qty': u'1', 'lineform.2-qty': u'2'},
+                  limits={'max_rows': 1})
+
+    with pytest.raises(f.LimitError):
+        OrderForm.from_json({'lines': [{'qty': 1}] * 4})
+
+    lines = f.FormSet(LineForm, limits={'max_rows': 2})
+    lines.rebind({'lineform.1-qty': u'1', 'lineform.2-qty': u'2'})
+    with pytest.raises(f.LimitError):
+        lines.rebind({'lineform.%i-qty' % i: u'1' for i in range(1, 10)})
+
+
+def test_max_keys():
+    class LimitedForm(OrderForm):
+        _max_keys = 3
+
+    LimitedForm({'code': u'a', 'address.city': u'b', 'x': u'c'})
+    with pytest.raises(f.LimitError) as error:
+        LimitedForm({'code': u'a', 'address.city': u'b', 'x': u'c'},
+                    files={'doc': io.BytesIO(b'x')})
+    assert error.value.kind == 'max_keys'
+    assert error.value.size == 4
+
+
+def test_max_value_length():
+    form = OrderForm({'code': u'x' * 10}, limits={'max_value_length': 10})
+    assert form.is_valid()
+
+    with pytest.raises(f.LimitError) as error:
+        OrderForm({'code': u'x' * 11}, limits={'max_value_length': 10})
+    assert error.value.to_dict() == {
+        'kind': 'max_value_length', 'name': u'code', 'limit': 10,
+        'size': 11}
+
+    # The limits apply to the sub-forms and form sets
+    with pytest.raises(f.LimitError) as error:
+        OrderForm({'address.city': u'x' * 11},
+                  limits={'max_value_length': 10})
+    assert error.value.name == u'address.city'
+    with pytest.raises(f.LimitError):
+        OrderForm({'lineform.1-qty': u'1' * 11},
+                  limits={'max_value_length': 10})
+
+    # Checked before any conversion or validation
+    class CheckedForm(f.Form):
+        _max_value_length = 5
+        num = f.Number(type=int, clean=lambda value: 1 / 0)
+
+    with pytest.raises(f.LimitError):
+        CheckedForm({'num': u'123456'})
+
+
+def test_max_file_size():
+    limits = {'max_file_size': 5}
+    form = OrderForm(files={'doc': io.BytesIO(b'12345')}, limits=limits)
+    assert form.is_valid()
+
+    stream = io.BytesIO(b'123456')
+    stream.seek(2)
+    with pytest.raises(f.LimitError) as error:
+        OrderForm(files={'doc': stream}, limits=limits)
+    assert error.value.kind == 'max_file_size'
+    assert error.value.size == 6
+    # The position of the stream is kept
+    assert stream.tell() == 2
+
+
+def test_get_file_size():
+    class Upload(object):
+        def __init__(self, stream, content_length=0):
+            self.stream = stream
+            self.content_length = content_length
+
+    assert get_file_size(Upload(io.BytesIO(b'123'))) == 3
+    assert get_file_size(Upload(io.BytesIO(b'123'), content_length=7)) == 7
+    assert get_file_size(object()) is None
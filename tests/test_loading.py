@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+from sqlalchemy import event
+from sqlalchemy_wrapper import SQLAlchemy
+import solution as f
+
+
+def get_models():
+    db = SQLAlchemy()
+
+    class Customer(db.Model):
+        __tablename__ = 'customers'
+        id = db.Column(db.Integer, primary_key=True)
+        name = db.Column(db.String)
+
+    class Order(db.Model):
+        __tablename__ = 'orders'
+        id = db.Column(db.Integer, primary_key=True)
+        code = db.Column(db.String)
+        customer_id = db.Column(db.Integer, db.ForeignKey('customers.id'))
+        customer = db.relationship('Customer')
+
+    class Line(db.Model):
+        __tablename__ = 'lines'
+        id = db.Column(db.Integer, primary_key=True)
+        qty = db.Column(db.Integer)
+        order_id = db.Column(db.Integer, db.ForeignKey('orders.id'))
+        order = db.relationship('Order', backref='lines')
+
+    class Option(db.Model):
+        __tablename__ = 'options'
+        id = db.Column(db.Integer, primary_key=True)
+        name = db.Column(db.String)
+        line_id = db.Column(db.Integer, db.ForeignKey('lines.id'))
+        line = db.relationship('Line', backref='options')
+
+    db.create_all()
+    return db, Customer, Order, Line, Option
+
+
+class CustomerForm(f.Form):
+    name = f.Text()
+
+
+class OptionForm(f.Form):
+    name = f.Text()
+
+
+class LineForm(f.Form):
+    qty = f.Number(type=int)
+    options = f.FormSet(OptionForm)
+
+
+class OrderForm(f.Form):
+    code = f.Text()
+    customer = CustomerForm()
+    lines = f.FormSet(LineForm)
+
+
+def test_loading_plan_paths():
+    plan = OrderForm.loading_plan()
+    assert plan.paths == [('customer',), ('lines',), ('lines', 'options')]
+    assert plan._leaves() == [('customer',), ('lines', 'options')]
+
+
+def test_loading_plan_queries():
+    db, Customer, Order, Line, Option = get_models()
+    order = Order(code=u'A1', customer=Customer(name=u'Jane'))
+    for i in range(20):
+        line = Line(qty=i, order=order)
+        for j in range(3):
+            Option(name=u'o%i' % j, line=line)
+    db.add(order)
+    db.commit()
+
+    queries = []
+
+    def count(*args, **kwargs):
+        queries.append(1)
+
+    def bind(query):
+        db.session.expunge_all()
+        del queries[:]
+        form = OrderForm(obj=query.first())
+        assert len(form.lines) == 20
+        assert len(list(form.lines)[19].options) == 3
+        return len(queries)
+
+    event.listen(db.engine, 'before_cursor_execute', count)
+    try:
+        lazy = bind(db.query(Order))
+        plan = OrderForm.loading_plan()
+        eager = bind(plan.apply(db.query(Order), Order))
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count)
+
+    # order + customer + lines + one query for the options of each line
+    assert lazy == 23
+    # order with customer + lines + options
+    assert eager == 3
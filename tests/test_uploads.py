@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import io
+import sys
+
+import pytest
+
+import solution as f
+from solution.body import BodyFile
+from solution.uploads import SpoolSink, SpooledUpload, iter_chunks
+
+
+CONTENT = b'0123456789' * 1000
+DIGEST = hashlib.sha256(CONTENT).hexdigest()
+
+
+class Upload(object):
+    """Like the uploaded files of Werkzeug."""
+
+    def __init__(self, stream, filename):
+        self.stream = stream
+        self.filename = filename
+        self.content_type = 'text/plain'
+
+
+class ReadOnce(io.BytesIO):
+    """Fails if the file is read all at once."""
+
+    def read(self, size=-1):
+        assert size > 0
+        return super(ReadOnce, self).read(size)
+
+
+def test_spooled_upload():
+    upload = SpooledUpload.from_file(
+        Upload(ReadOnce(CONTENT), 'a.txt'), chunk_size=1024, max_memory=4096)
+    assert upload.filename == 'a.txt'
+    assert upload.content_type == 'text/plain'
+    assert upload.size == len(CONTENT) == len(upload)
+    assert upload.digest == DIGEST
+    assert not upload.in_memory
+    assert upload.read() == CONTENT
+    upload.close()
+
+    upload = SpooledUpload.from_file(b'abc', algorithm='md5')
+    assert upload.in_memory
+    assert upload.digest == hashlib.md5(b'abc').hexdigest()
+
+
+def test_iter_chunks():
+    body_file = BodyFile('doc', 'a.txt', 'text/plain', memoryview(CONTENT))
+    chunks = list(iter_chunks(body_file, 3000))
+    assert [len(chunk) for chunk in chunks] == [3000, 3000, 3000, 1000]
+    assert b''.join(chunks) == CONTENT
+    assert list(iter_chunks(io.BytesIO(b''))) == []
+
+
+def test_file_spool():
+    class UploadForm(f.Form):
+        doc = f.File(spool=True, validate=[f.MaxFileSize(len(CONTENT))])
+        other = f.File()
+
+    stream = io.BytesIO(CONTENT)
+    form = UploadForm(files={'doc': Upload(ReadOnce(CONTENT), 'a.txt'),
+                             'other': stream})
+    assert form.is_valid()
+    doc = form.cleaned_data['doc']
+    assert isinstance(doc, SpooledUpload)
+    assert doc.size == len(CONTENT)
+    assert doc.digest == DIGEST
+    assert doc.filename == 'a.txt'
+    assert form.cleaned_data['other'] is stream
+
+    form = UploadForm(files={'doc': io.BytesIO(CONTENT + b'!')})
+    assert not form.is_valid()
+    assert form.doc.error
+
+    form = UploadForm({})
+    assert form.is_valid()
+    assert form.cleaned_data['doc'] is None
+
+
+def test_max_file_size():
+    validator = f.MaxFileSize(3)
+    assert validator(io.BytesIO(b'123'))
+    assert not validator(io.BytesIO(b'1234'))
+    assert validator(None)
+    assert not validator(object())
+
+
+@pytest.mark.skipif(sys.version_info < (3, 6), reason='requires Python 3.6+')
+def test_spool_sink():
+    from tests.test_asgi import (MULTIPART, MULTIPART_TYPE, UploadForm,
+                                 make_receive, make_scope, run)
+
+    form = run(UploadForm.from_asgi(
+        make_receive(MULTIPART, 100), make_scope(MULTIPART_TYPE),
+        sink=SpoolSink(max_memory=100)))
+    assert form.is_valid()
+    doc = form.cleaned_data['doc']
+    assert isinstance(doc, SpooledUpload)
+    assert doc.filename == u'a.txt'
+    assert not doc.in_memory
+    content = b'hello\r\n--world' * 100
+    assert doc.read() == content
+    assert doc.digest == hashlib.sha256(content).hexdigest()
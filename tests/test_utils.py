@@ -11,3 +11,24 @@ def test_html_attrs():
     assert result == expected
     assert utils.get_html_attrs() == u''
 
+
+def test_prefix_index():
+    data = utils.PrefixIndex(utils.FakeMultiDict({
+        'code': u'A',
+        'order.lineform.2-qty': u'3',
+    }))
+    assert data.has_prefix(u'order.')
+    assert data.has_prefix(u'order.lineform.')
+    assert data.has_prefix(u'order.lineform.2-')
+    assert not data.has_prefix(u'order.lineform.1-')
+    assert not data.has_prefix(u'lineform.')
+    assert data.has_prefix(u'ord')
+    assert data.getlist('code') == [u'A']
+    assert data.get('code') == u'A'
+    assert 'code' in data and len(data) == 2
+
+    data['order.lineform.3-qty'] = u'1'
+    assert data.has_prefix(u'order.lineform.3-')
+    del data['order.lineform.2-qty']
+    assert not data.has_prefix(u'order.lineform.2-')
+    assert utils.has_prefix({'a.b': 1}, u'a.')
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import gc
+import sys
+
+import solution as f
+
+
+class AddressForm(f.Form):
+    email = f.Text(validate=[f.ValidEmail])
+
+
+class UserForm(f.Form):
+    name = f.Text()
+    address = AddressForm()
+    addresses = f.FormSet(AddressForm)
+
+
+def test_warmup_classes():
+    UserForm._binding_plan = None
+    AddressForm._binding_plan = None
+    UserForm.name.__dict__.pop('_bound_class', None)
+
+    assert f.warmup([UserForm]) == [UserForm]
+    assert UserForm.__dict__['_binding_plan'] is not None
+    plan = AddressForm.__dict__['_binding_plan']
+    assert plan is not None
+    # Every row uses the plan built by warmup
+    form = UserForm({'addressform.1-email': u'a@example.com',
+                     'addressform.2-email': u'b@example.com'})
+    assert [row._plan for row in form.addresses] == [plan, plan]
+    assert '_bound_class' in UserForm.name.__dict__
+
+
+def test_warmup_modules():
+    module = sys.modules[__name__]
+    classes = f.warmup([module])
+    assert sorted(c.__name__ for c in classes) == ['AddressForm', 'UserForm']
+
+
+def test_warmup_all():
+    classes = f.warmup()
+    assert UserForm in classes
+    assert AddressForm in classes
+
+
+def test_warmup_freeze():
+    f.warmup([UserForm], freeze=True)
+    if hasattr(gc, 'unfreeze'):
+        assert gc.get_freeze_count() > 0
+        gc.unfreeze()